@@ -0,0 +1,202 @@
+"""
+Benchmarks for rhabm.
+
+Times `simulate` at several park sizes and agent densities,
+`Park.get_neighbours` at several radii, `Poacher.find_individual` and the
+population of a park. Results are written as JSON and can be compared
+against a stored baseline:
+
+    $ python benchmarks/run.py --output baseline.json
+    $ python benchmarks/run.py --compare baseline.json
+
+When comparing, the script exits with status 1 if any benchmark is slower
+than the baseline by more than the `--tolerance` factor.
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+
+import rhabm
+
+SimulateCases = {
+    "small-sparse": dict(width=20, height=20, number_of_rhinos=20),
+    "small-dense": dict(width=20, height=20, number_of_rhinos=200),
+    "medium-sparse": dict(width=60, height=60, number_of_rhinos=100),
+    "medium-dense": dict(width=60, height=60, number_of_rhinos=1500),
+    "medium-dense-field": dict(
+        width=60, height=60, number_of_rhinos=1500, targeting="field"
+    ),
+    "medium-dense-perception": dict(
+        width=60, height=60, number_of_rhinos=1500, targeting="perception"
+    ),
+    "large-sparse": dict(width=150, height=150, number_of_rhinos=400),
+    "huge-sparse": dict(
+        width=5000, height=5000, number_of_rhinos=1000, occupancy="sparse"
+    ),
+}
+
+
+def simulate_benchmark(clock, **case):
+    return lambda: rhabm.simulate(
+        number_of_poachers=max(1, case["number_of_rhinos"] // 10),
+        number_of_security_agents=max(1, case["number_of_rhinos"] // 20),
+        clock=clock,
+        seed=0,
+        **case,
+    )
+
+
+def get_neighbours_benchmark(radius, cache_size):
+    park = rhabm.Park(width=50, height=50, neighbour_cache_size=cache_size)
+
+    def benchmark():
+        for i, j in park.coordinates:
+            park.get_neighbours(i, j, radius)
+
+    return benchmark
+
+
+def find_individual_benchmark(number_of_rhinos):
+    park = rhabm.Park(width=50, height=50, seed=0)
+    _ = [rhabm.Rhino(park) for _ in range(number_of_rhinos)]
+    poachers = [rhabm.Poacher(park) for _ in range(100)]
+
+    def benchmark():
+        for poacher in poachers:
+            poacher.find_individual()
+
+    return benchmark
+
+
+def populate_benchmark(size, number_of_rhinos):
+    def benchmark():
+        park = rhabm.Park(width=size, height=size, seed=0)
+        rhabm.populate(
+            park,
+            number_of_rhinos=number_of_rhinos,
+            number_of_poachers=number_of_rhinos // 10,
+            number_of_security_agents=number_of_rhinos // 20,
+        )
+
+    return benchmark
+
+
+def benchmarks(quick=False):
+    """
+    Returns a dictionary mapping the name of each benchmark to a function
+    which runs it.
+    """
+    clock = 10 if quick else 50
+    cases = {}
+    for name, case in SimulateCases.items():
+        cases[f"simulate/{name}"] = simulate_benchmark(clock, **case)
+    for radius in [1, 2, 3, 5]:
+        cases[f"get_neighbours/radius-{radius}/uncached"] = (
+            get_neighbours_benchmark(radius, cache_size=0)
+        )
+        cases[f"get_neighbours/radius-{radius}/cached"] = (
+            get_neighbours_benchmark(radius, cache_size=10000)
+        )
+    for number_of_rhinos in [10, 250, 1500]:
+        cases[f"find_individual/rhinos-{number_of_rhinos}"] = (
+            find_individual_benchmark(number_of_rhinos)
+        )
+    for size, number_of_rhinos in [(50, 200), (200, 4000)]:
+        cases[f"populate/{size}x{size}-rhinos-{number_of_rhinos}"] = (
+            populate_benchmark(size, number_of_rhinos)
+        )
+    return cases
+
+
+def run(selected=None, repeat=5, quick=False):
+    """
+    Runs the benchmarks whose name contains one of the strings in `selected`,
+    or all of them, and returns their timings in seconds.
+    """
+    results = {}
+    for name, benchmark in benchmarks(quick=quick).items():
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        timer = timeit.Timer(benchmark)
+        number, _ = timer.autorange()
+        timings = [
+            timing / number for timing in timer.repeat(repeat, number)
+        ]
+        results[name] = {
+            "best": min(timings),
+            "mean": sum(timings) / len(timings),
+            "number": number,
+            "repeat": repeat,
+        }
+        print(f"{name:50} {min(timings) * 1000:10.3f} ms", file=sys.stderr)
+    return {
+        "rhabm": rhabm.__version__,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "quick": quick,
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """
+    Returns a dictionary mapping each benchmark present in both reports to
+    the ratio of its current best time to its baseline best time, and the
+    list of benchmarks whose ratio is above `tolerance`.
+    """
+    ratios = {}
+    for name, result in report["results"].items():
+        if name in baseline["results"]:
+            ratios[name] = result["best"] / baseline["results"][name]["best"]
+    regressions = [name for name, ratio in ratios.items() if ratio > tolerance]
+    return ratios, regressions
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Run the rhabm benchmarks.")
+    parser.add_argument(
+        "-k",
+        dest="selected",
+        action="append",
+        help="Only run the benchmarks whose name contains this string.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--quick", action="store_true", help="Run shorter simulations."
+    )
+    parser.add_argument("--output", help="Write the results to this file.")
+    parser.add_argument(
+        "--compare", help="Compare the results to this baseline file."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.2,
+        help="The slowdown factor above which a benchmark has regressed.",
+    )
+    arguments = parser.parse_args(arguments)
+
+    report = run(arguments.selected, arguments.repeat, arguments.quick)
+
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(report, output, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if arguments.compare:
+        with open(arguments.compare, "r") as baseline_file:
+            baseline = json.load(baseline_file)
+        ratios, regressions = compare(report, baseline, arguments.tolerance)
+        for name, ratio in ratios.items():
+            flag = "  REGRESSION" if name in regressions else ""
+            print(f"{name:50} {ratio:6.2f}x{flag}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,4 +23,5 @@ setup(
     license="The MIT License (MIT)",
     description="A rhino poaching agent based simulation tool.",
     long_description=README,
+    entry_points={"console_scripts": ["rhabm = rhabm.cli:main"]},
 )
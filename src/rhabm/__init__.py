@@ -1,4 +1,20 @@
-from .park import Park, Unoccupied, UnoccupiedEmoji
+from .park import (
+    Park,
+    Unoccupied,
+    UnoccupiedEmoji,
+    UnoccupiedSymbol,
+    UnoccupiedCode,
+    NoAgent,
+    CounterNames,
+    Coordinates,
+    RenderCache,
+    RenderModes,
+    neighbour_offsets,
+    neighbour_ranks,
+    render,
+    render_row,
+)
+from .sparse import FreeCells, SparseCells, SparsePark
 from .agents import (
     euclidean_distance,
     Rhino,
@@ -9,6 +25,93 @@ from .agents import (
     CaughtPoacherEmoji,
     SecurityOfficer,
     SecurityEmoji,
+    RhinoSymbol,
+    DeadRhinoSymbol,
+    PoacherSymbol,
+    CaughtPoacherSymbol,
+    SecuritySymbol,
+    RhinoCode,
+    DeadRhinoCode,
+    PoacherCode,
+    CaughtPoacherCode,
+    SecurityCode,
+    CellEmojis,
+    CellSymbols,
+    SymbolTable,
+)
+from .pool import (
+    AgentPool,
+    NoTarget,
+    PoolArrays,
+    ProxyClasses,
+    PooledAgent,
+    PooledRhino,
+    PooledPoacher,
+    PooledSecurityOfficer,
+)
+from .engines import group_rhinos, move_rhinos
+from .fields import TargetFields, distance_field
+from .perception import (
+    Perception,
+    bucket_targets,
+    nearest_targets,
+    scan_order,
+    scan_targets,
+    target_buckets,
+)
+from .tiles import TiledGrid, move_tile, own_rows, tile_bounds
+from .scheduler import ActiveScheduler, shuffled
+from .history import (
+    FrameHeader,
+    FrameMagic,
+    FrameStore,
+    History,
+    apply_events,
+)
+from .profiler import Profiler
+from .main import (
+    StopConditions,
+    create_park,
+    populate,
+    run,
+    simulate,
+    simulate_iter,
+)
+from .configurations import (
+    ParkArrays,
+    PlacementParameters,
+    SharedConfiguration,
+    copy_array,
+)
+from .checkpoints import (
+    AgentAttributes,
+    AgentClasses,
+    CheckpointMagic,
+    CheckpointVersion,
+    FileTypecodes,
+    agent_arrays,
+    load_checkpoint,
+    park_arrays,
+    restore_agent,
+    save_checkpoint,
+)
+from .replicates import (
+    SummaryMetrics,
+    aggregate,
+    iter_replicates,
+    map_replicates,
+    run_replicate,
+    simulate_many,
+    summarise,
+)
+from .sweeps import (
+    OutputFormats,
+    ResultCache,
+    ResultFile,
+    parameter_grid,
+    parameters_hash,
+    stream_sweep,
+    sweep,
 )
-from .main import simulate
+from .cli import check_parameters, read_parameter_file
 from .version import __version__
@@ -0,0 +1,5 @@
+import sys
+
+from rhabm.cli import main
+
+sys.exit(main())
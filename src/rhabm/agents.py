@@ -1,5 +1,4 @@
 """A file which contains classes for the agents involved in the simulation."""
-import random
 import rhabm
 
 RhinoEmoji = "🦏"
@@ -8,6 +7,38 @@ PoacherEmoji = "🔪"
 CaughtPoacherEmoji = "⛓️"
 SecurityEmoji = "🚓"
 
+RhinoSymbol = "R"
+DeadRhinoSymbol = "X"
+PoacherSymbol = "P"
+CaughtPoacherSymbol = "C"
+SecuritySymbol = "S"
+
+RhinoCode = 1
+DeadRhinoCode = 2
+PoacherCode = 3
+CaughtPoacherCode = 4
+SecurityCode = 5
+
+CellEmojis = {
+    rhabm.UnoccupiedCode: rhabm.UnoccupiedEmoji,
+    RhinoCode: RhinoEmoji,
+    DeadRhinoCode: DeadRhinoEmoji,
+    PoacherCode: PoacherEmoji,
+    CaughtPoacherCode: CaughtPoacherEmoji,
+    SecurityCode: SecurityEmoji,
+}
+CellSymbols = {
+    rhabm.UnoccupiedCode: rhabm.UnoccupiedSymbol,
+    RhinoCode: RhinoSymbol,
+    DeadRhinoCode: DeadRhinoSymbol,
+    PoacherCode: PoacherSymbol,
+    CaughtPoacherCode: CaughtPoacherSymbol,
+    SecurityCode: SecuritySymbol,
+}
+SymbolTable = bytes.maketrans(
+    bytes(CellSymbols), "".join(CellSymbols.values()).encode("ascii")
+)
+
 
 def euclidean_distance(point_a, point_b):
     """
@@ -37,15 +68,22 @@ class Rhino:
         becomes immobile once they meet a poacher.
     caught : `bool`
         False when the rhino is alive, True otherwise.
+    agent_id : `int`
+        The id of the agent within the park.
+    kind : `int`
+        The code of a living agent of this class.
     """
 
+    kind = RhinoCode
+
     def __init__(self, park, value=1):
         self.location = park.get_random_unoccupied_cell()
         self.park = park
         self.value = value
-        self.park.occupants[self.location[0]][self.location[1]] = self
         self.is_mobile = True
         self.caught = False
+        self.agent_id = park.register(self)
+        self.park.place(self, self.location)
 
     def move(self):
         """
@@ -54,23 +92,35 @@ class Rhino:
         """
         if self.is_mobile:
             try:
-                new_location = random.choice(
+                new_location = self.park.random.choice(
                     [
                         (i, j)
                         for i, j in self.park.get_neighbours(*self.location)
-                        if self.park.occupants[i][j].__repr__()
-                        == rhabm.UnoccupiedEmoji
+                        if self.park.is_unoccupied(i, j)
                     ]
                 )
-
-                self.park.occupants[self.location[0]][
-                    self.location[1]
-                ] = rhabm.Unoccupied()
-                self.location = new_location
-                self.park.occupants[self.location[0]][self.location[1]] = self
+                self.park.move(self, new_location)
             except IndexError:
                 pass
 
+    @property
+    def code(self):
+        """
+        The cell code of the agent.
+        """
+        if self.caught is False:
+            return RhinoCode
+        return DeadRhinoCode
+
+    @property
+    def counter(self):
+        """
+        The name of the park counter the agent is counted in.
+        """
+        if self.caught is False:
+            return "living_rhinos"
+        return "dead_rhinos"
+
     def __repr__(self):
         if self.caught is False:
             return RhinoEmoji
@@ -106,8 +156,13 @@ class Poacher(Rhino):
         becomes immobile once they meet a rhino.
     caught : `bool`
         True when the poacher is caught by security, False otherwise.
+    left_park : `bool`
+        True once the poacher has exited the park, False otherwise.
     """
 
+    kind = PoacherCode
+    target_kind = RhinoCode
+
     def __init__(
         self,
         park,
@@ -125,9 +180,10 @@ class Poacher(Rhino):
         self.target_value = target_value
         self.minimum_horn_value_threshold = minimum_horn_value_threshold
         self.caught = False
+        self.left_park = False
         super().__init__(park)
 
-    def find_individual(self, target=RhinoEmoji):
+    def find_individual(self, target=RhinoCode):
         """
         A method for finding target.
 
@@ -141,17 +197,21 @@ class Poacher(Rhino):
         then target the rhino which is closer to their current location.
 
         Method returns `False` if no targets are within the radius of vision.
+
+        If the park has a perception stage for the current time unit, the
+        target it found is used instead, see `Perception`.
         """
+        perception = self.park.perception
+        if perception is not None and target == self.target_kind:
+            location = perception.target(self)
+            if location is not None:
+                return location
         target_cells_in_vision = [
-            (i, j)
-            for i, j in self.park.get_neighbours(
-                *self.location, radius=self.vision_radius
-            )
-            if (self.park.occupants[i][j].__repr__() == target)
-            and (
-                self.park.occupants[i][j].value
-                > self.minimum_horn_value_threshold
+            location
+            for location, agent in self.park.get_nearby_agents(
+                target, *self.location, radius=self.vision_radius
             )
+            if agent.value > self.minimum_horn_value_threshold
         ]
         if len(target_cells_in_vision) > 0:
             target_cells_in_vision.sort(
@@ -167,27 +227,33 @@ class Poacher(Rhino):
 
         If there are no targets within their vision, they move randomly. If
         poachers are next to a rhino they engage the target.
+
+        If the park has distance fields for the current time unit, the
+        poacher moves with `move_by_field` instead.
         """
         if self.is_mobile:
+            if self.park.target_fields is not None:
+                self.move_by_field()
+                return None
             target_cell_in_vision = self.find_individual()
             neighbours = [
                 (i, j)
                 for i, j in self.park.get_neighbours(
                     *self.location, radius=self.movement_radius
                 )
-                if self.park.occupants[i][j].__repr__() == rhabm.UnoccupiedEmoji
+                if self.park.is_unoccupied(i, j)
             ]
             if target_cell_in_vision is not False:
                 if target_cell_in_vision in self.park.get_neighbours(
                     *self.location, radius=self.movement_radius
                 ):
-                    target_agent = self.park.occupants[
-                        target_cell_in_vision[0]
-                    ][target_cell_in_vision[1]]
+                    target_agent = self.park.agent_at(*target_cell_in_vision)
                     if target_agent.is_mobile:
                         self.is_mobile = False
                         self.target_agent = target_agent
                         self.target_agent.is_mobile = False
+                        self.park.refresh(self)
+                        self.park.refresh(self.target_agent)
                         return None
                 try:
                     best_next_distance = min(
@@ -209,18 +275,72 @@ class Poacher(Rhino):
                 potential_cells = neighbours
 
             try:
-                new_location = random.choice(potential_cells)
-                self.park.occupants[self.location[0]][
-                    self.location[1]
-                ] = rhabm.Unoccupied()
-                self.location = new_location
-                self.park.occupants[self.location[0]][self.location[1]] = self
+                new_location = self.park.random.choice(potential_cells)
+                self.park.move(self, new_location)
             except IndexError:
                 pass
 
         else:
             self.engage_target()
 
+    def move_by_field(self):
+        """
+        A method for moving using the park's distance field towards the
+        poacher's targets.
+
+        A target is within vision if the field distance of the poacher's
+        cell is at most its vision radius. In that case the poacher engages
+        the first mobile target within its moving radius, in the order of
+        `Park.get_neighbours`, and otherwise moves to one of the unoccupied
+        cells within its moving radius with the smallest field distance,
+        chosen at random. If there are no targets within its vision, it moves
+        randomly.
+
+        The distances are the manhattan distances to the closest target at
+        the time the field was built, so a poacher may head for the closest
+        target by manhattan rather than euclidean distance and for a cell
+        its target has since left.
+        """
+        field = self.park.target_fields.get(
+            self.target_kind, self.minimum_horn_value_threshold
+        )
+        i, j = self.location
+        width = self.park.width
+        distance = field.get(i * width + j)
+        neighbours = [
+            (k, l)
+            for k, l in self.park.get_neighbours(
+                i, j, radius=self.movement_radius
+            )
+            if self.park.is_unoccupied(k, l)
+        ]
+        if distance is not None and distance <= self.vision_radius:
+            for _, target_agent in self.park.get_nearby_agents(
+                self.target_kind, i, j, radius=self.movement_radius
+            ):
+                if (
+                    target_agent.value > self.minimum_horn_value_threshold
+                    and target_agent.is_mobile
+                ):
+                    self.is_mobile = False
+                    self.target_agent = target_agent
+                    self.target_agent.is_mobile = False
+                    self.park.refresh(self)
+                    self.park.refresh(self.target_agent)
+                    return None
+            far = self.park.target_fields.radius + 1
+            distances = [field.get(k * width + l, far) for k, l in neighbours]
+            if distances:
+                best_distance = min(distances)
+                neighbours = [
+                    cell
+                    for cell, cell_distance in zip(neighbours, distances)
+                    if cell_distance == best_distance
+                ]
+
+        if neighbours:
+            self.park.move(self, self.park.random.choice(neighbours))
+
     def engage_target(self):
         """
         If poachers are next to a target they start hunting. While the rhino is
@@ -228,11 +348,12 @@ class Poacher(Rhino):
         checks whether the target value has been satisfied. If yes the poacher
         starts exiting the park, otherwise the poacher keeps on hunting.
         """
-        if self.caught is False:
+        if self.caught is False and self.left_park is False:
             if self.time_to_remove_rhino > 0:
                 self.time_to_remove_rhino -= 1
             elif not self.target_agent.caught:
                 self.target_agent.caught = True
+                self.park.refresh(self.target_agent)
                 self.target_value -= self.target_agent.value
             elif self.target_value <= 0:
                 new_location = min(
@@ -251,14 +372,14 @@ class Poacher(Rhino):
                         ),
                     ),
                     (
-                        self.park.width - self.location[0],
+                        self.park.height - self.location[0],
                         (
                             self.location[0] + self.movement_radius,
                             self.location[1],
                         ),
                     ),
                     (
-                        self.park.height - self.location[1],
+                        self.park.width - self.location[1],
                         (
                             self.location[0],
                             self.location[1] + self.movement_radius,
@@ -267,19 +388,34 @@ class Poacher(Rhino):
                     key=lambda pair: pair[0],
                 )[1]
 
-                self.park.occupants[self.location[0]][
-                    self.location[1]
-                ] = rhabm.Unoccupied()
                 if (
-                    0 <= new_location[0] < self.park.width
-                    and 0 <= new_location[1] < self.park.height
+                    0 <= new_location[0] < self.park.height
+                    and 0 <= new_location[1] < self.park.width
                 ):
-                    self.location = new_location
-                    self.park.occupants[self.location[0]][
-                        self.location[1]
-                    ] = self
+                    self.park.move(self, new_location)
+                else:
+                    self.park.remove(self)
+                    self.left_park = True
+                    self.park.refresh(self)
             else:
                 self.is_mobile = True
+                self.park.refresh(self)
+
+    @property
+    def code(self):
+        if self.caught:
+            return CaughtPoacherCode
+        return PoacherCode
+
+    @property
+    def counter(self):
+        if self.caught:
+            return "caught_poachers"
+        if self.left_park:
+            return "exited_poachers"
+        if self.is_mobile is False:
+            return "engaged_poachers"
+        return "active_poachers"
 
     def __repr__(self):
         if self.caught:
@@ -307,6 +443,9 @@ class SecurityOfficer(Poacher):
         instance once the guard has identify a poacher in the park.
     """
 
+    kind = SecurityCode
+    target_kind = PoacherCode
+
     def __init__(self, park, vision_radius=3, movement_radius=1):
 
         self.vision_radius = vision_radius
@@ -314,7 +453,7 @@ class SecurityOfficer(Poacher):
         self.target_agent = None
         super().__init__(park, vision_radius, movement_radius)
 
-    def find_individual(self, target=PoacherEmoji):
+    def find_individual(self, target=PoacherCode):
         return super().find_individual(target=target)
 
     def engage_target(self):
@@ -325,13 +464,25 @@ class SecurityOfficer(Poacher):
         Poachers are instantly caught and then security continue their watch.
         """
         self.target_agent.caught = True
+        self.park.refresh(self.target_agent)
+        self.park.wake(self.target_agent)
 
         try:
             self.target_agent.target_agent.is_mobile = True
         except AttributeError:
             pass
+        else:
+            self.park.wake(self.target_agent.target_agent)
 
         self.is_mobile = True
 
+    @property
+    def code(self):
+        return SecurityCode
+
+    @property
+    def counter(self):
+        return "security_officers"
+
     def __repr__(self):
         return SecurityEmoji
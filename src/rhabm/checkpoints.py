@@ -0,0 +1,291 @@
+"""A file which contains functions to save and load checkpoints of a park."""
+import array
+import json
+import os
+import struct
+import sys
+import tempfile
+
+import rhabm
+
+CheckpointMagic = b"RHABMCK1"
+CheckpointVersion = 2
+FileTypecodes = {"l": "q"}
+AgentClasses = {
+    rhabm.RhinoCode: rhabm.Rhino,
+    rhabm.PoacherCode: rhabm.Poacher,
+    rhabm.SecurityCode: rhabm.SecurityOfficer,
+}
+AgentAttributes = {
+    "values": "value",
+    "times_to_remove_rhino": "time_to_remove_rhino",
+    "target_values": "target_value",
+    "minimum_horn_value_thresholds": "minimum_horn_value_threshold",
+    "vision_radii": "vision_radius",
+    "movement_radii": "movement_radius",
+}
+
+
+def agent_arrays(agents):
+    """
+    Returns the state of a list of agents as a dictionary of the arrays of
+    an `AgentPool`, whatever the way the agents are stored. The arrays of a
+    pool which holds exactly the agents are returned as they are.
+    """
+    if agents and isinstance(agents[0], rhabm.PooledAgent):
+        pool = agents[0].pool
+        if pool.agents == agents:
+            return {name: getattr(pool, name) for name in rhabm.PoolArrays}
+
+    pool = rhabm.AgentPool(None)
+    arrays = {name: getattr(pool, name) for name in rhabm.PoolArrays}
+    for agent in agents:
+        target_agent = getattr(agent, "target_agent", None)
+        arrays["kinds"].append(agent.kind)
+        arrays["agent_ids"].append(agent.agent_id)
+        arrays["rows"].append(agent.location[0])
+        arrays["columns"].append(agent.location[1])
+        arrays["is_mobile"].append(agent.is_mobile)
+        arrays["caught"].append(agent.caught)
+        arrays["left_park"].append(getattr(agent, "left_park", False))
+        arrays["targets"].append(
+            rhabm.NoTarget if target_agent is None else target_agent.agent_id
+        )
+        for name in rhabm.PoolArrays:
+            if name in AgentAttributes:
+                arrays[name].append(getattr(agent, AgentAttributes[name], 0))
+    return arrays
+
+
+def park_arrays(park):
+    """
+    Returns the occupied cells of a park as a dictionary of arrays of their
+    indices, codes and agent ids. For a park which stores every cell, the
+    order of its free cell index is saved too, as 32 bit integers.
+    """
+    arrays = {
+        "occupied_cells": array.array("l"),
+        "occupied_codes": bytearray(),
+        "occupied_agent_ids": array.array("l"),
+    }
+    for agent in park.agents:
+        index = agent.location[0] * park.width + agent.location[1]
+        if park.agent_ids[index] == agent.agent_id:
+            arrays["occupied_cells"].append(index)
+            arrays["occupied_codes"].append(park.cells[index])
+            arrays["occupied_agent_ids"].append(agent.agent_id)
+    if not isinstance(park, rhabm.SparsePark):
+        arrays["free_cells"] = array.array("i", park.free_cells)
+    return arrays
+
+
+def save_checkpoint(park, path):
+    """
+    Saves the state of a park and its agents to a binary file.
+
+    The file starts with `CheckpointMagic`, the length of a JSON header and
+    the header, followed by the raw bytes of a set of typed arrays: the
+    occupied cells of the park, the state of every agent in the layout of
+    an `AgentPool` and the order in which `run` moves the agents. The header
+    holds the size of the park, the number of time units run, the counters,
+    the state of the random number generator, the byte order of the
+    machine and where each array is in the file. The arrays are written
+    with typecodes of the same width on every platform, "l" as "q" with
+    `FileTypecodes`, so that a checkpoint can be loaded on another
+    platform. The history of the park is not saved.
+
+    The file is written to a temporary file first and then renamed, so an
+    existing checkpoint is never left half written.
+
+    Parameters
+    ==========
+
+    park : `Park` instance
+        The park to save.
+    path : `str`
+        The path of the checkpoint file.
+    """
+    schedule = array.array(
+        "l",
+        (
+            agent.agent_id
+            for agents in (park.schedule or [park.agents])
+            for agent in agents
+        ),
+    )
+    sections = {
+        "park": park_arrays(park),
+        "agents": agent_arrays(park.agents),
+        "schedule": {"agent_ids": schedule},
+    }
+    storage = "objects"
+    if park.agents and isinstance(park.agents[0], rhabm.PooledAgent):
+        storage = "pool"
+
+    layout = []
+    start = 0
+    for section, arrays in sections.items():
+        for name, values in arrays.items():
+            typecode = getattr(values, "typecode", "B")
+            if typecode in FileTypecodes:
+                typecode = FileTypecodes[typecode]
+                values = array.array(typecode, values)
+                arrays[name] = values
+            stop = start + len(values) * getattr(values, "itemsize", 1)
+            layout.append([section, name, typecode, start, stop])
+            start = stop
+    header = json.dumps(
+        {
+            "version": CheckpointVersion,
+            "width": park.width,
+            "height": park.height,
+            "occupancy": (
+                "sparse" if isinstance(park, rhabm.SparsePark) else "dense"
+            ),
+            "storage": storage,
+            "neighbour_cache_size": park.neighbour_cache_size,
+            "ticks": park.ticks,
+            "stopped_at": park.stopped_at,
+            "stop_reason": park.stop_reason,
+            "counters": park.counters,
+            "random": park.random.getstate(),
+            "byteorder": sys.byteorder,
+            "layout": layout,
+        }
+    ).encode()
+
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=directory, suffix=".tmp"
+    )
+    with os.fdopen(descriptor, "wb") as checkpoint_file:
+        checkpoint_file.write(CheckpointMagic)
+        checkpoint_file.write(struct.pack("<Q", len(header)))
+        checkpoint_file.write(header)
+        for arrays in sections.values():
+            for values in arrays.values():
+                checkpoint_file.write(values)
+    os.replace(temporary_path, path)
+
+
+def restore_agent(park, arrays, index):
+    """
+    Returns a `Rhino`, `Poacher` or `SecurityOfficer` instance with the
+    state of the agent at a given index of the saved arrays, without
+    placing it in the park. Its target is set by `load_checkpoint`.
+    """
+    agent_class = AgentClasses[arrays["kinds"][index]]
+    agent = agent_class.__new__(agent_class)
+    agent.park = park
+    agent.agent_id = arrays["agent_ids"][index]
+    agent.location = (arrays["rows"][index], arrays["columns"][index])
+    agent.value = arrays["values"][index]
+    agent.is_mobile = bool(arrays["is_mobile"][index])
+    agent.caught = bool(arrays["caught"][index])
+    if agent_class is not rhabm.Rhino:
+        agent.left_park = bool(arrays["left_park"][index])
+        agent.target_agent = None
+        for name, attribute in AgentAttributes.items():
+            if name in arrays and name != "values":
+                setattr(agent, attribute, arrays[name][index])
+    return agent
+
+
+def load_checkpoint(path):
+    """
+    Returns the park saved in a checkpoint file by `save_checkpoint`.
+
+    The agents are rebuilt with the storage they had when saved, and the
+    park's `schedule` holds them in the order in which `run` moved them, so
+    passing it to `run` continues the simulation exactly where it stopped.
+
+    Parameters
+    ==========
+
+    path : `str`
+        The path of the checkpoint file.
+    """
+    with open(path, "rb") as checkpoint_file:
+        data = checkpoint_file.read()
+    if data[: len(CheckpointMagic)] != CheckpointMagic:
+        raise ValueError(f"{path} is not a rhabm checkpoint")
+    start = len(CheckpointMagic) + 8
+    (header_length,) = struct.unpack("<Q", data[len(CheckpointMagic) : start])
+    header = json.loads(data[start : start + header_length])
+    if header["version"] not in (1, CheckpointVersion):
+        raise ValueError(
+            f"Unsupported checkpoint version: {header['version']}"
+        )
+    native_typecodes = {
+        typecode: native for native, typecode in FileTypecodes.items()
+    }
+    byteorder = header.get("byteorder", sys.byteorder)
+
+    body = memoryview(data)[start + header_length :]
+    sections = {"park": {}, "agents": {}, "schedule": {}}
+    for section, name, typecode, array_start, array_stop in header["layout"]:
+        if typecode == "B":
+            values = bytearray(body[array_start:array_stop])
+        else:
+            values = array.array(typecode)
+            values.frombytes(body[array_start:array_stop])
+            if byteorder != sys.byteorder:
+                values.byteswap()
+            if typecode in native_typecodes:
+                values = array.array(native_typecodes[typecode], values)
+        sections[section][name] = values
+    cells = sections["park"]
+    arrays = sections["agents"]
+
+    park = rhabm.create_park(
+        header["width"], header["height"], occupancy=header["occupancy"]
+    )
+    park.neighbour_cache_size = header["neighbour_cache_size"]
+    for index, code, agent_id in zip(
+        cells["occupied_cells"],
+        cells["occupied_codes"],
+        cells["occupied_agent_ids"],
+    ):
+        park.cells[index] = code
+        park.agent_ids[index] = agent_id
+    if header["occupancy"] == "dense":
+        park.free_cells = array.array("l", cells["free_cells"])
+        park.free_cell_positions = array.array("l", [-1]) * len(park)
+        for position, index in enumerate(park.free_cells):
+            park.free_cell_positions[index] = position
+
+    if header["storage"] == "pool":
+        pool = rhabm.AgentPool(park)
+        for name in rhabm.PoolArrays:
+            setattr(pool, name, arrays[name])
+        agents = [
+            rhabm.ProxyClasses[kind](pool, index)
+            for index, kind in enumerate(pool.kinds)
+        ]
+        pool.agents.extend(agents)
+    else:
+        agents = [
+            restore_agent(park, arrays, index)
+            for index in range(len(arrays["kinds"]))
+        ]
+        for agent, target in zip(agents, arrays["targets"]):
+            if target != rhabm.NoTarget:
+                agent.target_agent = agents[target]
+
+    for agent in agents:
+        park.register(agent)
+        i, j = agent.location
+        index = i * park.width + j
+        if park.agent_ids[index] == agent.agent_id:
+            park.registry[park.cells[index]][(i, j)] = agent
+
+    park.counters = header["counters"]
+    park.ticks = header["ticks"]
+    park.stopped_at = header["stopped_at"]
+    park.stop_reason = header["stop_reason"]
+    state = header["random"]
+    park.random.setstate((state[0], tuple(state[1]), state[2]))
+    park.schedule = [
+        [agents[agent_id] for agent_id in sections["schedule"]["agent_ids"]]
+    ]
+    return park
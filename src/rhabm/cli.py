@@ -0,0 +1,151 @@
+"""A file which contains the command line interface of rhabm."""
+import argparse
+import inspect
+import json
+import sys
+
+import rhabm
+
+
+def read_parameter_file(path):
+    """
+    Returns the contents of a JSON parameter file as a dictionary with:
+
+    - "params": the keyword arguments passed to `simulate` which are the
+      same for all the runs;
+    - "ranges": maps the name of each swept parameter of `simulate` to a
+      list of its values, empty if nothing is swept;
+    - "seeds": the seeds of the runs of each combination of parameters,
+      given in the file either as "seeds" or as a number of "replicates",
+      with seeds 0 to `replicates - 1`. One run with seed 0 by default.
+    """
+    with open(path, "r") as parameter_file:
+        contents = json.load(parameter_file)
+    unknown = set(contents) - {"params", "ranges", "seeds", "replicates"}
+    if unknown:
+        raise ValueError(f"Unknown entries in {path}: {sorted(unknown)}")
+    seeds = contents.get("seeds")
+    if seeds is None:
+        seeds = list(range(contents.get("replicates", 1)))
+    return {
+        "params": contents.get("params", {}),
+        "ranges": contents.get("ranges", {}),
+        "seeds": list(seeds),
+    }
+
+
+def check_parameters(params, ranges):
+    """
+    Raises a `ValueError` unless the fixed and swept parameters are
+    arguments of `simulate`, other than `seed`, and hold every argument of
+    `simulate` without a default.
+    """
+    arguments = inspect.signature(rhabm.simulate).parameters
+    names = set(params) | set(ranges)
+    unknown = sorted(
+        name for name in names if name not in arguments or name == "seed"
+    )
+    if unknown:
+        raise ValueError(f"Unknown parameters: {unknown}")
+    missing = sorted(
+        name
+        for name, argument in arguments.items()
+        if argument.default is argument.empty and name not in names
+    )
+    if missing:
+        raise ValueError(f"Missing parameters: {missing}")
+
+
+def parser():
+    """
+    Returns the parser of the command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="rhabm", description="Run rhino poaching simulations."
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+    for command, description in (
+        ("run", "Run replicates of a single set of parameters."),
+        ("sweep", "Run replicates of every combination of the ranges."),
+    ):
+        command_parser = commands.add_parser(command, help=description)
+        command_parser.add_argument(
+            "parameters", help="The JSON parameter file."
+        )
+        command_parser.add_argument(
+            "-o",
+            "--output",
+            default="-",
+            help=(
+                "The CSV or JSON Lines file the summary of each run is "
+                "written to. Runs already in it are skipped. Defaults to "
+                "the standard output."
+            ),
+        )
+        command_parser.add_argument(
+            "--format",
+            choices=sorted(set(rhabm.OutputFormats.values())),
+            help="The format of the output, by default from its extension.",
+        )
+        command_parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=None,
+            help="The number of worker processes, all processors by default.",
+        )
+        seeds = command_parser.add_mutually_exclusive_group()
+        seeds.add_argument(
+            "--replicates",
+            type=int,
+            help="Run seeds 0 to REPLICATES - 1, instead of the file's seeds.",
+        )
+        seeds.add_argument(
+            "--seeds",
+            type=int,
+            nargs="+",
+            help="Run these seeds, instead of the file's seeds.",
+        )
+    return parser
+
+
+def main(arguments=None):
+    """
+    Runs the command line interface and returns its exit status.
+
+    `rhabm run` runs the "params" of the parameter file once for each seed,
+    ignoring any "ranges". `rhabm sweep` runs every combination of the
+    "ranges" for each seed. Both write one row per run, with a hash of the
+    fixed parameters, the swept parameters, the seed and the summary of the
+    run, as described in `stream_sweep`. Rerunning with other fixed
+    parameters into the same file adds their runs to it.
+    """
+    command_line = parser()
+    arguments = command_line.parse_args(arguments)
+    try:
+        parameters = read_parameter_file(arguments.parameters)
+        seeds = parameters["seeds"]
+        if arguments.replicates is not None:
+            seeds = list(range(arguments.replicates))
+        if arguments.seeds is not None:
+            seeds = arguments.seeds
+        ranges = {}
+        if arguments.command == "sweep":
+            ranges = parameters["ranges"]
+        check_parameters(parameters["params"], ranges)
+        key_columns = ["params"] + sorted(ranges) + ["seed"]
+        columns = key_columns + list(rhabm.SummaryMetrics)
+        result_file = rhabm.ResultFile(
+            arguments.output, columns, key_columns, arguments.format
+        )
+    except (OSError, ValueError) as error:
+        command_line.error(str(error))
+
+    with result_file:
+        written = rhabm.stream_sweep(
+            parameters["params"], ranges, result_file, seeds, arguments.jobs
+        )
+    skipped = len(rhabm.parameter_grid(ranges)) * len(seeds) - written
+    print(f"{written} runs written, {skipped} skipped", file=sys.stderr)
+    return 0
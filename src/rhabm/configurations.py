@@ -0,0 +1,162 @@
+"""A file which contains the initial configurations shared between
+processes."""
+import array
+
+import rhabm
+
+ParkArrays = ("cells", "agent_ids", "free_cells", "free_cell_positions")
+PlacementParameters = (
+    "number_of_rhinos",
+    "number_of_poachers",
+    "number_of_security_agents",
+    "number_of_selective_poachers",
+    "value_threshold",
+    "number_of_devalued_rhinos",
+    "devalued_value",
+    "target_value",
+)
+
+
+def copy_array(target, buffer):
+    """
+    Appends the contents of a buffer to a `bytearray` or an `array.array`.
+    """
+    if isinstance(target, bytearray):
+        target += buffer
+    else:
+        target.frombytes(buffer)
+
+
+class SharedConfiguration:
+    """ A class to publish the initial state of a populated park in shared
+    memory, so that worker processes can start simulations from it.
+
+    The cell store and free cell index of the park, and the arrays of its
+    `AgentPool`, are written once to a single shared memory block. Pickling
+    a configuration only sends the name of the block, so passing it to a
+    worker costs the same whatever the size of the park. `clone` builds a
+    new park and pool from the block by copying each array in one go,
+    without placing any agent or unpickling any object.
+
+    Every clone is a private copy: a running simulation writes to its own
+    grid and agents, and never to the block or to the other clones.
+
+    Sharing a configuration needs `multiprocessing.shared_memory`, from
+    Python 3.8, which is only imported once it is used.
+
+    Parameters
+    ==========
+
+    park : `Park` instance
+        The park to publish. It must store every cell, and all its agents
+        must be in `pool`.
+    pool : `AgentPool` instance
+        The agents of the park.
+
+    Attributes
+    ==========
+    width, height : `int`
+        The size of the park.
+    layout : `list`
+        The (owner, name, typecode, start, stop) entry of each array in the
+        block, where the owner is "park" or "pool".
+    memory : `multiprocessing.shared_memory.SharedMemory` instance
+        The shared memory block.
+    """
+
+    def __init__(self, park, pool):
+        from multiprocessing import shared_memory
+
+        if not isinstance(park.cells, bytearray):
+            raise ValueError("Only a dense park can be shared")
+        if len(park.agents) != len(pool):
+            raise ValueError("All the agents of the park must be in the pool")
+        self.width = park.width
+        self.height = park.height
+        self.layout = []
+        buffers = []
+        start = 0
+        for owner, names in (("park", ParkArrays), ("pool", rhabm.PoolArrays)):
+            for name in names:
+                values = getattr(park if owner == "park" else pool, name)
+                buffer = memoryview(values).cast("B")
+                typecode = getattr(values, "typecode", "B")
+                stop = start + len(buffer)
+                self.layout.append((owner, name, typecode, start, stop))
+                buffers.append(buffer)
+                start = stop
+
+        self.memory = shared_memory.SharedMemory(
+            create=True, size=max(start, 1)
+        )
+        for (_, _, _, start, stop), buffer in zip(self.layout, buffers):
+            self.memory.buf[start:stop] = buffer
+
+    @classmethod
+    def from_parameters(cls, params, seed=None):
+        """
+        Populates a park with the placement parameters of `simulate` found in
+        `params` and a given seed, and publishes it.
+        """
+        park = rhabm.create_park(
+            params["width"],
+            params["height"],
+            seed=seed,
+            occupancy=params.get("occupancy", "dense"),
+        )
+        agents = rhabm.populate(
+            park,
+            storage="pool",
+            **{
+                name: params[name]
+                for name in PlacementParameters
+                if name in params
+            },
+        )
+        pool = agents[0].pool if agents else rhabm.AgentPool(park)
+        return cls(park, pool)
+
+    def clone(self, seed=None):
+        """
+        Returns a new park, with a given seed, and the list of its agents,
+        in the state that was published.
+        """
+        park = rhabm.Park(
+            width=self.width, height=self.height, seed=seed, allocate=False
+        )
+        pool = rhabm.AgentPool(park)
+        for owner, name, typecode, start, stop in self.layout:
+            if typecode == "B":
+                values = bytearray()
+            else:
+                values = array.array(typecode)
+            with self.memory.buf[start:stop] as buffer:
+                copy_array(values, buffer)
+            setattr(park if owner == "park" else pool, name, values)
+
+        for index, kind in enumerate(pool.kinds):
+            agent = rhabm.ProxyClasses[kind](pool, index)
+            pool.agents.append(agent)
+            park.register(agent)
+            park.registry[agent.code][agent.location] = agent
+        return park, list(pool.agents)
+
+    def close(self):
+        """
+        Closes this process's access to the shared memory block.
+        """
+        self.memory.close()
+
+    def unlink(self):
+        """
+        Frees the shared memory block. Only the process which published the
+        configuration should call it, once every worker is done.
+        """
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+        self.unlink()
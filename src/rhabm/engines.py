@@ -0,0 +1,76 @@
+"""A file which contains the batched update steps used by the simulation
+engines."""
+import rhabm
+
+
+def group_rhinos(agents):
+    """
+    Yields the agents in their order, with each run of consecutive rhinos
+    grouped in a list, and every other agent on its own.
+    """
+    rhinos = []
+    for agent in agents:
+        if agent.kind == rhabm.RhinoCode:
+            rhinos.append(agent)
+            continue
+        if rhinos:
+            yield rhinos
+            rhinos = []
+        yield agent
+    if rhinos:
+        yield rhinos
+
+
+def move_rhinos(park, rhinos):
+    """
+    Moves all the mobile rhinos of a park in a single synchronous step.
+
+    Every mobile rhino picks one of the cells of its neighbourhood that are
+    unoccupied at the start of the step, uniformly at random. When more than
+    one rhino picks the same cell, one of them, chosen uniformly at random,
+    moves there and the others stay where they are. A rhino can not move to a
+    cell vacated by another rhino during the same step.
+
+    Each rhino that can move thus ends on any of its free neighbouring cells
+    with equal probability, as with `Rhino.move`, apart from the conflicts.
+    The engines only move a run of rhinos which are consecutive in the
+    order of a time unit in a single step, see `group_rhinos`, so that the
+    poachers and security officers still act in between the rhinos.
+
+    Parameters
+    ==========
+
+    park : `Park` instance
+        The park which is being simulated.
+    rhinos : `list`
+        The rhino agents of the park.
+    """
+    choice = park.random.choice
+    cells = park.cells
+    width = park.width
+    height = park.height
+    unoccupied = rhabm.UnoccupiedCode
+    proposals = {}
+    for rhino in rhinos:
+        if rhino.is_mobile and rhino.caught is False:
+            # The neighbourhood of radius 1, in the order of
+            # `Park.get_neighbours`, read directly from the cell codes.
+            i, j = rhino.location
+            index = i * width + j
+            free_cells = []
+            if i + 1 < height and cells[index + width] == unoccupied:
+                free_cells.append((i + 1, j))
+            if j + 1 < width and cells[index + 1] == unoccupied:
+                free_cells.append((i, j + 1))
+            if i > 0 and cells[index - width] == unoccupied:
+                free_cells.append((i - 1, j))
+            if j > 0 and cells[index - 1] == unoccupied:
+                free_cells.append((i, j - 1))
+            if free_cells:
+                proposals.setdefault(choice(free_cells), []).append(rhino)
+
+    for new_location, movers in proposals.items():
+        if len(movers) > 1:
+            park.move(choice(movers), new_location)
+        else:
+            park.move(movers[0], new_location)
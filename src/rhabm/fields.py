@@ -0,0 +1,94 @@
+"""A file which contains the distance fields used for targeting."""
+
+
+def distance_field(park, code, radius, threshold=0):
+    """
+    Returns the distance field of a park towards the agents with a given
+    code whose value is above a threshold.
+
+    The field is built with a breadth first search started from all the
+    target cells at once. It maps the index `i * width + j` of every cell
+    within a manhattan distance `radius` of a target to its manhattan
+    distance to the closest target. Cells further away are not in the field.
+
+    Parameters
+    ==========
+
+    park : `Park` instance
+        The park which is being simulated.
+    code : `int`
+        The code of the target agents.
+    radius : `int`
+        The largest distance stored in the field.
+    threshold : `float`
+        Only the agents whose value is above the threshold are targets.
+    """
+    width = park.width
+    height = park.height
+    frontier = [
+        i * width + j
+        for (i, j), agent in park.registry[code].items()
+        if agent.value > threshold
+    ]
+    field = dict.fromkeys(frontier, 0)
+    for distance in range(1, radius + 1):
+        next_frontier = []
+        append = next_frontier.append
+        for index in frontier:
+            i, j = divmod(index, width)
+            if i + 1 < height and index + width not in field:
+                field[index + width] = distance
+                append(index + width)
+            if j + 1 < width and index + 1 not in field:
+                field[index + 1] = distance
+                append(index + 1)
+            if i > 0 and index - width not in field:
+                field[index - width] = distance
+                append(index - width)
+            if j > 0 and index - 1 not in field:
+                field[index - 1] = distance
+                append(index - 1)
+        frontier = next_frontier
+    return field
+
+
+class TargetFields:
+    """ A class to hold the distance fields of a park for a single time unit.
+
+    The field towards each kind of target is built the first time it is
+    asked for, from the state of the park at that moment, and is then shared
+    by every agent looking for that kind of target. A new instance is made
+    at the start of every time unit.
+
+    Parameters
+    ==========
+
+    park : `Park` instance
+        The park which is being simulated.
+    radius : `int`
+        The largest distance stored in the fields.
+
+    Attributes
+    ==========
+    fields : `dict`
+        Maps a (code, threshold) pair to its distance field, as returned by
+        `distance_field`.
+    """
+
+    def __init__(self, park, radius):
+        self.park = park
+        self.radius = radius
+        self.fields = {}
+
+    def get(self, code, threshold=0):
+        """
+        Returns the distance field towards the agents with a given code
+        whose value is above a threshold.
+        """
+        key = (code, threshold)
+        try:
+            return self.fields[key]
+        except KeyError:
+            field = distance_field(self.park, code, self.radius, threshold)
+            self.fields[key] = field
+            return field
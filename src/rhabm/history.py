@@ -0,0 +1,284 @@
+"""A file which contains the class used to record the history of a park."""
+import array
+import mmap
+import struct
+
+import rhabm
+
+FrameMagic = b"RHABMFR1"
+FrameHeader = struct.Struct("<8sQQ")
+
+
+class History:
+    """ A class to record the history of a park as a log of events.
+
+    The cell codes of the park are stored as a keyframe every
+    `keyframe_interval` ticks. In between, only the events are logged. Every
+    event is a change of a single cell: a move clears one cell and fills
+    another, a kill or a catch changes the code of a cell and an exit clears
+    a cell. The state of the park at any tick is rebuilt on demand from the
+    closest earlier keyframe.
+
+    Indexing the history returns the representation of the park at the start
+    of a tick, as `Park.__repr__` would have returned it then.
+
+    The keyframes of a `SparsePark` only hold its occupied cells, so they
+    take memory in proportion to the number of agents. The full cell codes
+    are only built when a tick is read.
+
+    Parameters
+    ==========
+
+    park : `Park` instance
+        The park whose history is recorded.
+    keyframe_interval : `int`
+        The number of ticks between two keyframes.
+
+    Attributes
+    ==========
+    keyframes : `dict`
+        Maps a tick to the cell codes of the park at the start of that tick,
+        as `bytes`, or for a sparse park as a `dict` mapping the index of
+        each occupied cell to its code.
+    events : `list`
+        The events of each tick, as an `array.array` of consecutive
+        (cell index, new code) pairs.
+    """
+
+    def __init__(self, park, keyframe_interval=100):
+        self.park = park
+        self.keyframe_interval = keyframe_interval
+        self.keyframes = {}
+        self.events = []
+
+    def record_tick(self):
+        """
+        Marks the start of a new tick, storing a keyframe if one is due.
+        """
+        tick = len(self.events)
+        if tick % self.keyframe_interval == 0:
+            cells = self.park.cells
+            if isinstance(cells, rhabm.SparseCells):
+                self.keyframes[tick] = dict(cells)
+            else:
+                self.keyframes[tick] = bytes(cells)
+        self.events.append(array.array("l"))
+
+    def record(self, index, code):
+        """
+        Logs that the cell with a given index has changed to a given code.
+        Changes made before the first tick is marked are part of the first
+        keyframe and are not logged.
+        """
+        if self.events:
+            events = self.events[-1]
+            events.append(index)
+            events.append(code)
+
+    def keyframe(self, tick):
+        """
+        Returns a `bytearray` of the cell codes of the keyframe of a tick.
+        """
+        keyframe = self.keyframes[tick]
+        if isinstance(keyframe, dict):
+            cells = bytearray([rhabm.UnoccupiedCode]) * len(self.park)
+            for index, code in keyframe.items():
+                cells[index] = code
+            return cells
+        return bytearray(keyframe)
+
+    def grid(self, tick):
+        """
+        Returns a `bytearray` of the cell codes of the park at the start of a
+        tick.
+        """
+        if tick < 0:
+            tick += len(self)
+        if not 0 <= tick < len(self):
+            raise IndexError("history tick out of range")
+        start = tick - tick % self.keyframe_interval
+        cells = self.keyframe(start)
+        for events in self.events[start:tick]:
+            apply_events(cells, events)
+        return cells
+
+    def __len__(self):
+        return len(self.events)
+
+    def __getitem__(self, tick):
+        if isinstance(tick, slice):
+            return [self[t] for t in range(*tick.indices(len(self)))]
+        return rhabm.render(self.grid(tick), self.park.width, self.park.height)
+
+    def __iter__(self):
+        if len(self) == 0:
+            return
+        cells = self.keyframe(0)
+        for events in self.events:
+            yield rhabm.render(cells, self.park.width, self.park.height)
+            apply_events(cells, events)
+
+
+class FrameStore:
+    """ A class to record the history of a park as a file of frames.
+
+    At the start of every tick the cell codes of the park are appended to
+    the file as a frame of `width * height` bytes, after a small header
+    holding `FrameMagic` and the size of the park. The file is read through
+    a memory map, so any tick or run of ticks can be read without loading
+    the rest of the run, and without rendering the park.
+
+    Indexing the store returns the representation of the park at the start
+    of a tick, as `History` does.
+
+    Parameters
+    ==========
+
+    path : `str`
+        The path of the file.
+    park : `Park` instance
+        If given, a new file is created and the history of the park is
+        recorded to it. Otherwise an existing file is opened for reading.
+        The park must store every cell: a frame of a `SparsePark` would be
+        as large as the park, however few agents it holds.
+
+    Attributes
+    ==========
+    width, height : `int`
+        The size of the park.
+    frame_size : `int`
+        The number of bytes of a frame.
+    """
+
+    def __init__(self, path, park=None):
+        self.path = path
+        self.park = park
+        self.map = None
+        if park is not None:
+            if isinstance(park, rhabm.SparsePark):
+                raise ValueError("Only a dense park can be recorded to a file")
+            self.width = park.width
+            self.height = park.height
+            self.file = open(path, "w+b")
+            self.file.write(
+                FrameHeader.pack(FrameMagic, self.width, self.height)
+            )
+        else:
+            self.file = open(path, "rb")
+            magic, self.width, self.height = FrameHeader.unpack(
+                self.file.read(FrameHeader.size)
+            )
+            if magic != FrameMagic:
+                raise ValueError(f"{path} is not a rhabm frame store")
+        self.frame_size = self.width * self.height
+        self.file.seek(0, 2)
+        self.frame_count = (
+            self.file.tell() - FrameHeader.size
+        ) // self.frame_size
+
+    def record_tick(self):
+        """
+        Appends the current cell codes of the park to the file.
+        """
+        self.file.write(self.park.cells)
+        self.frame_count += 1
+
+    def record(self, index, code):
+        """
+        Does nothing: every frame holds the whole park.
+        """
+
+    def flush(self):
+        """
+        Writes the recorded frames to disk.
+        """
+        if self.park is not None:
+            self.file.flush()
+
+    def close(self):
+        """
+        Closes the file and its memory map.
+        """
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+    def frames(self, start, stop):
+        """
+        Returns a read only `memoryview` of the frames of the ticks from
+        `start` to `stop`, as consecutive runs of `frame_size` cell codes.
+        Release the view before reading frames recorded after it was made.
+        """
+        start, end = self.span(start, stop)
+        return memoryview(self.map)[start:end]
+
+    def span(self, start, stop):
+        """
+        Maps the file up to the frame of tick `stop` and returns the byte
+        offsets of the frames of the ticks from `start` to `stop` in it.
+        """
+        if not 0 <= start <= stop <= len(self):
+            raise IndexError("frame store tick out of range")
+        end = FrameHeader.size + stop * self.frame_size
+        if self.map is None or len(self.map) < end:
+            self.flush()
+            if self.map is not None:
+                self.map.close()
+            self.map = mmap.mmap(
+                self.file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        return FrameHeader.size + start * self.frame_size, end
+
+    def frame(self, tick):
+        """
+        Returns a read only `memoryview` of the cell codes of the park at the
+        start of a tick.
+        """
+        if tick < 0:
+            tick += len(self)
+        return self.frames(tick, tick + 1)
+
+    def grid(self, tick):
+        """
+        Returns a `bytearray` of the cell codes of the park at the start of a
+        tick.
+        """
+        with self.frame(tick) as frame:
+            return bytearray(frame)
+
+    def heatmap(self, code, start=0, stop=None):
+        """
+        Returns an `array.array` of the number of ticks, from `start` to
+        `stop`, at the start of which each cell had a given code.
+        """
+        if stop is None:
+            stop = len(self)
+        counts = array.array("l", [0]) * self.frame_size
+        target = bytes([code])
+        start, end = self.span(start, stop)
+        position = self.map.find(target, start, end)
+        while position != -1:
+            counts[(position - FrameHeader.size) % self.frame_size] += 1
+            position = self.map.find(target, position + 1, end)
+        return counts
+
+    def __len__(self):
+        return self.frame_count
+
+    def __getitem__(self, tick):
+        if isinstance(tick, slice):
+            return [self[t] for t in range(*tick.indices(len(self)))]
+        return rhabm.render(self.grid(tick), self.width, self.height)
+
+    def __iter__(self):
+        for tick in range(len(self)):
+            yield self[tick]
+
+
+def apply_events(cells, events):
+    """
+    Applies a tick's events to an array of cell codes.
+    """
+    for position in range(0, len(events), 2):
+        cells[events[position]] = events[position + 1]
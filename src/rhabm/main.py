@@ -1,7 +1,223 @@
-import random
+import functools
+import os
 
 import rhabm
 
+StopConditions = {
+    "no_rhinos": lambda park: park.counters["living_rhinos"] == 0,
+    "no_poachers": lambda park: (
+        park.counters["active_poachers"] + park.counters["engaged_poachers"]
+        == 0
+    ),
+    "frozen": lambda park: (
+        park.counters["active_poachers"] + park.counters["engaged_poachers"]
+        == 0
+        and park.counters["security_officers"] == 0
+        and (
+            park.counters["living_rhinos"] == 0
+            or len(park.free_cells) == 0
+        )
+    ),
+}
+
+
+def create_park(width, height, seed=None, occupancy="dense"):
+    """ A function for creating the park of a simulation.
+
+    The parameters are described in `simulate`.
+    """
+    if occupancy == "dense":
+        return rhabm.Park(width=width, height=height, seed=seed)
+    if occupancy == "sparse":
+        return rhabm.SparsePark(width=width, height=height, seed=seed)
+    raise ValueError(f"Unknown occupancy: {occupancy}")
+
+
+def populate(
+    park,
+    number_of_rhinos,
+    number_of_poachers,
+    number_of_security_agents,
+    number_of_selective_poachers=0,
+    value_threshold=0.5,
+    number_of_devalued_rhinos=0,
+    devalued_value=0.2,
+    target_value=1,
+    storage="objects",
+):
+    """ A function for placing the agents of a simulation in a park.
+
+    The parameters are described in `simulate`.
+
+    Returns
+    =======
+
+    A list of the agents.
+    """
+    if storage == "objects":
+        rhino = functools.partial(rhabm.Rhino, park)
+        poacher = functools.partial(rhabm.Poacher, park)
+        security_officer = functools.partial(rhabm.SecurityOfficer, park)
+    elif storage == "pool":
+        pool = rhabm.AgentPool(park)
+        rhino = pool.add_rhino
+        poacher = pool.add_poacher
+        security_officer = pool.add_security_officer
+    else:
+        raise ValueError(f"Unknown storage: {storage}")
+
+    agents = [
+        rhino() for _ in range(number_of_rhinos - number_of_devalued_rhinos)
+    ]
+    agents += [rhino(devalued_value) for _ in range(number_of_devalued_rhinos)]
+    agents += [
+        poacher(target_value=target_value)
+        for _ in range(number_of_poachers - number_of_selective_poachers)
+    ]
+    agents += [
+        poacher(
+            minimum_horn_value_threshold=value_threshold,
+            target_value=target_value,
+        )
+        for _ in range(number_of_selective_poachers)
+    ]
+    agents += [security_officer() for _ in range(number_of_security_agents)]
+    return agents
+
+
+def run(
+    park,
+    agents,
+    clock,
+    keep_history=False,
+    engine="agents",
+    stop_when=None,
+    profiler=None,
+    targeting="search",
+    tiles=None,
+    checkpoint=None,
+    checkpoint_interval=100,
+    history_file=None,
+    scheduling="all",
+):
+    """ A generator for running the simulation on a populated park.
+
+    The park is yielded at the end of every time unit. The parameters are
+    described in `simulate`.
+    """
+    if stop_when is None:
+        stop_when = ()
+    elif isinstance(stop_when, str):
+        stop_when = (stop_when,)
+    for condition in stop_when:
+        if condition not in StopConditions:
+            raise ValueError(f"Unknown stop condition: {condition}")
+
+    if engine not in ("agents", "batched", "tiled"):
+        raise ValueError(f"Unknown engine: {engine}")
+    if targeting not in ("search", "field", "perception"):
+        raise ValueError(f"Unknown targeting: {targeting}")
+    if scheduling not in ("all", "active"):
+        raise ValueError(f"Unknown scheduling: {scheduling}")
+
+    park.schedule = [agents]
+
+    if targeting == "field":
+        radius = max(
+            (
+                agent.vision_radius + agent.movement_radius
+                for agent in agents
+                if agent.kind != rhabm.RhinoCode
+            ),
+            default=0,
+        )
+
+    tiled_grid = None
+    if profiler is not None:
+        profiler.attach(park)
+    try:
+        if engine == "batched":
+            move_rhinos = functools.partial(rhabm.move_rhinos, park)
+        elif engine == "tiled":
+            tiled_grid = rhabm.TiledGrid(park, tiles)
+            move_rhinos = tiled_grid.move_rhinos
+        else:
+            move_rhinos = None
+
+        if keep_history and history_file is not None:
+            park.history = rhabm.FrameStore(history_file, park)
+        elif keep_history:
+            park.history = rhabm.History(park)
+
+        if scheduling == "active":
+            park.scheduler = rhabm.ActiveScheduler(park, agents)
+            order = park.scheduler.agents
+        else:
+            order = functools.partial(rhabm.shuffled, park, agents)
+
+        for tick in range(clock):
+            for condition in stop_when:
+                if StopConditions[condition](park):
+                    park.stopped_at = park.ticks
+                    park.stop_reason = condition
+                    return
+
+            if targeting == "field":
+                park.target_fields = rhabm.TargetFields(park, radius)
+            if profiler is None:
+                moving = order()
+                if keep_history:
+                    park.history.record_tick()
+                if targeting == "perception":
+                    park.perception = rhabm.Perception(park, moving)
+                if move_rhinos is None:
+                    for agent in moving:
+                        if agent.caught is False:
+                            agent.move()
+                else:
+                    for agent in rhabm.group_rhinos(moving):
+                        if isinstance(agent, list):
+                            move_rhinos(agent)
+                        elif agent.caught is False:
+                            agent.move()
+            else:
+                tick_start = profiler.timer()
+                moving = order()
+                if keep_history:
+                    start = profiler.timer()
+                    park.history.record_tick()
+                    profiler.record("history", start)
+                if targeting == "perception":
+                    start = profiler.timer()
+                    park.perception = rhabm.Perception(park, moving)
+                    profiler.record("perception", start)
+                profiler.move_agents(moving, move_rhinos)
+                profiler.tick_times.append(profiler.timer() - tick_start)
+
+            park.ticks += 1
+            if (
+                checkpoint is not None
+                and park.ticks % checkpoint_interval == 0
+            ):
+                if park.scheduler is not None:
+                    park.scheduler.settle()
+                    agents[:] = park.scheduler.order()
+                park.save_checkpoint(checkpoint)
+            yield park
+    finally:
+        park.target_fields = None
+        park.perception = None
+        if park.scheduler is not None:
+            park.scheduler.settle()
+            agents[:] = park.scheduler.order()
+            park.scheduler = None
+        if isinstance(park.history, rhabm.FrameStore):
+            park.history.flush()
+        if tiled_grid is not None:
+            tiled_grid.close()
+        if profiler is not None:
+            profiler.detach(park)
+
 
 def simulate(
     width,
@@ -17,6 +233,19 @@ def simulate(
     clock=200,
     keep_history=False,
     seed=None,
+    engine="agents",
+    stop_when=None,
+    profiler=None,
+    storage="objects",
+    occupancy="dense",
+    targeting="search",
+    tiles=None,
+    configuration=None,
+    checkpoint=None,
+    checkpoint_interval=100,
+    resume=False,
+    history_file=None,
+    scheduling="all",
 ):
     """ A function for running the simulation.
 
@@ -46,48 +275,198 @@ def simulate(
     clock : `int`
         The time units for which the simulation is run.
     keep_history : `bool`
-        Keep tracks of history if True. False otherwise.
+        Keep tracks of history if True. False otherwise. The history is kept
+        as a `History` instance, which returns the representation of the
+        park at the start of each time unit.
+    history_file : `str`
+        If given with `keep_history`, the history is written to this file as
+        a `FrameStore` instead, one frame of cell codes per time unit, so
+        that memory use does not grow with `clock`. The park must be dense.
     seed : `int`
-        The seed of the experiment.
+        The seed of the experiment. The park's random number generator is
+        seeded with it, before the agents are placed. If None, the
+        generator is seeded from the operating system.
+    engine : `str`
+        How the agents are updated at each time unit:
+
+        - "agents": every agent moves in turn, in a random order.
+        - "batched": as "agents", but each run of rhinos which are
+          consecutive in the random order moves at once with
+          `move_rhinos`, see `group_rhinos`. The poachers and security
+          officers still act at their place in the order, so the outcomes
+          follow the same distribution as with "agents", apart from the
+          rhinos of a run which pick the same cell; the runs themselves
+          differ.
+        - "tiled": as "batched", but the rows of the park are split into
+          tiles and the rhinos of each tile are moved by a separate worker
+          process, as described in `TiledGrid`. The park must be dense.
+    stop_when : `str` or `iterable`
+        The conditions on which the simulation stops before `clock` time
+        units, checked at the start of each time unit:
+
+        - "no_rhinos": every rhino is dead.
+        - "no_poachers": every poacher is caught or has left the park.
+        - "frozen": the park can no longer change, as there are no poachers
+          or security officers left and no rhino can move.
+
+        The checks only read the park's counters.
+    profiler : `Profiler` instance
+        If given, the profiler records the time spent in each part of the
+        simulation.
+    storage : `str`
+        How the agents are stored:
+
+        - "objects": every agent is a `Rhino`, `Poacher` or
+          `SecurityOfficer` instance.
+        - "pool": the state of the agents is stored in the typed arrays of
+          an `AgentPool`, and each agent is a light proxy to the pool.
+    occupancy : `str`
+        How the cells of the park are stored:
+
+        - "dense": every cell is stored, as a `Park`.
+        - "sparse": only the occupied cells are stored, as a `SparsePark`.
+          Use it for very large parks with few agents.
+    targeting : `str`
+        How poachers and security officers look for their targets:
+
+        - "search": every agent searches its vision for the closest target
+          and steps towards it, as described in `Poacher.move`.
+        - "field": a distance field towards each kind of target is built
+          once per time unit and every agent steps down it, as described in
+          `Poacher.move_by_field`. The cost grows with the area around the
+          targets rather than with the number of agents.
+        - "perception": the targets of all the poachers and security
+          officers are found together once per time unit, from the state of
+          the park before they move, and every agent then moves as in
+          "search". See `Perception`.
+    scheduling : `str`
+        Which agents are moved at each time unit:
+
+        - "all": every agent which has not been caught, in a random order.
+        - "active": only the agents which have something to do, in a
+          random order, as described in `ActiveScheduler`. Dead rhinos,
+          caught poachers and poachers which have left the park are dropped,
+          and poachers removing a horn are only woken when done. The random
+          numbers drawn differ from "all".
+    tiles : `int`
+        The number of tiles, and of worker processes, of the "tiled" engine.
+        If None, the number of processors.
+    configuration : `SharedConfiguration` instance
+        If given, the simulation starts from a clone of the published park
+        and agents, with `seed` only seeding the moves. The size of the park
+        and the number of agents are then taken from the configuration and
+        the placement parameters, `storage` and `occupancy` are ignored.
+    checkpoint : `str`
+        If given, the path of a file to which the park is saved with
+        `Park.save_checkpoint` every `checkpoint_interval` time units.
+    checkpoint_interval : `int`
+        The number of time units between two checkpoints.
+    resume : `bool`
+        If True and the `checkpoint` file exists, the simulation is loaded
+        from it and runs until `clock` time units have passed in total. The
+        run continues exactly as it would have without the interruption, as
+        long as the other parameters are the same. The history, if kept,
+        only starts at the resumed time unit.
+
+    The number of time units run is kept as the park's `ticks` attribute. If
+    a stop condition was met, the park's `stopped_at` attribute is the time
+    unit at which the simulation stopped and `stop_reason` is the condition.
     """
 
-    park = rhabm.Park(width=width, height=height)
-    agents = [
-        rhabm.Rhino(park)
-        for _ in range(number_of_rhinos - number_of_devalued_rhinos)
-    ]
-    agents += [
-        rhabm.Rhino(park, devalued_value)
-        for _ in range(number_of_devalued_rhinos)
-    ]
-    agents += [
-        rhabm.Poacher(park, target_value=target_value)
-        for _ in range(number_of_poachers - number_of_selective_poachers)
-    ]
-    agents += [
-        rhabm.Poacher(
+    if resume and checkpoint is not None and os.path.exists(checkpoint):
+        park = rhabm.Park.load_checkpoint(checkpoint)
+        agents = park.schedule[0]
+    elif configuration is not None:
+        park, agents = configuration.clone(seed=seed)
+    else:
+        park = create_park(width, height, seed=seed, occupancy=occupancy)
+        agents = populate(
             park,
-            minimum_horn_value_threshold=value_threshold,
+            number_of_rhinos=number_of_rhinos,
+            number_of_poachers=number_of_poachers,
+            number_of_security_agents=number_of_security_agents,
+            number_of_selective_poachers=number_of_selective_poachers,
+            value_threshold=value_threshold,
+            number_of_devalued_rhinos=number_of_devalued_rhinos,
+            devalued_value=devalued_value,
             target_value=target_value,
+            storage=storage,
         )
-        for _ in range(number_of_selective_poachers)
-    ]
-    agents += [
-        rhabm.SecurityOfficer(park) for _ in range(number_of_security_agents)
-    ]
 
-    if keep_history:
-        park.history = []
+    for _ in run(
+        park,
+        agents,
+        clock - park.ticks,
+        keep_history=keep_history,
+        engine=engine,
+        stop_when=stop_when,
+        profiler=profiler,
+        targeting=targeting,
+        tiles=tiles,
+        checkpoint=checkpoint,
+        checkpoint_interval=checkpoint_interval,
+        history_file=history_file,
+        scheduling=scheduling,
+    ):
+        pass
 
-    if seed:
-        random.seed(seed)
-    for tick in range(clock):
-        random.shuffle(agents)
-        if keep_history:
-            park.history.append(park.__repr__())
+    return park
 
-        for agent in agents:
-            if agent.caught is False:
-                agent.move()
 
-    return park
+def simulate_iter(
+    width,
+    height,
+    number_of_rhinos,
+    number_of_poachers,
+    number_of_security_agents,
+    number_of_selective_poachers=0,
+    value_threshold=0.5,
+    number_of_devalued_rhinos=0,
+    devalued_value=0.2,
+    target_value=1,
+    clock=200,
+    seed=None,
+    engine="agents",
+    stop_when=None,
+    profiler=None,
+    storage="objects",
+    occupancy="dense",
+    targeting="search",
+    tiles=None,
+    scheduling="all",
+):
+    """ A generator for running the simulation one time unit at a time.
+
+    After every time unit the generator yields `park.snapshot()`, a
+    dictionary of the state of the park, and keeps nothing else. Memory use
+    therefore does not grow with `clock`. Stopping the iteration stops the
+    simulation.
+
+    The parameters are described in `simulate`.
+    """
+    park = create_park(width, height, seed=seed, occupancy=occupancy)
+    agents = populate(
+        park,
+        number_of_rhinos=number_of_rhinos,
+        number_of_poachers=number_of_poachers,
+        number_of_security_agents=number_of_security_agents,
+        number_of_selective_poachers=number_of_selective_poachers,
+        value_threshold=value_threshold,
+        number_of_devalued_rhinos=number_of_devalued_rhinos,
+        devalued_value=devalued_value,
+        target_value=target_value,
+        storage=storage,
+    )
+
+    for park in run(
+        park,
+        agents,
+        clock,
+        engine=engine,
+        stop_when=stop_when,
+        profiler=profiler,
+        targeting=targeting,
+        tiles=tiles,
+        scheduling=scheduling,
+    ):
+        yield park.snapshot()
@@ -1,7 +1,150 @@
+import array
+import collections
+import functools
 import itertools
 import random
 
+import rhabm
+
 UnoccupiedEmoji = "🌲"
+UnoccupiedSymbol = "."
+UnoccupiedCode = 0
+NoAgent = -1
+CounterNames = (
+    "living_rhinos",
+    "dead_rhinos",
+    "horn_value_removed",
+    "active_poachers",
+    "engaged_poachers",
+    "caught_poachers",
+    "exited_poachers",
+    "security_officers",
+)
+RenderModes = ("emoji", "ascii")
+
+
+@functools.lru_cache(maxsize=None)
+def neighbour_offsets(radius):
+    """
+    Returns the (step, offset) pairs of the diamond shaped neighbourhood of a
+    given radius, excluding (0, 0).
+
+    The pairs are in the order in which `Park.get_neighbours` returns the
+    neighbours of a cell away from the park's boundary.
+    """
+    offsets = []
+    for offset in range(radius + 1):
+        for step in range(radius - offset + 1):
+            if (step, offset) != (0, 0):
+                offsets.append((step, offset))
+    for offset in range(radius + 1):
+        for step in range(1, radius - offset + 1):
+            offsets.append((-step, offset))
+    for offset in range(1, radius + 1):
+        for step in range(radius - offset + 1):
+            offsets.append((step, -offset))
+    for offset in range(1, radius + 1):
+        for step in range(1, radius - offset + 1):
+            offsets.append((-step, -offset))
+    return tuple(offsets)
+
+
+@functools.lru_cache(maxsize=None)
+def neighbour_ranks(radius):
+    """
+    Returns a dictionary mapping each (step, offset) pair of
+    `neighbour_offsets(radius)` to its position in the tuple.
+    """
+    return {
+        pair: rank for rank, pair in enumerate(neighbour_offsets(radius))
+    }
+
+
+def render_row(codes, mode="emoji"):
+    """
+    Returns the representation of a row of cell codes.
+
+    In "emoji" mode the row is a bracketed list of the emojis of its cells.
+    In "ascii" mode each cell is a single character of `CellSymbols`.
+    """
+    if mode not in RenderModes:
+        raise ValueError(f"Unknown render mode: {mode}")
+    if mode == "ascii":
+        return bytes(codes).translate(rhabm.SymbolTable).decode("ascii")
+    emojis = rhabm.CellEmojis
+    return "[" + ", ".join(emojis[code] for code in codes) + "]"
+
+
+def render(cells, width, height, mode="emoji"):
+    """
+    Returns the representation of a park from its cell codes, one line per
+    row. See `render_row` for the modes.
+    """
+    if mode == "ascii":
+        symbols = render_row(cells, mode)
+        return "".join(
+            f"{symbols[start : start + width]}\n"
+            for start in range(0, width * height, width)
+        )
+    repr = ""
+    for i in range(height):
+        repr += f"{render_row(cells[i * width : (i + 1) * width], mode)}\n"
+    return repr
+
+
+class RenderCache:
+    """ A cache of the rendered rows of a park.
+
+    The park adds the row of every cell it changes to `dirty_rows`, and
+    `render` only renders those rows again, so rendering a park in which
+    few agents have moved since the last call costs little more than
+    joining the cached rows.
+
+    Parameters
+    ==========
+
+    park : `Park` instance
+        The park to render.
+
+    Attributes
+    ==========
+    dirty_rows : `set`
+        The rows which changed since the last call to `render`.
+    rows : `dict`
+        Maps each render mode used so far to the list of its rendered
+        rows.
+    text : `dict`
+        Maps each render mode to the last rendered park, or None if a row
+        has changed since.
+    """
+
+    def __init__(self, park):
+        self.park = park
+        self.dirty_rows = set()
+        self.rows = {}
+        self.text = {}
+
+    def render(self, mode="emoji"):
+        """
+        Returns the representation of the park in a given mode.
+        """
+        park = self.park
+        if self.dirty_rows:
+            for rendered_mode, rows in self.rows.items():
+                for i in self.dirty_rows:
+                    rows[i] = f"{render_row(park.row(i), rendered_mode)}\n"
+            self.dirty_rows.clear()
+            self.text = dict.fromkeys(self.text)
+
+        text = self.text.get(mode)
+        if text is None:
+            if mode not in self.rows:
+                self.rows[mode] = [
+                    f"{render_row(park.row(i), mode)}\n"
+                    for i in range(park.height)
+                ]
+            text = self.text[mode] = "".join(self.rows[mode])
+        return text
 
 
 class Unoccupied:
@@ -9,9 +152,101 @@ class Unoccupied:
         return UnoccupiedEmoji
 
 
+class OccupantRow:
+    """ A view of a single row of the park's occupants.
+
+    Reading a cell returns the agent occupying it, or an `Unoccupied`
+    instance. Assigning to a cell places the agent on, or clears, the
+    underlying cell store of the park.
+    """
+
+    def __init__(self, park, i):
+        self.park = park
+        self.i = i
+
+    def __getitem__(self, j):
+        if j < 0:
+            j += self.park.width
+        if not 0 <= j < self.park.width:
+            raise IndexError("park column index out of range")
+        agent = self.park.agent_at(self.i, j)
+        if agent is None:
+            return Unoccupied()
+        return agent
+
+    def __setitem__(self, j, occupant):
+        if isinstance(occupant, Unoccupied):
+            self.park.vacate((self.i, j))
+        else:
+            self.park.place(occupant, (self.i, j))
+
+    def __len__(self):
+        return self.park.width
+
+    def __repr__(self):
+        return render_row(self.park.row(self.i))
+
+
+class Occupants:
+    """ A row major view of the park's occupants, indexed as
+    `occupants[i][j]`.
+    """
+
+    def __init__(self, park):
+        self.park = park
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.park.height
+        if not 0 <= i < self.park.height:
+            raise IndexError("park row index out of range")
+        return OccupantRow(self.park, i)
+
+    def __len__(self):
+        return self.park.height
+
+
+class Coordinates:
+    """ A view of the (i, j) coordinates of a park, in row major order,
+    computed when needed.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+    def __len__(self):
+        return self.width * self.height
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("park coordinate index out of range")
+        return divmod(index, self.width)
+
+    def __contains__(self, location):
+        i, j = location
+        return 0 <= i < self.height and 0 <= j < self.width
+
+    def __iter__(self):
+        return itertools.product(range(self.height), range(self.width))
+
+    def __eq__(self, other):
+        if isinstance(other, Coordinates):
+            return (self.width, self.height) == (other.width, other.height)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+
 class Park:
     """ A class to represent the wildlife park which is being simulated.
 
+    The state of each cell is held in a compact store: a `bytearray` of cell
+    codes and a parallel array of agent ids, both indexed by
+    `i * width + j`. Emojis are only produced when the park is rendered.
+
     Parameters
     ==========
 
@@ -19,64 +254,352 @@ class Park:
         The park's width.
     height : `int`
         The park's height.
+    neighbour_cache_size : `int`
+        The maximum number of (cell, radius) neighbourhoods kept by
+        `get_neighbours`. The least recently used neighbourhood is dropped
+        once the cache is full. A size of 0 disables the cache.
+    seed : `int`
+        The seed of the park's random number generator.
+    allocate : `bool`
+        If False, the cell store and the free cell index are not created,
+        for a caller which sets them itself, such as
+        `SharedConfiguration.clone`.
 
     Attributes
     ==========
-    occupants : `tuple`
-        A tuple of (i, j) coordinates. The current location of the rhino in the park.
-    coordinates : `bool`
-        True when the agent is mobile, False eitherwise. A rhino
-        becomes immobile once they meet a poacher.
+    random : `random.Random` instance
+        The random number generator of the park. Every random choice made by
+        the park, its agents and the simulation uses it.
+    cells : `bytearray`
+        The code of each cell. `UnoccupiedCode` for an empty cell, otherwise
+        the `code` of the agent occupying it.
+    agent_ids : `array.array`
+        The id of the agent occupying each cell, `NoAgent` for an empty cell.
+    agents : `list`
+        The agents registered with the park, indexed by their id.
+    free_cells : `array.array`
+        The indices of the unoccupied cells, in no particular order.
+    free_cell_positions : `array.array`
+        The position of each cell in `free_cells`, -1 for an occupied cell.
+    counters : `dict`
+        The number of agents of each kind and state, and the total value of
+        the horns removed, under the names in `CounterNames`. An engaged
+        poacher is a poacher which is not moving freely: it is hunting a
+        rhino or walking out of the park. Kept up to date by `register` and
+        `refresh`.
+    agent_counters : `list`
+        The counter each agent is counted in, indexed by the agent's id.
+    registry : `dict`
+        Maps each cell code to a dictionary of the agents with that code,
+        keyed by their (i, j) location. Kept up to date by `place`,
+        `vacate` and `refresh`.
+    occupants : `Occupants`
+        A view of the park which returns the occupant of cell (i, j) as
+        `occupants[i][j]`.
+    coordinates : `Coordinates`
+        A view of all the (i, j) coordinates of the park.
+    ticks : `int`
+        The number of time units which have been simulated.
+    stopped_at : `int` or `NoneType`
+        The time unit at which the simulation stopped early, None if it did
+        not.
+    stop_reason : `str` or `NoneType`
+        The stop condition which ended the simulation early.
+    history : `History` instance or `NoneType`
+        If not None, every change of a cell is logged to it.
+    schedule : `list`
+        The lists of agents moved by `run`, in their current order.
+    target_fields : `TargetFields` instance or `NoneType`
+        If not None, the distance fields of the current time unit, which
+        poachers and security officers move with.
+    perception : `Perception` instance or `NoneType`
+        If not None, the targets of the poachers and security officers for
+        the current time unit.
+    scheduler : `ActiveScheduler` instance or `NoneType`
+        If not None, the scheduler choosing the agents moved by `run`.
+    render_cache : `RenderCache` instance or `NoneType`
+        The rows rendered by `render`, created by its first call.
     """
 
-    def __init__(self, width=5, height=5):
-        self.occupants = [
-            [Unoccupied() for _ in range(width)] for _ in range(height)
-        ]
+    def __init__(
+        self,
+        width=5,
+        height=5,
+        neighbour_cache_size=8192,
+        seed=None,
+        allocate=True,
+    ):
         self.width = width
         self.height = height
-        self.coordinates = list(itertools.product(range(height), range(width)))
+        self.random = random.Random(seed)
+        self.neighbour_cache_size = neighbour_cache_size
+        self.neighbour_cache = collections.OrderedDict()
+        if allocate:
+            self.allocate()
+        else:
+            self.coordinates = Coordinates(width, height)
+        self.agents = []
+        self.counters = dict.fromkeys(CounterNames, 0)
+        self.agent_counters = []
+        self.registry = collections.defaultdict(dict)
+        self.occupants = Occupants(self)
+        self.ticks = 0
+        self.stopped_at = None
+        self.stop_reason = None
+        self.history = None
+        self.target_fields = None
+        self.perception = None
+        self.scheduler = None
+        self.schedule = []
+        self.render_cache = None
+
+    def allocate(self):
+        """
+        Creates the cell store, the free cell index and the coordinates of
+        the park.
+        """
+        size = self.width * self.height
+        self.cells = bytearray(size)
+        self.agent_ids = array.array("l", [NoAgent]) * size
+        self.free_cells = array.array("l", range(size))
+        self.free_cell_positions = array.array("l", range(size))
+        self.coordinates = Coordinates(self.width, self.height)
+
+    def register(self, agent):
+        """
+        Registers an agent with the park and returns the agent's id.
+        """
+        self.agents.append(agent)
+        counter = agent.counter
+        self.agent_counters.append(counter)
+        self.counters[counter] += 1
+        return len(self.agents) - 1
+
+    def is_unoccupied(self, i, j):
+        """
+        Returns True if cell (i, j) is unoccupied, False otherwise.
+        """
+        return self.cells[i * self.width + j] == UnoccupiedCode
+
+    def code_at(self, i, j):
+        """
+        Returns the code of cell (i, j).
+        """
+        return self.cells[i * self.width + j]
+
+    def agent_at(self, i, j):
+        """
+        Returns the agent occupying cell (i, j), None if the cell is
+        unoccupied.
+        """
+        agent_id = self.agent_ids[i * self.width + j]
+        if agent_id == NoAgent:
+            return None
+        return self.agents[agent_id]
+
+    def place(self, agent, location):
+        """
+        Places an agent on a cell, replacing any previous occupant.
+        """
+        index = location[0] * self.width + location[1]
+        if self.cells[index] != UnoccupiedCode:
+            self.vacate(location)
+        self.take_free_cell(index)
+        code = agent.code
+        self.cells[index] = code
+        self.agent_ids[index] = agent.agent_id
+        self.registry[code][location] = agent
+        if self.history is not None:
+            self.history.record(index, code)
+        if self.render_cache is not None:
+            self.render_cache.dirty_rows.add(index // self.width)
+
+    def vacate(self, location):
+        """
+        Clears a cell.
+        """
+        index = location[0] * self.width + location[1]
+        code = self.cells[index]
+        if code != UnoccupiedCode:
+            del self.registry[code][location]
+            self.cells[index] = UnoccupiedCode
+            self.agent_ids[index] = NoAgent
+            self.release_free_cell(index)
+            if self.history is not None:
+                self.history.record(index, UnoccupiedCode)
+            if self.render_cache is not None:
+                self.render_cache.dirty_rows.add(index // self.width)
+
+    def take_free_cell(self, index):
+        """
+        Removes a cell from the free cell index, by swapping it with the last
+        free cell.
+        """
+        position = self.free_cell_positions[index]
+        last = self.free_cells.pop()
+        if last != index:
+            self.free_cells[position] = last
+            self.free_cell_positions[last] = position
+        self.free_cell_positions[index] = -1
+
+    def release_free_cell(self, index):
+        """
+        Adds a cell to the free cell index.
+        """
+        self.free_cell_positions[index] = len(self.free_cells)
+        self.free_cells.append(index)
+
+    def remove(self, agent):
+        """
+        Clears the cell of an agent, if the agent is still occupying it.
+        """
+        index = agent.location[0] * self.width + agent.location[1]
+        if self.agent_ids[index] == agent.agent_id:
+            self.vacate(agent.location)
+
+    def move(self, agent, new_location):
+        """
+        Moves an agent from its current location to a new one.
+        """
+        self.remove(agent)
+        agent.location = new_location
+        self.place(agent, new_location)
+
+    def refresh(self, agent):
+        """
+        Updates the counters and the code of an agent's cell after the
+        agent's state has changed.
+        """
+        counter = agent.counter
+        previous_counter = self.agent_counters[agent.agent_id]
+        if counter != previous_counter:
+            self.counters[previous_counter] -= 1
+            self.counters[counter] += 1
+            self.agent_counters[agent.agent_id] = counter
+            if counter == "dead_rhinos":
+                self.counters["horn_value_removed"] += agent.value
+
+        index = agent.location[0] * self.width + agent.location[1]
+        if self.agent_ids[index] == agent.agent_id:
+            code = agent.code
+            if code != self.cells[index]:
+                del self.registry[self.cells[index]][agent.location]
+                self.registry[code][agent.location] = agent
+                self.cells[index] = code
+                if self.history is not None:
+                    self.history.record(index, code)
+                if self.render_cache is not None:
+                    self.render_cache.dirty_rows.add(index // self.width)
+
+    def wake(self, agent):
+        """
+        Tells the scheduler, if any, that another agent has changed the
+        state of an agent.
+        """
+        if self.scheduler is not None:
+            self.scheduler.wake(agent)
 
     def get_random_unoccupied_cell(self):
         """
         Returns the coordinates of a random unoccupied cell.
         """
-        random.shuffle(self.coordinates)
-        for i, j in self.coordinates:
-            if self.occupants[i][j].__repr__() == UnoccupiedEmoji:
-                return i, j
-        return False
+        if len(self.free_cells) == 0:
+            return False
+        return divmod(self.random.choice(self.free_cells), self.width)
 
     def get_neighbours(self, i, j, radius=1):
-        neighbours = []
+        """
+        Returns a tuple of the coordinates of the cells within a manhattan
+        distance `radius` of cell (i, j), excluding (i, j).
+        """
+        key = (i, j, radius)
+        try:
+            neighbours = self.neighbour_cache[key]
+        except KeyError:
+            pass
+        else:
+            self.neighbour_cache.move_to_end(key)
+            return neighbours
+
+        neighbours = tuple(
+            (i + step, j + offset)
+            for step, offset in neighbour_offsets(radius)
+            if 0 <= i + step < self.height and 0 <= j + offset < self.width
+        )
+        if self.neighbour_cache_size > 0:
+            self.neighbour_cache[key] = neighbours
+            if len(self.neighbour_cache) > self.neighbour_cache_size:
+                self.neighbour_cache.popitem(last=False)
+        return neighbours
+
+    def get_nearby_agents(self, code, i, j, radius=1):
+        """
+        Returns a list of (location, agent) pairs for the agents with a given
+        code within a manhattan distance `radius` of cell (i, j).
 
-        for offset in range(min(self.width - j, radius + 1)):
-            for step in range(min(self.height - 1 - i, radius - offset) + 1):
-                if (step, offset) != (0, 0):
-                    neighbours.append((i + step, j + offset))
+        The pairs are in the order of `get_neighbours(i, j, radius)`. When
+        there are fewer agents with the code in the park than cells in the
+        neighbourhood, the registry is searched instead of the neighbourhood.
+        """
+        registered = self.registry[code]
+        if len(registered) < len(neighbour_offsets(radius)):
+            ranks = neighbour_ranks(radius)
+            nearby = [
+                (ranks[(k - i, l - j)], (k, l), agent)
+                for (k, l), agent in registered.items()
+                if 0 < abs(k - i) + abs(l - j) <= radius
+            ]
+            nearby.sort(key=lambda item: item[0])
+            return [(location, agent) for _, location, agent in nearby]
 
-        for offset in range(min(self.width - j, radius + 1)):
-            for step in range(1, min(i, radius - offset) + 1):
-                if (step, offset) != (0, 0):
-                    neighbours.append((i - step, j + offset))
+        return [
+            ((k, l), self.agent_at(k, l))
+            for k, l in self.get_neighbours(i, j, radius)
+            if self.cells[k * self.width + l] == code
+        ]
 
-        for offset in range(1, min(j, radius + 1) + 1):
-            for step in range(min(self.height - 1 - i, radius - offset) + 1):
-                if (step, offset) != (0, 0):
-                    neighbours.append((i + step, j - offset))
+    def save_checkpoint(self, path):
+        """
+        Saves the state of the park and its agents to a binary file. See
+        `save_checkpoint`.
+        """
+        rhabm.save_checkpoint(self, path)
 
-        for offset in range(1, min(j, radius + 1) + 1):
-            for step in range(1, min(i, radius - offset) + 1):
-                if (step, offset) != (0, 0):
-                    neighbours.append((i - step, j - offset))
+    @staticmethod
+    def load_checkpoint(path):
+        """
+        Returns the park saved in a checkpoint file. See `load_checkpoint`.
+        """
+        return rhabm.load_checkpoint(path)
 
-        return neighbours
+    def row(self, i):
+        """
+        Returns the cell codes of row i.
+        """
+        return self.cells[i * self.width : (i + 1) * self.width]
+
+    def snapshot(self):
+        """
+        Returns a dictionary of the tick and of the counters of the park.
+        """
+        snapshot = {"tick": self.ticks}
+        snapshot.update(self.counters)
+        return snapshot
 
     def __len__(self):
         return self.width * self.height
 
+    def render(self, mode="emoji"):
+        """
+        Returns the representation of the park in a given mode, one line per
+        row. See `render_row` for the modes.
+
+        The rendered rows are cached, and only the rows in which a cell has
+        changed since the last call are rendered again.
+        """
+        if self.render_cache is None:
+            self.render_cache = RenderCache(self)
+        return self.render_cache.render(mode)
+
     def __repr__(self):
-        repr = ""
-        for row in self.occupants:
-            repr += f"{str(row)}\n"
-        return repr
+        return self.render()
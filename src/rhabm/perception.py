@@ -0,0 +1,203 @@
+"""A file which contains the perception stage computing the targets of the
+agents once per time unit."""
+import collections
+import functools
+
+import rhabm
+
+
+@functools.lru_cache(maxsize=None)
+def scan_order(radius):
+    """
+    Returns the (step, offset) pairs of `neighbour_offsets(radius)` sorted
+    by their euclidean length, ties keeping their order in
+    `neighbour_offsets`.
+    """
+    return tuple(
+        sorted(
+            rhabm.neighbour_offsets(radius),
+            key=lambda pair: pair[0] ** 2 + pair[1] ** 2,
+        )
+    )
+
+
+def target_buckets(park, code, size):
+    """
+    Returns a dictionary mapping the (i // size, j // size) bucket of every
+    agent with a given code to a list of the (location, agent) pairs of the
+    agents in it.
+    """
+    buckets = collections.defaultdict(list)
+    for (i, j), agent in park.registry[code].items():
+        buckets[(i // size, j // size)].append(((i, j), agent))
+    return buckets
+
+
+def scan_targets(park, hunters, code):
+    """
+    Returns the targets of a list of hunters as `nearest_targets`, by
+    reading the cells of the vision of each hunter in `scan_order` and
+    stopping at the first target found.
+    """
+    width = park.width
+    height = park.height
+    cells = park.cells
+    agent_ids = park.agent_ids
+    agents = park.agents
+    orders = {}
+    targets = {}
+    for hunter in hunters:
+        i, j = hunter.location
+        radius = hunter.vision_radius
+        threshold = hunter.minimum_horn_value_threshold
+        try:
+            order = orders[radius]
+        except KeyError:
+            order = orders[radius] = [
+                (step, offset, step * width + offset)
+                for step, offset in scan_order(radius)
+            ]
+        index = i * width + j
+        interior = (
+            radius <= i < height - radius and radius <= j < width - radius
+        )
+        target = False
+        for step, offset, delta in order:
+            if interior or (
+                0 <= i + step < height and 0 <= j + offset < width
+            ):
+                if cells[index + delta] == code:
+                    agent = agents[agent_ids[index + delta]]
+                    if agent.value > threshold:
+                        target = ((i + step, j + offset), agent.agent_id)
+                        break
+        targets[hunter.agent_id] = target
+    return targets
+
+
+def bucket_targets(park, hunters, code):
+    """
+    Returns the targets of a list of hunters as `nearest_targets`, by
+    bucketing the targets on a grid of squares as wide as the largest
+    vision radius of the hunters, so each hunter only looks at the targets
+    in the 3 by 3 squares around its own.
+    """
+    size = max((hunter.vision_radius for hunter in hunters), default=1)
+    size = max(size, 1)
+    buckets = target_buckets(park, code, size)
+    targets = {}
+    for hunter in hunters:
+        i, j = hunter.location
+        radius = hunter.vision_radius
+        threshold = hunter.minimum_horn_value_threshold
+        ranks = rhabm.neighbour_ranks(radius)
+        best = None
+        bucket_i = i // size
+        bucket_j = j // size
+        for k_bucket in range(bucket_i - 1, bucket_i + 2):
+            for l_bucket in range(bucket_j - 1, bucket_j + 2):
+                for (k, l), agent in buckets.get((k_bucket, l_bucket), ()):
+                    if (
+                        0 < abs(k - i) + abs(l - j) <= radius
+                        and agent.value > threshold
+                    ):
+                        key = (
+                            (k - i) ** 2 + (l - j) ** 2,
+                            ranks[(k - i, l - j)],
+                        )
+                        if best is None or key < best[0]:
+                            best = (key, ((k, l), agent.agent_id))
+        targets[hunter.agent_id] = False if best is None else best[1]
+    return targets
+
+
+def nearest_targets(park, hunters, code):
+    """
+    Returns a dictionary mapping the id of each hunter to the location and
+    the id of the closest agent with a given code within its vision whose
+    value is above the hunter's `minimum_horn_value_threshold`, or to False
+    if there is none.
+
+    As in `Poacher.find_individual`, the closest target is the one with the
+    smallest euclidean distance, and ties are broken in the order of
+    `Park.get_neighbours` for the hunter's vision radius, so the same
+    target is found. When there are fewer targets in the park than cells
+    in the largest vision, they are found with `bucket_targets`, otherwise
+    with `scan_targets`.
+
+    Parameters
+    ==========
+
+    park : `Park` instance
+        The park which is being simulated.
+    hunters : `list`
+        The poachers or security officers looking for targets.
+    code : `int`
+        The code of the target agents.
+    """
+    radius = max((hunter.vision_radius for hunter in hunters), default=0)
+    if len(park.registry[code]) < len(rhabm.neighbour_offsets(radius)):
+        return bucket_targets(park, hunters, code)
+    return scan_targets(park, hunters, code)
+
+
+class Perception:
+    """ A class to hold the targets of the poachers and security officers
+    for a single time unit.
+
+    The targets of every mobile poacher and security officer are computed
+    together by `nearest_targets` from the state of the park at the moment
+    the instance is made, and `Poacher.find_individual` reads them instead
+    of searching its vision. A new instance is made at the start of every
+    time unit, after the rhinos of the batched engines have moved.
+
+    A target which has left its cell, or changed state, since the targets
+    were computed is searched for again. An agent which had no target
+    keeps none for the time unit, even if a target comes into its vision
+    before it moves.
+
+    Parameters
+    ==========
+
+    park : `Park` instance
+        The park which is being simulated.
+    agents : `list`
+        The agents of the park. The rhinos among them are ignored.
+
+    Attributes
+    ==========
+    targets : `dict`
+        Maps the id of each mobile poacher and security officer to the
+        location and the id of its target, or to False if it has none.
+    """
+
+    def __init__(self, park, agents):
+        self.park = park
+        hunters = collections.defaultdict(list)
+        for agent in agents:
+            if (
+                agent.kind != rhabm.RhinoCode
+                and agent.is_mobile
+                and agent.caught is False
+            ):
+                hunters[agent.target_kind].append(agent)
+        self.targets = {}
+        for code, kind_hunters in hunters.items():
+            self.targets.update(nearest_targets(park, kind_hunters, code))
+
+    def target(self, agent):
+        """
+        Returns the location of the target of an agent, False if it has
+        none, or None if it has to search for one.
+        """
+        target = self.targets.get(agent.agent_id)
+        if target is None or target is False:
+            return target
+        location, target_id = target
+        index = location[0] * self.park.width + location[1]
+        if (
+            self.park.agent_ids[index] != target_id
+            or self.park.cells[index] != agent.target_kind
+        ):
+            return None
+        return location
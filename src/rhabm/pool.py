@@ -0,0 +1,322 @@
+"""A file which contains a struct of arrays representation of the agents."""
+import array
+
+import rhabm
+
+NoTarget = -1
+PoolArrays = (
+    "kinds",
+    "agent_ids",
+    "rows",
+    "columns",
+    "values",
+    "is_mobile",
+    "caught",
+    "left_park",
+    "targets",
+    "times_to_remove_rhino",
+    "target_values",
+    "minimum_horn_value_thresholds",
+    "vision_radii",
+    "movement_radii",
+)
+
+
+def array_property(name, doc):
+    """
+    Returns a property which reads and writes the entry of the agent in the
+    pool's array with a given name.
+    """
+
+    def getter(self):
+        return getattr(self.pool, name)[self.index]
+
+    def setter(self, value):
+        getattr(self.pool, name)[self.index] = value
+
+    return property(getter, setter, doc=doc)
+
+
+def flag_property(name, doc):
+    """
+    Returns a property which reads and writes the entry of the agent in the
+    pool's `bytearray` with a given name as a `bool`.
+    """
+
+    def getter(self):
+        return bool(getattr(self.pool, name)[self.index])
+
+    def setter(self, value):
+        getattr(self.pool, name)[self.index] = bool(value)
+
+    return property(getter, setter, doc=doc)
+
+
+class PooledAgent:
+    """ A class to represent an agent whose state is stored in an `AgentPool`.
+
+    A pooled agent only holds its pool and its index in the pool. Its
+    attributes read and write the pool's arrays, and it behaves like the
+    agent class it stands for.
+
+    Parameters
+    ==========
+
+    pool : `AgentPool` instance
+        The pool which stores the agent's state.
+    index : `int`
+        The index of the agent in the pool.
+    """
+
+    __slots__ = ("pool", "index")
+
+    def __init__(self, pool, index):
+        self.pool = pool
+        self.index = index
+
+    @property
+    def park(self):
+        return self.pool.park
+
+    @property
+    def location(self):
+        return self.pool.rows[self.index], self.pool.columns[self.index]
+
+    @location.setter
+    def location(self, location):
+        self.pool.rows[self.index], self.pool.columns[self.index] = location
+
+    kind = array_property("kinds", "The code of the agent when alive.")
+    agent_id = array_property("agent_ids", "The id of the agent in the park.")
+    value = array_property("values", "The value of the rhino's horn.")
+    is_mobile = flag_property("is_mobile", "True if the agent can move.")
+    caught = flag_property("caught", "True if the agent has been caught.")
+
+
+class PooledRhino(PooledAgent):
+    """ A rhino agent stored in an `AgentPool`. See `Rhino`. """
+
+    __slots__ = ()
+
+    move = rhabm.Rhino.move
+    code = rhabm.Rhino.code
+    counter = rhabm.Rhino.counter
+    __repr__ = rhabm.Rhino.__repr__
+
+
+class PooledPoacher(PooledAgent):
+    """ A poacher agent stored in an `AgentPool`. See `Poacher`. """
+
+    __slots__ = ()
+
+    vision_radius = array_property(
+        "vision_radii", "The vision radius of the agent."
+    )
+    movement_radius = array_property(
+        "movement_radii", "The moving radius of the agent."
+    )
+    time_to_remove_rhino = array_property(
+        "times_to_remove_rhino", "Time units left to remove a horn."
+    )
+    minimum_horn_value_threshold = array_property(
+        "minimum_horn_value_thresholds",
+        "The threshold for which a poacher will behave selective.",
+    )
+    target_value = array_property(
+        "target_values", "The horn value left to collect."
+    )
+    left_park = flag_property(
+        "left_park", "True once the poacher has exited the park."
+    )
+
+    @property
+    def target_agent(self):
+        target = self.pool.targets[self.index]
+        if target == NoTarget:
+            return None
+        return self.pool.agents[target]
+
+    @target_agent.setter
+    def target_agent(self, agent):
+        if agent is None:
+            self.pool.targets[self.index] = NoTarget
+        else:
+            self.pool.targets[self.index] = agent.index
+
+    target_kind = rhabm.Poacher.target_kind
+    find_individual = rhabm.Poacher.find_individual
+    move = rhabm.Poacher.move
+    move_by_field = rhabm.Poacher.move_by_field
+    engage_target = rhabm.Poacher.engage_target
+    code = rhabm.Poacher.code
+    counter = rhabm.Poacher.counter
+    __repr__ = rhabm.Poacher.__repr__
+
+
+class PooledSecurityOfficer(PooledPoacher):
+    """ A security agent stored in an `AgentPool`. See `SecurityOfficer`. """
+
+    __slots__ = ()
+
+    def find_individual(self, target=rhabm.PoacherCode):
+        return rhabm.Poacher.find_individual(self, target=target)
+
+    target_kind = rhabm.SecurityOfficer.target_kind
+    engage_target = rhabm.SecurityOfficer.engage_target
+    code = rhabm.SecurityOfficer.code
+    counter = rhabm.SecurityOfficer.counter
+    __repr__ = rhabm.SecurityOfficer.__repr__
+
+
+ProxyClasses = {
+    rhabm.RhinoCode: PooledRhino,
+    rhabm.PoacherCode: PooledPoacher,
+    rhabm.SecurityCode: PooledSecurityOfficer,
+}
+
+
+class AgentPool:
+    """ A class to store the state of the agents of a park as typed arrays.
+
+    Each agent is an index into the arrays below. The `PooledRhino`,
+    `PooledPoacher` and `PooledSecurityOfficer` proxies give access to an
+    agent as an object, and have the same behaviour as `Rhino`, `Poacher`
+    and `SecurityOfficer`. The names of the arrays are listed in
+    `PoolArrays`.
+
+    Parameters
+    ==========
+
+    park : `Park` instance
+        The park which the agents are placed in.
+
+    Attributes
+    ==========
+    agents : `list`
+        The proxy of each agent.
+    kinds : `bytearray`
+        The code of each agent when alive: `RhinoCode`, `PoacherCode` or
+        `SecurityCode`.
+    agent_ids : `array.array`
+        The id of each agent in the park.
+    rows, columns : `array.array`
+        The (i, j) coordinates of the location of each agent.
+    values : `array.array`
+        The horn value of each agent.
+    is_mobile, caught, left_park : `bytearray`
+        The flags of each agent.
+    targets : `array.array`
+        The index of the target of each agent, `NoTarget` if it has none.
+    times_to_remove_rhino : `array.array`
+        The time units each poacher needs to remove a horn.
+    target_values : `array.array`
+        The horn value each poacher still needs to collect.
+    minimum_horn_value_thresholds : `array.array`
+        The threshold for which each poacher will behave selective.
+    vision_radii, movement_radii : `array.array`
+        The vision and moving radius of each agent.
+    """
+
+    def __init__(self, park):
+        self.park = park
+        self.agents = []
+        self.kinds = bytearray()
+        self.agent_ids = array.array("l")
+        self.rows = array.array("l")
+        self.columns = array.array("l")
+        self.values = array.array("d")
+        self.is_mobile = bytearray()
+        self.caught = bytearray()
+        self.left_park = bytearray()
+        self.targets = array.array("l")
+        self.times_to_remove_rhino = array.array("l")
+        self.target_values = array.array("d")
+        self.minimum_horn_value_thresholds = array.array("d")
+        self.vision_radii = array.array("l")
+        self.movement_radii = array.array("l")
+
+    def add(
+        self,
+        proxy_class,
+        kind,
+        value=1,
+        vision_radius=0,
+        movement_radius=0,
+        time_to_remove_rhino=0,
+        minimum_horn_value_threshold=0,
+        target_value=0,
+    ):
+        """
+        Adds an agent to the pool, places it on a random unoccupied cell of
+        the park and returns its proxy.
+        """
+        location = self.park.get_random_unoccupied_cell()
+        agent = proxy_class(self, len(self.agents))
+        self.agents.append(agent)
+        self.kinds.append(kind)
+        self.rows.append(location[0])
+        self.columns.append(location[1])
+        self.values.append(value)
+        self.is_mobile.append(True)
+        self.caught.append(False)
+        self.left_park.append(False)
+        self.targets.append(NoTarget)
+        self.times_to_remove_rhino.append(time_to_remove_rhino)
+        self.target_values.append(target_value)
+        self.minimum_horn_value_thresholds.append(minimum_horn_value_threshold)
+        self.vision_radii.append(vision_radius)
+        self.movement_radii.append(movement_radius)
+        self.agent_ids.append(self.park.register(agent))
+        self.park.place(agent, location)
+        return agent
+
+    def add_rhino(self, value=1):
+        """
+        Adds a rhino to the pool. The parameters are described in `Rhino`.
+        """
+        return self.add(PooledRhino, rhabm.RhinoCode, value=value)
+
+    def add_poacher(
+        self,
+        vision_radius=3,
+        movement_radius=1,
+        time_to_remove_rhino=4,
+        minimum_horn_value_threshold=0,
+        target_value=1,
+    ):
+        """
+        Adds a poacher to the pool. The parameters are described in
+        `Poacher`.
+        """
+        return self.add(
+            PooledPoacher,
+            rhabm.PoacherCode,
+            vision_radius=vision_radius,
+            movement_radius=movement_radius,
+            time_to_remove_rhino=time_to_remove_rhino,
+            minimum_horn_value_threshold=minimum_horn_value_threshold,
+            target_value=target_value,
+        )
+
+    def add_security_officer(self, vision_radius=3, movement_radius=1):
+        """
+        Adds a security officer to the pool. The parameters are described in
+        `SecurityOfficer`.
+        """
+        return self.add(
+            PooledSecurityOfficer,
+            rhabm.SecurityCode,
+            vision_radius=vision_radius,
+            movement_radius=movement_radius,
+            time_to_remove_rhino=4,
+            target_value=1,
+        )
+
+    def __len__(self):
+        return len(self.agents)
+
+    def __getitem__(self, index):
+        return self.agents[index]
+
+    def __iter__(self):
+        return iter(self.agents)
@@ -0,0 +1,118 @@
+"""A file which contains the class used to profile the simulation."""
+import collections
+import functools
+import time
+
+import rhabm
+
+ProfiledQueries = ("get_neighbours", "get_nearby_agents")
+
+
+class Profiler:
+    """ A class to collect timings of the parts of the simulation.
+
+    A profiler is passed to `simulate` (or `run`) and is filled in while the
+    simulation runs. Without a profiler the simulation does no extra work.
+
+    Parameters
+    ==========
+
+    timer : `function`
+        The function used to read the time, in seconds.
+
+    Attributes
+    ==========
+    tick_times : `list`
+        The wall time of each time unit.
+    sections : `dict`
+        Maps the name of each profiled section to a list of the number of
+        calls and the total time spent in it. The sections are the agents'
+        `move` method, keyed by the agent's class name, the park's queries
+        in `ProfiledQueries`, "move_rhinos", "perception" and "history".
+    """
+
+    def __init__(self, timer=time.perf_counter):
+        self.timer = timer
+        self.tick_times = []
+        self.sections = collections.defaultdict(lambda: [0, 0.0])
+
+    def attach(self, park):
+        """
+        Starts timing the queries of a park.
+        """
+        for name in ProfiledQueries:
+            setattr(park, name, self.timed(name, getattr(park, name)))
+
+    def detach(self, park):
+        """
+        Stops timing the queries of a park.
+        """
+        for name in ProfiledQueries:
+            if name in vars(park):
+                delattr(park, name)
+
+    def timed(self, section, function):
+        """
+        Returns a version of a function whose calls are recorded in a given
+        section.
+        """
+        statistics = self.sections[section]
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = self.timer()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                statistics[0] += 1
+                statistics[1] += self.timer() - start
+
+        return wrapper
+
+    def record(self, section, start):
+        """
+        Records a call of a section which started at a given time.
+        """
+        statistics = self.sections[section]
+        statistics[0] += 1
+        statistics[1] += self.timer() - start
+
+    def move_agents(self, agents, move_rhinos=None):
+        """
+        Moves the agents which have not been caught, recording each move
+        under the agent's class name. If `move_rhinos` is given, each run
+        of consecutive rhinos is moved with it instead, see `group_rhinos`,
+        and recorded under "move_rhinos".
+        """
+        timer = self.timer
+        sections = self.sections
+        if move_rhinos is not None:
+            agents = rhabm.group_rhinos(agents)
+        for agent in agents:
+            if isinstance(agent, list):
+                start = timer()
+                move_rhinos(agent)
+                self.record("move_rhinos", start)
+            elif agent.caught is False:
+                start = timer()
+                agent.move()
+                statistics = sections[type(agent).__name__]
+                statistics[0] += 1
+                statistics[1] += timer() - start
+
+    def report(self):
+        """
+        Returns a dictionary of the collected timings which can be saved as
+        JSON and compared between versions.
+        """
+        return {
+            "ticks": len(self.tick_times),
+            "total_time": sum(self.tick_times),
+            "tick_times": list(self.tick_times),
+            "sections": {
+                section: {"calls": calls, "time": total_time}
+                for section, (calls, total_time) in sorted(
+                    self.sections.items()
+                )
+            },
+        }
@@ -0,0 +1,147 @@
+"""A file which contains functions for running replicates of the simulation."""
+import concurrent.futures
+import os
+import statistics
+
+import rhabm
+
+SummaryMetrics = (
+    "dead_rhinos",
+    "caught_poachers",
+    "horn_value_taken",
+    "ticks",
+)
+
+
+def summarise(park):
+    """
+    Returns a dictionary summarising the outcome of a simulation.
+
+    Parameters
+    ==========
+
+    park : `Park` instance
+        The park returned by `simulate`.
+    """
+    return {
+        "dead_rhinos": park.counters["dead_rhinos"],
+        "caught_poachers": park.counters["caught_poachers"],
+        "horn_value_taken": park.counters["horn_value_removed"],
+        "ticks": park.ticks,
+    }
+
+
+def run_replicate(params, seed, configuration=None):
+    """
+    Runs a single simulation and returns its summary, with the seed of the
+    run under the key "seed". If a `SharedConfiguration` is given, the
+    simulation starts from it.
+    """
+    park = rhabm.simulate(**params, seed=seed, configuration=configuration)
+    summary = summarise(park)
+    summary["seed"] = seed
+    return summary
+
+
+def aggregate(summaries):
+    """
+    Returns the mean, standard deviation, minimum and maximum of each summary
+    metric over a list of run summaries.
+    """
+    statistics_by_metric = {}
+    for metric in SummaryMetrics:
+        values = [summary[metric] for summary in summaries]
+        if len(values) == 0:
+            continue
+        statistics_by_metric[metric] = {
+            "mean": statistics.mean(values),
+            "std": statistics.stdev(values) if len(values) > 1 else 0.0,
+            "min": min(values),
+            "max": max(values),
+        }
+    return statistics_by_metric
+
+
+def iter_replicates(params, seeds, workers=None, configuration=None):
+    """
+    Runs `run_replicate` for each pair of parameters and seed, in worker
+    processes, and yields the summaries in the same order, each as soon as
+    it and the ones before it are done. The parameters are described in
+    `map_replicates`.
+    """
+    if len(seeds) == 0:
+        return
+    if workers is None:
+        workers = os.cpu_count() or 1
+    arguments = [params, seeds]
+    if configuration is not None:
+        arguments.append([configuration] * len(seeds))
+    if workers == 1:
+        yield from map(run_replicate, *arguments)
+        return
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        chunksize = max(1, len(seeds) // (4 * workers))
+        yield from executor.map(run_replicate, *arguments, chunksize=chunksize)
+
+
+def map_replicates(params, seeds, workers=None, configuration=None):
+    """
+    Runs `run_replicate` for each pair of parameters and seed, in worker
+    processes, and returns the summaries in the same order.
+
+    Parameters
+    ==========
+
+    params : `list`
+        The keyword arguments passed to `simulate` for each run.
+    seeds : `list`
+        The seed of each run.
+    workers : `int`
+        The number of worker processes. Defaults to the number of processors
+        on the machine. If 1, the runs happen in the current process.
+    configuration : `SharedConfiguration` instance
+        If given, every run starts from it.
+    """
+    return list(iter_replicates(params, seeds, workers, configuration))
+
+
+def simulate_many(params, seeds, workers=None, placement_seed=None):
+    """ A function for running replicates of the simulation in parallel.
+
+    Each replicate runs in a worker process and only its summary is sent back.
+    The result of a seed does not depend on the worker that ran it, so
+    the output is the same as running every seed serially.
+
+    Parameters
+    ==========
+
+    params : `dict`
+        The keyword arguments passed to `simulate`, except `seed`.
+    seeds : `iterable`
+        The seeds of the replicates, one run per seed.
+    workers : `int`
+        The number of worker processes. Defaults to the number of processors
+        on the machine. If 1, the replicates run in the current process.
+    placement_seed : `int`
+        If given, the park is populated once with this seed and published as
+        a `SharedConfiguration`, and every replicate starts from that same
+        placement, with its own seed only used for the moves.
+
+    Returns
+    =======
+
+    A dictionary with the summary of each run, in the order of `seeds`, under
+    "runs" and the statistics of each metric over all runs under
+    "aggregate".
+    """
+    seeds = list(seeds)
+    if placement_seed is None:
+        summaries = map_replicates([params] * len(seeds), seeds, workers)
+    else:
+        with rhabm.SharedConfiguration.from_parameters(
+            params, placement_seed
+        ) as configuration:
+            summaries = map_replicates(
+                [params] * len(seeds), seeds, workers, configuration
+            )
+    return {"runs": summaries, "aggregate": aggregate(summaries)}
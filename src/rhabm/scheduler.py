@@ -0,0 +1,157 @@
+"""A file which contains the scheduler that only moves the agents which have
+something to do."""
+import heapq
+
+import rhabm
+
+
+def shuffled(park, agents):
+    """
+    Shuffles a list of agents in place with the park's random number
+    generator and returns it.
+    """
+    park.random.shuffle(agents)
+    return agents
+
+
+class ActiveScheduler:
+    """ A class to choose the agents moved at each time unit, skipping the
+    ones which have nothing to do.
+
+    At the start of every time unit, `agents` sorts the listed agents:
+
+    - dead rhinos, caught poachers and poachers which have left the park
+      never act again and are dropped;
+    - immobile rhinos, held by a poacher, are dropped until `wake` is
+      called for them, when a security officer frees them;
+    - poachers removing a horn sleep until `time_to_remove_rhino` would
+      have counted down to zero, and are then listed again with it set to
+      zero;
+    - every other agent is active, and the active agents are shuffled with
+      the park's random number generator.
+
+    Agents woken during a time unit are listed from the next one. While a
+    poacher sleeps its `time_to_remove_rhino` is not counted down; `settle`
+    brings it up to date.
+
+    Parameters
+    ==========
+
+    park : `Park` instance
+        The park which is being simulated.
+    agents : `list`
+        The agents to schedule, in their current order.
+
+    Attributes
+    ==========
+    members : `set`
+        The ids of the scheduled agents.
+    active : `list`
+        The agents moved in the current time unit, in their random order.
+    woken : `list`
+        The agents woken since the start of the current time unit.
+    listed : `set`
+        The ids of the agents in `active` and `woken`.
+    sleeping : `dict`
+        Maps the id of each sleeping poacher to the time unit at which it
+        wakes up.
+    wake_ups : `list`
+        A heap of the (time unit, agent id) pairs of the sleeping poachers.
+    """
+
+    def __init__(self, park, agents):
+        self.park = park
+        self.members = {agent.agent_id for agent in agents}
+        self.active = []
+        self.woken = list(agents)
+        self.listed = set(self.members)
+        self.sleeping = {}
+        self.wake_ups = []
+
+    def agents(self):
+        """
+        Returns the agents to move in the current time unit, in a random
+        order.
+        """
+        tick = self.park.ticks
+        agents = self.park.agents
+        candidates = self.active + self.woken
+        while self.wake_ups and self.wake_ups[0][0] <= tick:
+            wake_tick, agent_id = heapq.heappop(self.wake_ups)
+            if self.sleeping.get(agent_id) == wake_tick:
+                del self.sleeping[agent_id]
+                agent = agents[agent_id]
+                agent.time_to_remove_rhino = 0
+                candidates.append(agent)
+                self.listed.add(agent_id)
+
+        self.active = []
+        self.woken = []
+        for agent in candidates:
+            if agent.caught or getattr(agent, "left_park", False):
+                self.listed.discard(agent.agent_id)
+            elif agent.is_mobile:
+                self.active.append(agent)
+            elif agent.kind == rhabm.RhinoCode:
+                self.listed.discard(agent.agent_id)
+            elif (
+                agent.kind == rhabm.PoacherCode
+                and agent.time_to_remove_rhino > 0
+            ):
+                self.listed.discard(agent.agent_id)
+                wake_tick = tick + agent.time_to_remove_rhino
+                self.sleeping[agent.agent_id] = wake_tick
+                heapq.heappush(self.wake_ups, (wake_tick, agent.agent_id))
+            else:
+                self.active.append(agent)
+        self.park.random.shuffle(self.active)
+        return self.active
+
+    def wake(self, agent):
+        """
+        Lists an agent whose state has been changed by another agent, from
+        the next time unit.
+        """
+        agent_id = agent.agent_id
+        if agent_id not in self.members or agent_id in self.listed:
+            return
+        wake_tick = self.sleeping.pop(agent_id, None)
+        if wake_tick is not None:
+            agent.time_to_remove_rhino = max(wake_tick - self.park.ticks, 0)
+        self.woken.append(agent)
+        self.listed.add(agent_id)
+
+    def settle(self):
+        """
+        Brings the `time_to_remove_rhino` of the sleeping poachers up to
+        date.
+        """
+        agents = self.park.agents
+        for agent_id, wake_tick in self.sleeping.items():
+            agents[agent_id].time_to_remove_rhino = wake_tick - self.park.ticks
+
+    def order(self):
+        """
+        Returns the scheduled agents: the active and woken agents in their
+        current order, then the sleeping poachers in the order in which they
+        wake up, then the others.
+
+        A scheduler made from this list after `settle` schedules the agents
+        as this one does.
+        """
+        agents = self.park.agents
+        order = self.active + self.woken
+        order.extend(
+            agents[agent_id]
+            for _, agent_id in sorted(
+                (wake_tick, agent_id)
+                for agent_id, wake_tick in self.sleeping.items()
+            )
+        )
+        seen = self.listed.union(self.sleeping)
+        order.extend(
+            agents[agent_id]
+            for agent_id in sorted(self.members)
+            if agent_id not in seen
+        )
+        return order
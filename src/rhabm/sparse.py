@@ -0,0 +1,126 @@
+"""A file which contains a park which only stores its occupied cells."""
+import rhabm
+
+
+class SparseCells(dict):
+    """ A cell store which only keeps the cells whose value is not the
+    default.
+
+    Reading a missing cell returns the default and assigning the default to
+    a cell removes it, so the store grows with the number of agents rather
+    than with the size of the park.
+
+    Parameters
+    ==========
+
+    size : `int`
+        The number of cells of the park.
+    default : `int`
+        The value of a cell which is not stored.
+    """
+
+    def __init__(self, size, default):
+        super().__init__()
+        self.size = size
+        self.default = default
+
+    def __missing__(self, index):
+        return self.default
+
+    def __setitem__(self, index, value):
+        if value == self.default:
+            self.pop(index, None)
+        else:
+            super().__setitem__(index, value)
+
+    def count(self, value):
+        """
+        Returns the number of cells with a given value.
+        """
+        if value == self.default:
+            return self.size - len(self)
+        return sum(stored == value for stored in self.values())
+
+    def __bytes__(self):
+        cells = bytearray([self.default]) * self.size
+        for index, value in self.items():
+            cells[index] = value
+        return bytes(cells)
+
+
+class FreeCells:
+    """ A view of the indices of the unoccupied cells of a `SparsePark`,
+    computed from its occupied cells when needed.
+    """
+
+    def __init__(self, park):
+        self.park = park
+
+    def __len__(self):
+        return self.park.cells.size - len(self.park.cells)
+
+    def __contains__(self, index):
+        return (
+            0 <= index < self.park.cells.size and index not in self.park.cells
+        )
+
+    def __iter__(self):
+        occupied = self.park.cells
+        return (
+            index for index in range(occupied.size) if index not in occupied
+        )
+
+
+class SparsePark(rhabm.Park):
+    """ A park which only stores its occupied cells.
+
+    The cells and agent ids are kept as `SparseCells`, keyed by
+    `i * width + j`, and the free cells are a view computed when needed.
+    Memory use therefore grows with the number of agents and not with the
+    size of the park, so very large, sparsely populated parks can be
+    simulated. Random unoccupied cells are drawn by rejection sampling.
+
+    A sparse park behaves as a `Park` with the agent classes, the engines
+    and the history. The parameters and attributes are described in `Park`;
+    `free_cells` is a `FreeCells` view and there is no
+    `free_cell_positions`.
+    """
+
+    def allocate(self):
+        size = self.width * self.height
+        self.cells = SparseCells(size, rhabm.UnoccupiedCode)
+        self.agent_ids = SparseCells(size, rhabm.NoAgent)
+        self.free_cells = FreeCells(self)
+        self.coordinates = rhabm.Coordinates(self.width, self.height)
+
+    def take_free_cell(self, index):
+        pass
+
+    def release_free_cell(self, index):
+        pass
+
+    def get_random_unoccupied_cell(self):
+        """
+        Returns the coordinates of a random unoccupied cell.
+
+        While at most half of the park is occupied, cells are drawn uniformly
+        until an unoccupied one is found. Otherwise one is chosen among the
+        listed unoccupied cells.
+        """
+        size = self.cells.size
+        free = size - len(self.cells)
+        if free == 0:
+            return False
+        if 2 * free >= size:
+            while True:
+                index = self.random.randrange(size)
+                if index not in self.cells:
+                    return divmod(index, self.width)
+        return divmod(self.random.choice(list(self.free_cells)), self.width)
+
+    def row(self, i):
+        start = i * self.width
+        cells = self.cells
+        return bytes(
+            cells[index] for index in range(start, start + self.width)
+        )
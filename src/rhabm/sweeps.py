@@ -0,0 +1,385 @@
+"""A file which contains functions for sweeping over simulation parameters."""
+import csv
+import hashlib
+import itertools
+import json
+import os
+import sys
+import tempfile
+
+import rhabm
+
+OutputFormats = {".csv": "csv", ".jsonl": "jsonl"}
+
+
+class ResultCache:
+    """ A class to store the summaries of simulations on disk.
+
+    Every summary is stored as a JSON file whose name is a hash of the
+    parameters of the simulation, its seed and the version of rhabm.
+
+    Parameters
+    ==========
+
+    directory : `str`
+        The directory in which the summaries are stored. It is created if it
+        does not exist.
+    version : `str`
+        The version included in the keys. Defaults to the version of rhabm,
+        so upgrading invalidates the cache.
+    """
+
+    def __init__(self, directory, version=None):
+        self.directory = directory
+        self.version = version if version is not None else rhabm.__version__
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, params, seed):
+        """
+        Returns the key of a simulation.
+        """
+        description = json.dumps(
+            {"params": params, "seed": seed, "version": self.version},
+            sort_keys=True,
+        )
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def path(self, params, seed):
+        return os.path.join(self.directory, f"{self.key(params, seed)}.json")
+
+    def get(self, params, seed):
+        """
+        Returns the stored summary of a simulation, None if there is none.
+        """
+        try:
+            with open(self.path(params, seed), "r") as cache_file:
+                return json.load(cache_file)["summary"]
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    def put(self, params, seed, summary):
+        """
+        Stores the summary of a simulation.
+        """
+        entry = {
+            "params": params,
+            "seed": seed,
+            "version": self.version,
+            "summary": summary,
+        }
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.directory, suffix=".tmp"
+        )
+        with os.fdopen(descriptor, "w") as cache_file:
+            json.dump(entry, cache_file)
+        os.replace(temporary_path, self.path(params, seed))
+
+
+def parameters_hash(params):
+    """
+    Returns a short hash of a dictionary of parameters, which identifies it
+    whatever the order of its keys.
+    """
+    description = json.dumps(params, sort_keys=True)
+    return hashlib.sha256(description.encode()).hexdigest()[:16]
+
+
+def parameter_grid(ranges):
+    """
+    Returns a list of dictionaries with every combination of the values in
+    `ranges`, a dictionary mapping parameter names to lists of values.
+    """
+    names = sorted(ranges)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(ranges[name] for name in names))
+    ]
+
+
+def sweep(
+    params,
+    ranges,
+    replicates=1,
+    seeds=None,
+    workers=None,
+    cache_directory=".rhabm-cache",
+):
+    """ A function for running the simulation over a grid of parameters.
+
+    Every combination of the parameters in `ranges` is run once for each
+    seed. The summary of each run is stored in a `ResultCache` as soon as
+    the run is done. Runs which are already in the cache are not run again,
+    so extending or overlapping a previous sweep, or running an interrupted
+    one again, only runs the new combinations and seeds.
+
+    Parameters
+    ==========
+
+    params : `dict`
+        The keyword arguments passed to `simulate` which are the same for all
+        the runs.
+    ranges : `dict`
+        Maps the name of each swept parameter of `simulate` to a list of its
+        values.
+    replicates : `int`
+        The number of runs of each combination, with seeds 0 to
+        `replicates - 1`. Ignored if `seeds` is given.
+    seeds : `iterable`
+        The seeds of the runs of each combination.
+    workers : `int`
+        The number of worker processes, see `simulate_many`.
+    cache_directory : `str`
+        The directory of the cache, None to not use a cache.
+
+    Returns
+    =======
+
+    A list with a dictionary for each combination of parameters, with the
+    swept parameters under "params", the summary of each run under "runs"
+    and their statistics under "aggregate".
+    """
+    seeds = list(range(replicates)) if seeds is None else list(seeds)
+    cache = None
+    if cache_directory is not None:
+        cache = ResultCache(cache_directory)
+
+    combinations = parameter_grid(ranges)
+    summaries = {}
+    missing = []
+    for index, combination in enumerate(combinations):
+        run_params = dict(params, **combination)
+        for seed in seeds:
+            summary = None if cache is None else cache.get(run_params, seed)
+            if summary is None:
+                missing.append((index, run_params, seed))
+            else:
+                summaries[(index, seed)] = summary
+
+    computed = rhabm.iter_replicates(
+        [run_params for _, run_params, _ in missing],
+        [seed for _, _, seed in missing],
+        workers,
+    )
+    for (index, run_params, seed), summary in zip(missing, computed):
+        if cache is not None:
+            cache.put(run_params, seed, summary)
+        summaries[(index, seed)] = summary
+
+    results = []
+    for index, combination in enumerate(combinations):
+        runs = [summaries[(index, seed)] for seed in seeds]
+        results.append(
+            {
+                "params": combination,
+                "runs": runs,
+                "aggregate": rhabm.aggregate(runs),
+            }
+        )
+    return results
+
+
+class ResultFile:
+    """ A class to stream the summaries of runs to a file, one row per run.
+
+    Rows are written to a CSV file, with a header, or to a JSON Lines file,
+    with one JSON object per line, and flushed as soon as they are written.
+    When an existing file is opened, the rows already in it are read and
+    any last line left incomplete by an interrupted run is dropped, so
+    `stream_sweep` can skip the runs which are done and append the others.
+
+    Parameters
+    ==========
+
+    path : `str`
+        The path of the file, or "-" to write to the standard output without
+        reading any previous rows.
+    columns : `list`
+        The names of the columns of a row.
+    key_columns : `list`
+        The columns which identify a run.
+    output_format : `str`
+        "csv" or "jsonl". If None, it is chosen from the extension of the
+        path with `OutputFormats`, and is "csv" for the standard output.
+
+    Attributes
+    ==========
+    done : `set`
+        The keys of the runs which are in the file, as returned by `key`.
+    is_new : `bool`
+        True if the file held no rows when it was opened, and its header, if
+        any, was written.
+    """
+
+    def __init__(self, path, columns, key_columns, output_format=None):
+        if output_format is None:
+            if path == "-":
+                output_format = "csv"
+            else:
+                extension = os.path.splitext(path)[1].lower()
+                if extension not in OutputFormats:
+                    raise ValueError(
+                        f"Unknown output format for {path}, "
+                        f"use one of {sorted(OutputFormats)}"
+                    )
+                output_format = OutputFormats[extension]
+        if output_format not in OutputFormats.values():
+            raise ValueError(f"Unknown output format: {output_format}")
+        self.path = path
+        self.columns = list(columns)
+        self.key_columns = list(key_columns)
+        self.output_format = output_format
+        self.done = set()
+
+        if path == "-":
+            self.file = sys.stdout
+            self.is_new = True
+        else:
+            self.is_new = True
+            if os.path.exists(path):
+                self.read()
+            self.file = open(path, "a", newline="")
+        if output_format == "csv":
+            self.writer = csv.DictWriter(self.file, self.columns)
+            if self.is_new:
+                self.writer.writeheader()
+                self.file.flush()
+
+    def key(self, row):
+        """
+        Returns the key of a row: the text of its key columns.
+        """
+        return tuple(str(row[column]) for column in self.key_columns)
+
+    def read(self):
+        """
+        Reads the keys of the rows of an existing file into `done`.
+
+        The whole file is checked to be a file of runs with the expected
+        columns before anything is changed. Only then is an incomplete last
+        line, left by an interrupted run, removed.
+        """
+        with open(self.path, "rb") as result_file:
+            data = result_file.read()
+        end = data.rfind(b"\n") + 1
+        not_ours = ValueError(
+            f"{self.path} is not a {self.output_format} file of runs"
+        )
+        try:
+            lines = data[:end].decode().splitlines()
+        except UnicodeDecodeError:
+            raise not_ours from None
+        partial = data[end:].decode(errors="replace")
+
+        if self.output_format == "csv":
+            reader = csv.reader(lines)
+            header = next(reader, None)
+            if header is None:
+                if not (",".join(self.columns) + "\r\n").startswith(partial):
+                    raise not_ours
+            elif header != self.columns:
+                raise ValueError(
+                    f"The columns of {self.path} are {header}, "
+                    f"not {self.columns}"
+                )
+            rows = [dict(zip(self.columns, values)) for values in reader]
+        else:
+            rows = []
+            for line in lines:
+                if line.strip():
+                    try:
+                        rows.append(json.loads(line))
+                    except ValueError:
+                        raise not_ours from None
+            if partial and not partial.startswith('{"'):
+                raise not_ours
+            try:
+                json.loads(partial)
+            except ValueError:
+                pass
+            else:
+                raise not_ours
+        try:
+            keys = [self.key(row) for row in rows]
+        except (KeyError, TypeError):
+            raise ValueError(
+                f"The rows of {self.path} are not runs with the columns "
+                f"{self.key_columns}"
+            ) from None
+
+        if end < len(data):
+            with open(self.path, "rb+") as result_file:
+                result_file.truncate(end)
+        self.is_new = end == 0
+        self.done.update(keys)
+
+    def write(self, row):
+        """
+        Writes a row and flushes the file.
+        """
+        if self.output_format == "csv":
+            self.writer.writerow(row)
+        else:
+            self.file.write(json.dumps(row) + "\n")
+        self.file.flush()
+        self.done.add(self.key(row))
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+def stream_sweep(params, ranges, result_file, seeds, workers=None):
+    """ A function for running the simulation over a grid of parameters and
+    streaming the summary of each run to a `ResultFile`.
+
+    Every combination of the parameters in `ranges` is run once for each
+    seed, skipping the runs whose row is already in the file. Each row holds
+    the `parameters_hash` of `params` under "params", the swept parameters,
+    the seed and the summary of the run, and is written as soon as it and
+    the rows before it are done. Runs of the same file with other fixed
+    parameters are therefore not skipped.
+
+    Parameters
+    ==========
+
+    params : `dict`
+        The keyword arguments passed to `simulate` which are the same for all
+        the runs.
+    ranges : `dict`
+        Maps the name of each swept parameter of `simulate` to a list of its
+        values.
+    result_file : `ResultFile` instance
+        The file the rows are written to. Its key columns should be
+        "params", the swept parameters and "seed".
+    seeds : `iterable`
+        The seeds of the runs of each combination.
+    workers : `int`
+        The number of worker processes, see `map_replicates`.
+
+    Returns
+    =======
+
+    The number of runs written.
+    """
+    params_hash = parameters_hash(params)
+    missing = []
+    for combination in parameter_grid(ranges):
+        for seed in seeds:
+            row = dict(combination, params=params_hash, seed=seed)
+            if result_file.key(row) not in result_file.done:
+                missing.append((combination, seed))
+
+    summaries = rhabm.iter_replicates(
+        [dict(params, **combination) for combination, _ in missing],
+        [seed for _, seed in missing],
+        workers,
+    )
+    for (combination, _), summary in zip(missing, summaries):
+        result_file.write(dict(combination, params=params_hash, **summary))
+    return len(missing)
@@ -0,0 +1,306 @@
+"""A file which contains the tiled engine, which moves the rhinos of a single
+park in parallel."""
+import array
+import concurrent.futures
+import os
+import random
+
+import rhabm
+
+
+def tile_bounds(tile, tiles, height):
+    """
+    Returns the first row and the row after the last row of a tile, when the
+    rows of a park are split into a number of bands of tiles.
+    """
+    return -(-tile * height // tiles), -(-(tile + 1) * height // tiles)
+
+
+def own_rows(start, stop, height):
+    """
+    Returns the first row and the row after the last row of the part of a
+    tile which only its own worker reads and writes: every row of the tile
+    except the rows next to another tile.
+    """
+    if start > 0:
+        start += 1
+    if stop < height:
+        stop -= 1
+    return start, max(start, stop)
+
+
+def move_tile(name, width, height, start, stop, indices, seed):
+    """
+    Moves the rhinos of a tile whose moves stay within the tile's own rows,
+    and returns the others.
+
+    Runs in a worker process. The rows of the tile, and the halo rows just
+    above and below it, are read from the shared cell codes of the park.
+    Each given rhino of the tile then picks one of its unoccupied
+    neighbouring cells at random, as in `move_rhinos`. When the picked
+    cell is in the tile's own rows, see `own_rows`, only rhinos of this
+    tile can have picked it, so the conflict is resolved here. If the
+    winner also starts in the own rows, its move is written to the shared
+    cell codes; no other worker reads those rows.
+
+    Parameters
+    ==========
+
+    name : `str`
+        The name of the shared memory block holding the cell codes.
+    width : `int`
+        The park's width.
+    height : `int`
+        The park's height.
+    start, stop : `int`
+        The first row of the tile and the row after its last row.
+    indices : `list`
+        The indices `i * width + j` of the cells of the rhinos of the tile
+        to move.
+    seed : `int`
+        The seed of the tile's random number generator for this time unit.
+
+    Returns
+    =======
+
+    A tuple of:
+
+    - the moves written to the cell codes, as the `bytes` of an
+      `array.array` of alternating origin and destination indices;
+    - a list of the (origin, destination) pairs of the other moves whose
+      conflicts have been resolved, for the main process to make;
+    - a list of (destination, origins) pairs of the cells outside the own
+      rows and of the rhinos of the tile which picked them.
+    """
+    from multiprocessing import shared_memory
+
+    first = max(start - 1, 0)
+    last = min(stop + 1, height)
+    offset = first * width
+    own_start, own_stop = own_rows(start, stop, height)
+    own_start *= width
+    own_stop *= width
+    unoccupied = rhabm.UnoccupiedCode
+    choice = random.Random(seed).choice
+
+    grid = shared_memory.SharedMemory(name=name)
+    try:
+        cells = bytes(grid.buf[offset : last * width])
+        proposals = {}
+        for index in indices:
+            i, j = divmod(index, width)
+            local = index - offset
+            free_cells = []
+            if i + 1 < height and cells[local + width] == unoccupied:
+                free_cells.append(index + width)
+            if j + 1 < width and cells[local + 1] == unoccupied:
+                free_cells.append(index + 1)
+            if i > 0 and cells[local - width] == unoccupied:
+                free_cells.append(index - width)
+            if j > 0 and cells[local - 1] == unoccupied:
+                free_cells.append(index - 1)
+            if free_cells:
+                proposals.setdefault(choice(free_cells), []).append(index)
+
+        applied = array.array("l")
+        moves = []
+        handoffs = []
+        for destination, origins in proposals.items():
+            if not own_start <= destination < own_stop:
+                handoffs.append((destination, origins))
+                continue
+            if len(origins) > 1:
+                origin = choice(origins)
+            else:
+                origin = origins[0]
+            if own_start <= origin < own_stop:
+                grid.buf[origin] = unoccupied
+                grid.buf[destination] = rhabm.RhinoCode
+                applied.append(origin)
+                applied.append(destination)
+            else:
+                moves.append((origin, destination))
+    finally:
+        grid.close()
+    return applied.tobytes(), moves, handoffs
+
+
+class TiledGrid:
+    """ A class to move the rhinos of a park in parallel, tile by tile.
+
+    The rows of the park are split into `tiles` bands and the cell codes of
+    the park are moved to a shared memory block, which the park keeps using
+    as its `cells`. Each run of rhinos moved at once, see `group_rhinos`,
+    is split by tile and each tile is sent to a worker process, see
+    `move_tile`, which proposes the moves of its rhinos, resolves the
+    conflicts over the cells of its own rows and writes the moves which
+    stay within its own rows to the shared block. The main process then
+    brings the rest of the park up to date for those moves, makes the other
+    moves, and resolves the conflicts over the rows next to the tile
+    boundaries, so a rhino may cross into a neighbouring tile.
+
+    The step has the same rules as `move_rhinos`: every mobile rhino picks
+    one of its neighbouring cells that are unoccupied at the start of the
+    step, uniformly at random, and when more than one rhino picks the same
+    cell one of them, chosen uniformly at random, moves there. Each tile
+    draws from its own random number generator, seeded from the park's, so
+    a run is reproducible for a given seed and number of tiles, but is not
+    the same run as with the "batched" engine.
+
+    The main process still sorts the rhinos of every run by tile and
+    updates the location, the registry entry and the free cell index entry
+    of every rhino which moves, one rhino at a time, and every run costs a
+    round trip to the workers.
+
+    The tiled engine needs `multiprocessing.shared_memory`, from Python 3.8,
+    which is only imported once it is used.
+
+    Parameters
+    ==========
+
+    park : `Park` instance
+        The park which is being simulated. It must store every cell.
+    tiles : `int`
+        The number of tiles, and of worker processes. If None, the number of
+        processors.
+
+    Attributes
+    ==========
+    grid : `multiprocessing.shared_memory.SharedMemory` instance
+        The shared memory block holding the cell codes of the park.
+    cells : `memoryview`
+        The cell codes of the park in the shared memory block.
+    executor : `concurrent.futures.ProcessPoolExecutor` instance
+        The pool of worker processes.
+    """
+
+    def __init__(self, park, tiles=None):
+        from multiprocessing import shared_memory
+
+        if not isinstance(park.cells, bytearray):
+            raise ValueError("The tiled engine needs a dense park")
+        if tiles is None:
+            tiles = os.cpu_count() or 1
+        self.park = park
+        self.tiles = min(tiles, park.height)
+        self.grid = shared_memory.SharedMemory(create=True, size=len(park))
+        self.cells = self.grid.buf[: len(park)]
+        self.cells[:] = park.cells
+        park.cells = self.cells
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.tiles
+        )
+
+    def move_rhinos(self, rhinos):
+        """
+        Moves the mobile rhinos of a list in a single synchronous step.
+
+        A rhino whose cell has been taken by a poacher leaving the park is
+        not on the grid the workers read, so it is moved afterwards in the
+        main process, with `move_rhinos`.
+        """
+        park = self.park
+        width = park.width
+        height = park.height
+        agent_ids = park.agent_ids
+        groups = [[] for _ in range(self.tiles)]
+        displaced = []
+        for rhino in rhinos:
+            if rhino.is_mobile and rhino.caught is False:
+                i, j = rhino.location
+                index = i * width + j
+                if agent_ids[index] == rhino.agent_id:
+                    groups[i * self.tiles // height].append(index)
+                else:
+                    displaced.append(rhino)
+
+        futures = []
+        for tile, indices in enumerate(groups):
+            seed = park.random.getrandbits(64)
+            if indices:
+                start, stop = tile_bounds(tile, self.tiles, height)
+                futures.append(
+                    self.executor.submit(
+                        move_tile,
+                        self.grid.name,
+                        width,
+                        height,
+                        start,
+                        stop,
+                        indices,
+                        seed,
+                    )
+                )
+
+        results = [future.result() for future in futures]
+        proposals = {}
+        for applied, moves, handoffs in results:
+            self.settle(array.array("l", applied))
+            for origin, destination in moves:
+                park.move(
+                    park.agent_at(*divmod(origin, width)),
+                    divmod(destination, width),
+                )
+            for destination, origins in handoffs:
+                proposals.setdefault(destination, []).extend(origins)
+
+        for destination, origins in proposals.items():
+            if len(origins) > 1:
+                origin = park.random.choice(origins)
+            else:
+                origin = origins[0]
+            park.move(
+                park.agent_at(*divmod(origin, width)),
+                divmod(destination, width),
+            )
+        if displaced:
+            rhabm.move_rhinos(park, displaced)
+
+    def settle(self, applied):
+        """
+        Brings the agent ids, the registry, the free cell index, the history
+        and the render cache of the park, and the locations of the rhinos,
+        up to date with the moves a worker has written to the cell codes.
+
+        Parameters
+        ==========
+
+        applied : `array.array`
+            The alternating origin and destination indices of the moves.
+        """
+        park = self.park
+        width = park.width
+        agent_ids = park.agent_ids
+        registry = park.registry[rhabm.RhinoCode]
+        free_cells = park.free_cells
+        free_cell_positions = park.free_cell_positions
+        history = park.history
+        render_cache = park.render_cache
+        for origin, destination in zip(applied[::2], applied[1::2]):
+            agent_ids[destination] = agent_ids[origin]
+            agent_ids[origin] = rhabm.NoAgent
+            location = divmod(destination, width)
+            rhino = registry.pop(divmod(origin, width))
+            rhino.location = location
+            registry[location] = rhino
+            position = free_cell_positions[destination]
+            free_cells[position] = origin
+            free_cell_positions[origin] = position
+            free_cell_positions[destination] = -1
+            if history is not None:
+                history.record(origin, rhabm.UnoccupiedCode)
+                history.record(destination, rhabm.RhinoCode)
+            if render_cache is not None:
+                render_cache.dirty_rows.add(origin // width)
+                render_cache.dirty_rows.add(destination // width)
+
+    def close(self):
+        """
+        Stops the worker processes and gives the park back its own copy of
+        the cell codes.
+        """
+        self.executor.shutdown()
+        self.park.cells = bytearray(self.cells)
+        self.cells.release()
+        self.grid.close()
+        self.grid.unlink()
@@ -61,6 +61,17 @@ def test_rhino_repr():
     assert rhino_agent.__repr__() == rhabm.DeadRhinoEmoji
 
 
+def test_rhino_code():
+    park = rhabm.Park()
+
+    rhino_agent = rhabm.Rhino(park=park)
+    assert rhino_agent.code == rhabm.RhinoCode
+    assert park.code_at(*rhino_agent.location) == rhabm.RhinoCode
+
+    rhino_agent.caught = True
+    assert rhino_agent.code == rhabm.DeadRhinoCode
+
+
 def test_poacher_init_default():
     park = rhabm.Park()
     poacher_agent = rhabm.Poacher(park=park)
@@ -262,6 +273,34 @@ def test_poacher_rep():
     assert poacher_agent.__repr__() == rhabm.CaughtPoacherEmoji
 
 
+def test_poacher_code():
+    park = rhabm.Park()
+
+    poacher_agent = rhabm.Poacher(park=park)
+    assert poacher_agent.code == rhabm.PoacherCode
+
+    poacher_agent.caught = True
+    assert poacher_agent.code == rhabm.CaughtPoacherCode
+
+
+def test_poacher_left_park_does_not_clear_cell():
+    park = rhabm.Park(width=2, height=2)
+    poacher_agent = rhabm.Poacher(
+        park=park, movement_radius=2, time_to_remove_rhino=0
+    )
+    _ = rhabm.Rhino(park=park)
+
+    for _ in range(3):
+        poacher_agent.move()
+    assert poacher_agent.left_park
+    assert park.agent_at(*poacher_agent.location) is None
+
+    security_agent = rhabm.SecurityOfficer(park=park)
+    park.move(security_agent, poacher_agent.location)
+    poacher_agent.move()
+    assert park.agent_at(*poacher_agent.location) is security_agent
+
+
 def test_security_init_default():
     park = rhabm.Park()
     security = rhabm.SecurityOfficer(park=park)
@@ -314,3 +353,4 @@ def test_security_rep():
 
     security_agent = rhabm.SecurityOfficer(park=park)
     assert security_agent.__repr__() == rhabm.SecurityEmoji
+    assert security_agent.code == rhabm.SecurityCode
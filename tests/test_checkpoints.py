@@ -0,0 +1,146 @@
+import array
+import json
+import struct
+import sys
+
+import pytest
+
+import rhabm
+
+params = {
+    "width": 12,
+    "height": 9,
+    "number_of_rhinos": 30,
+    "number_of_poachers": 6,
+    "number_of_security_agents": 3,
+    "number_of_selective_poachers": 2,
+    "number_of_devalued_rhinos": 8,
+    "seed": 4,
+}
+
+
+def test_save_and_load_checkpoint(tmp_path):
+    path = tmp_path / "park.checkpoint"
+    park = rhabm.simulate(clock=40, **params)
+    park.save_checkpoint(path)
+
+    loaded = rhabm.Park.load_checkpoint(path)
+
+    assert repr(loaded) == repr(park)
+    assert loaded.cells == park.cells
+    assert list(loaded.agent_ids) == list(park.agent_ids)
+    assert list(loaded.free_cells) == list(park.free_cells)
+    assert loaded.counters == park.counters
+    assert loaded.ticks == 40
+    assert loaded.random.getstate() == park.random.getstate()
+    assert [agent.agent_id for agent in loaded.schedule[0]] == [
+        agent.agent_id for agent in park.schedule[0]
+    ]
+    for agent, loaded_agent in zip(park.agents, loaded.agents):
+        assert type(loaded_agent) is type(agent)
+        assert loaded_agent.location == agent.location
+        assert loaded_agent.is_mobile == agent.is_mobile
+        assert loaded_agent.caught == agent.caught
+        if isinstance(agent, rhabm.Poacher):
+            assert loaded_agent.time_to_remove_rhino == (
+                agent.time_to_remove_rhino
+            )
+            assert loaded_agent.target_value == agent.target_value
+            if agent.target_agent is None:
+                assert loaded_agent.target_agent is None
+            else:
+                assert loaded_agent.target_agent.agent_id == (
+                    agent.target_agent.agent_id
+                )
+    for code, registered in park.registry.items():
+        assert sorted(loaded.registry[code]) == sorted(registered)
+
+
+def test_checkpoint_from_another_byte_order(tmp_path):
+    path = tmp_path / "park.checkpoint"
+    park = rhabm.simulate(clock=20, storage="pool", **params)
+    park.save_checkpoint(path)
+
+    data = path.read_bytes()
+    start = len(rhabm.CheckpointMagic) + 8
+    (header_length,) = struct.unpack("<Q", data[start - 8 : start])
+    header = json.loads(data[start : start + header_length])
+    body = data[start + header_length :]
+    assert {entry[2] for entry in header["layout"]} <= {"q", "i", "d", "B"}
+    assert header["byteorder"] == sys.byteorder
+
+    swapped = bytearray()
+    for _, _, typecode, array_start, array_stop in header["layout"]:
+        if typecode == "B":
+            swapped += body[array_start:array_stop]
+        else:
+            values = array.array(typecode)
+            values.frombytes(body[array_start:array_stop])
+            values.byteswap()
+            swapped += values.tobytes()
+    header["byteorder"] = "big" if sys.byteorder == "little" else "little"
+    header = json.dumps(header).encode()
+    path.write_bytes(
+        rhabm.CheckpointMagic
+        + struct.pack("<Q", len(header))
+        + header
+        + swapped
+    )
+
+    loaded = rhabm.Park.load_checkpoint(path)
+    assert repr(loaded) == repr(park)
+    assert list(loaded.agent_ids) == list(park.agent_ids)
+    assert list(loaded.free_cells) == list(park.free_cells)
+    assert loaded.agents[0].pool.rows.typecode == "l"
+    assert [agent.location for agent in loaded.agents] == [
+        agent.location for agent in park.agents
+    ]
+
+
+def test_load_checkpoint_rejects_other_files(tmp_path):
+    path = tmp_path / "not-a-checkpoint"
+    path.write_bytes(b"rhinos")
+    with pytest.raises(ValueError):
+        rhabm.load_checkpoint(path)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"engine": "batched"},
+        {"storage": "pool"},
+        {"occupancy": "sparse", "targeting": "field"},
+        {"scheduling": "active"},
+        {"scheduling": "active", "storage": "pool", "engine": "batched"},
+    ],
+)
+def test_resume_continues_the_run(tmp_path, options):
+    path = str(tmp_path / "run.checkpoint")
+    uninterrupted = rhabm.simulate(clock=70, **params, **options)
+
+    interrupted = rhabm.simulate(
+        clock=50, checkpoint=path, checkpoint_interval=25, **params, **options
+    )
+    assert interrupted.ticks == 50
+    resumed = rhabm.simulate(
+        clock=70, checkpoint=path, resume=True, **params, **options
+    )
+
+    assert resumed.ticks == 70
+    assert repr(resumed) == repr(uninterrupted)
+    assert resumed.counters == uninterrupted.counters
+    assert resumed.random.getstate() == uninterrupted.random.getstate()
+
+
+def test_resume_without_checkpoint_starts_a_new_run(tmp_path):
+    path = str(tmp_path / "run.checkpoint")
+    park = rhabm.simulate(
+        clock=30,
+        checkpoint=path,
+        checkpoint_interval=10,
+        resume=True,
+        **params,
+    )
+    assert repr(park) == repr(rhabm.simulate(clock=30, **params))
+    assert rhabm.load_checkpoint(path).ticks == 30
@@ -0,0 +1,147 @@
+import csv
+import json
+
+import pytest
+
+import rhabm
+import rhabm.cli
+
+parameters = {
+    "params": {
+        "width": 6,
+        "height": 6,
+        "number_of_rhinos": 6,
+        "number_of_poachers": 2,
+        "number_of_security_agents": 1,
+        "clock": 10,
+    },
+    "ranges": {"number_of_devalued_rhinos": [0, 3]},
+    "replicates": 2,
+}
+
+
+@pytest.fixture
+def parameter_file(tmp_path):
+    path = tmp_path / "parameters.json"
+    path.write_text(json.dumps(parameters))
+    return str(path)
+
+
+def test_read_parameter_file(parameter_file, tmp_path):
+    assert rhabm.read_parameter_file(parameter_file) == {
+        "params": parameters["params"],
+        "ranges": parameters["ranges"],
+        "seeds": [0, 1],
+    }
+
+    path = tmp_path / "seeds.json"
+    path.write_text(json.dumps({"seeds": [4, 7]}))
+    assert rhabm.read_parameter_file(str(path)) == {
+        "params": {},
+        "ranges": {},
+        "seeds": [4, 7],
+    }
+
+    path.write_text(json.dumps({"parameters": {}}))
+    with pytest.raises(ValueError):
+        rhabm.read_parameter_file(str(path))
+
+
+def test_sweep_command(parameter_file, tmp_path):
+    output = str(tmp_path / "runs.csv")
+    assert rhabm.cli.main(["sweep", parameter_file, "-o", output]) == 0
+
+    with open(output) as output_file:
+        rows = list(csv.DictReader(output_file))
+    assert [
+        (row["number_of_devalued_rhinos"], row["seed"]) for row in rows
+    ] == [("0", "0"), ("0", "1"), ("3", "0"), ("3", "1")]
+    summary = rhabm.run_replicate(
+        dict(parameters["params"], number_of_devalued_rhinos=3), 1
+    )
+    summary.update(
+        params=rhabm.parameters_hash(parameters["params"]),
+        number_of_devalued_rhinos=3,
+    )
+    assert rows[3] == {name: str(value) for name, value in summary.items()}
+
+
+def test_run_command_resumes(parameter_file, tmp_path, capsys):
+    output = str(tmp_path / "runs.jsonl")
+    arguments = ["run", parameter_file, "-o", output, "--jobs", "1"]
+    assert rhabm.cli.main(arguments + ["--seeds", "1"]) == 0
+    assert rhabm.cli.main(arguments + ["--replicates", "3"]) == 0
+    assert capsys.readouterr().err.splitlines()[-1] == (
+        "2 runs written, 1 skipped"
+    )
+
+    with open(output) as output_file:
+        rows = [json.loads(line) for line in output_file]
+    params = parameters["params"]
+    params_hash = rhabm.parameters_hash(params)
+    assert rows == [
+        dict(rhabm.run_replicate(params, seed), params=params_hash)
+        for seed in [1, 0, 2]
+    ]
+
+
+def test_run_command_to_standard_output(parameter_file, capsys):
+    assert rhabm.cli.main(["run", parameter_file, "--seeds", "5"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    columns = ["params", "seed"] + list(rhabm.SummaryMetrics)
+    assert lines[0] == ",".join(columns)
+    assert lines[1].startswith(
+        rhabm.parameters_hash(parameters["params"]) + ",5,"
+    )
+
+
+def test_check_parameters():
+    rhabm.check_parameters(parameters["params"], parameters["ranges"])
+    with pytest.raises(ValueError):
+        rhabm.check_parameters(dict(parameters["params"], widht=3), {})
+    with pytest.raises(ValueError):
+        rhabm.check_parameters(parameters["params"], {"seed": [1]})
+    with pytest.raises(ValueError):
+        rhabm.check_parameters({"width": 3}, {})
+
+
+def test_unknown_parameters(tmp_path, capsys):
+    path = tmp_path / "parameters.json"
+    path.write_text(json.dumps({"params": {"widht": 3}}))
+    with pytest.raises(SystemExit):
+        rhabm.cli.main(["run", str(path)])
+    assert "widht" in capsys.readouterr().err
+
+
+def test_run_command_with_other_params(parameter_file, tmp_path, capsys):
+    output = str(tmp_path / "runs.csv")
+    arguments = ["run", parameter_file, "-o", output, "--jobs", "1"]
+    assert rhabm.cli.main(arguments) == 0
+
+    path = tmp_path / "other.json"
+    path.write_text(
+        json.dumps({"params": dict(parameters["params"], clock=5)})
+    )
+    assert rhabm.cli.main(["run", str(path), "-o", output, "--jobs", "1"]) == 0
+    assert capsys.readouterr().err.splitlines()[-1] == (
+        "1 runs written, 0 skipped"
+    )
+    with open(output) as output_file:
+        rows = list(csv.DictReader(output_file))
+    assert [(row["seed"], row["ticks"]) for row in rows] == [
+        ("0", "10"),
+        ("1", "10"),
+        ("0", "5"),
+    ]
+
+
+def test_missing_command():
+    with pytest.raises(SystemExit):
+        rhabm.cli.main([])
+
+
+def test_unknown_output_format(parameter_file, tmp_path):
+    with pytest.raises(SystemExit):
+        rhabm.cli.main(
+            ["run", parameter_file, "-o", str(tmp_path / "runs.txt")]
+        )
@@ -0,0 +1,94 @@
+import pickle
+
+import pytest
+
+import rhabm
+
+pytest.importorskip("multiprocessing.shared_memory")
+
+params = {
+    "width": 9,
+    "height": 7,
+    "number_of_rhinos": 14,
+    "number_of_poachers": 4,
+    "number_of_security_agents": 2,
+    "number_of_selective_poachers": 1,
+    "number_of_devalued_rhinos": 3,
+    "clock": 30,
+}
+
+
+def test_clone_matches_published_park():
+    park = rhabm.Park(width=9, height=7, seed=3)
+    agents = rhabm.populate(
+        park,
+        number_of_rhinos=14,
+        number_of_poachers=4,
+        number_of_security_agents=2,
+        number_of_devalued_rhinos=3,
+        storage="pool",
+    )
+
+    with rhabm.SharedConfiguration(park, agents[0].pool) as configuration:
+        clone, clone_agents = configuration.clone(seed=0)
+
+    assert repr(clone) == repr(park)
+    assert clone.cells == park.cells
+    assert list(clone.agent_ids) == list(park.agent_ids)
+    assert sorted(clone.free_cells) == sorted(park.free_cells)
+    assert clone.counters == park.counters
+    assert [agent.location for agent in clone_agents] == [
+        agent.location for agent in agents
+    ]
+    assert [agent.value for agent in clone_agents] == [
+        agent.value for agent in agents
+    ]
+    for code, registered in park.registry.items():
+        assert sorted(clone.registry[code]) == sorted(registered)
+    assert all(
+        clone.agent_at(*agent.location) is agent for agent in clone_agents
+    )
+
+
+def test_clones_are_independent():
+    with rhabm.SharedConfiguration.from_parameters(
+        params, seed=1
+    ) as configuration:
+        first_park, first_agents = configuration.clone(seed=0)
+        second_park, _ = configuration.clone(seed=0)
+        for _ in rhabm.run(first_park, first_agents, clock=10):
+            pass
+        third_park, _ = configuration.clone(seed=0)
+
+    assert repr(first_park) != repr(second_park)
+    assert repr(third_park) == repr(second_park)
+
+
+def test_configuration_can_be_pickled():
+    with rhabm.SharedConfiguration.from_parameters(
+        params, seed=1
+    ) as configuration:
+        copy = pickle.loads(pickle.dumps(configuration))
+        assert copy.memory.name == configuration.memory.name
+        assert repr(copy.clone()[0]) == repr(configuration.clone()[0])
+        copy.close()
+
+
+def test_only_dense_parks_can_be_shared():
+    park = rhabm.SparsePark(width=3, height=3)
+    with pytest.raises(ValueError):
+        rhabm.SharedConfiguration(park, rhabm.AgentPool(park))
+
+
+def test_simulate_many_from_a_single_placement():
+    seeds = [0, 1, 2, 3]
+    serial = rhabm.simulate_many(params, seeds, workers=1, placement_seed=5)
+    parallel = rhabm.simulate_many(params, seeds, workers=2, placement_seed=5)
+
+    assert serial == parallel
+    with rhabm.SharedConfiguration.from_parameters(
+        params, seed=5
+    ) as configuration:
+        assert serial["runs"] == [
+            rhabm.run_replicate(params, seed, configuration) for seed in seeds
+        ]
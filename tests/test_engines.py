@@ -0,0 +1,117 @@
+import functools
+import statistics
+import sys
+
+import pytest
+
+import rhabm
+
+
+def test_move_rhinos():
+    park = rhabm.Park(width=3, height=3)
+    rhino_agent = rhabm.Rhino(park)
+    park.move(rhino_agent, (1, 1))
+
+    rhabm.move_rhinos(park, [rhino_agent])
+    assert rhino_agent.location in [(1, 0), (1, 2), (0, 1), (2, 1)]
+    assert park.agent_at(*rhino_agent.location) is rhino_agent
+    assert park.cells.count(rhabm.RhinoCode) == 1
+
+
+def test_move_rhinos_resolves_conflicts():
+    for seed in range(10):
+        park = rhabm.Park(width=3, height=1, seed=seed)
+        rhino_agents = [rhabm.Rhino(park) for _ in range(2)]
+        park.vacate(rhino_agents[0].location)
+        park.vacate(rhino_agents[1].location)
+        for rhino_agent, location in zip(rhino_agents, [(0, 0), (0, 2)]):
+            rhino_agent.location = location
+            park.place(rhino_agent, location)
+
+        rhabm.move_rhinos(park, rhino_agents)
+        locations = set(rhino_agent.location for rhino_agent in rhino_agents)
+        assert (0, 1) in locations
+        assert len(locations) == 2
+        assert park.cells.count(rhabm.RhinoCode) == 2
+
+
+def test_move_rhinos_skips_immobile_and_dead_rhinos():
+    park = rhabm.Park(width=3, height=3)
+    rhino_agents = [rhabm.Rhino(park) for _ in range(2)]
+    rhino_agents[0].is_mobile = False
+    rhino_agents[1].caught = True
+    locations = [rhino_agent.location for rhino_agent in rhino_agents]
+
+    rhabm.move_rhinos(park, rhino_agents)
+    assert [rhino_agent.location for rhino_agent in rhino_agents] == locations
+
+
+def test_group_rhinos():
+    park = rhabm.Park(width=4, height=4, seed=0)
+    rhinos = [rhabm.Rhino(park) for _ in range(3)]
+    poacher_agent = rhabm.Poacher(park)
+    officer = rhabm.SecurityOfficer(park)
+    agents = [rhinos[0], rhinos[1], poacher_agent, officer, rhinos[2]]
+
+    assert list(rhabm.group_rhinos(agents)) == [
+        rhinos[:2],
+        poacher_agent,
+        officer,
+        rhinos[2:],
+    ]
+    assert list(rhabm.group_rhinos([])) == []
+
+
+@functools.lru_cache(maxsize=None)
+def outcomes(seeds, **parameters):
+    """
+    Returns the mean and the standard error of the mean of the dead rhinos
+    and of the caught poachers over runs with a number of seeds.
+    """
+    parks = [
+        rhabm.simulate(
+            width=12,
+            height=12,
+            number_of_rhinos=30,
+            number_of_poachers=6,
+            number_of_security_agents=3,
+            target_value=2,
+            clock=40,
+            seed=seed,
+            **parameters,
+        )
+        for seed in range(seeds)
+    ]
+    results = []
+    for counter in ("dead_rhinos", "caught_poachers"):
+        values = [park.counters[counter] for park in parks]
+        results.append(
+            (statistics.mean(values), statistics.stdev(values) / seeds ** 0.5)
+        )
+    return results
+
+
+@pytest.mark.parametrize(
+    "engine, seeds, parameters",
+    [
+        ("batched", 800, {}),
+        pytest.param(
+            "tiled",
+            100,
+            {"tiles": 2},
+            marks=pytest.mark.skipif(
+                sys.version_info < (3, 8),
+                reason="The tiled engine needs Python 3.8",
+            ),
+        ),
+    ],
+)
+def test_engine_has_the_outcomes_of_the_agents_engine(
+    engine, seeds, parameters
+):
+    serial = outcomes(800, engine="agents")
+    batched = outcomes(seeds, engine=engine, **parameters)
+    for (mean, error), (batched_mean, batched_error) in zip(serial, batched):
+        assert abs(batched_mean - mean) < 3 * (
+            error ** 2 + batched_error ** 2
+        ) ** 0.5
@@ -0,0 +1,118 @@
+import pytest
+
+import rhabm
+
+
+def test_distance_field():
+    park = rhabm.Park(width=7, height=5, seed=0)
+    rhinos = [rhabm.Rhino(park) for _ in range(3)]
+
+    field = rhabm.distance_field(park, rhabm.RhinoCode, radius=2)
+
+    for index in range(len(park)):
+        i, j = divmod(index, park.width)
+        distance = min(
+            abs(i - k) + abs(j - l) for k, l in (r.location for r in rhinos)
+        )
+        if distance <= 2:
+            assert field[index] == distance
+        else:
+            assert index not in field
+
+
+def test_distance_field_threshold():
+    park = rhabm.Park(width=5, height=1)
+    devalued_rhino = rhabm.Rhino(park, value=0.2)
+    park.move(devalued_rhino, (0, 0))
+    valuable_rhino = rhabm.Rhino(park)
+    park.move(valuable_rhino, (0, 4))
+
+    field = rhabm.distance_field(park, rhabm.RhinoCode, 4, threshold=0.5)
+    assert field == {4: 0, 3: 1, 2: 2, 1: 3, 0: 4}
+
+
+def test_target_fields_are_built_once():
+    park = rhabm.Park(width=4, height=4, seed=0)
+    rhabm.Rhino(park)
+    target_fields = rhabm.TargetFields(park, radius=3)
+
+    field = target_fields.get(rhabm.RhinoCode)
+    assert target_fields.get(rhabm.RhinoCode) is field
+    assert target_fields.get(rhabm.RhinoCode, 0.5) is not field
+    assert list(target_fields.fields) == [
+        (rhabm.RhinoCode, 0),
+        (rhabm.RhinoCode, 0.5),
+    ]
+
+
+def test_move_by_field_steps_towards_target():
+    park = rhabm.Park(width=6, height=1, seed=0)
+    rhino_agent = rhabm.Rhino(park)
+    park.move(rhino_agent, (0, 5))
+    poacher_agent = rhabm.Poacher(park)
+    park.move(poacher_agent, (0, 2))
+    park.target_fields = rhabm.TargetFields(park, radius=4)
+
+    poacher_agent.move()
+    assert poacher_agent.location == (0, 3)
+
+    poacher_agent.move()
+    assert poacher_agent.location == (0, 4)
+    assert poacher_agent.is_mobile
+
+    poacher_agent.move()
+    assert poacher_agent.is_mobile is False
+    assert poacher_agent.target_agent is rhino_agent
+    assert rhino_agent.is_mobile is False
+    assert park.counters["engaged_poachers"] == 1
+
+
+def test_move_by_field_without_target_in_vision():
+    park = rhabm.Park(width=9, height=1, seed=0)
+    rhino_agent = rhabm.Rhino(park)
+    park.move(rhino_agent, (0, 8))
+    poacher_agent = rhabm.Poacher(park, vision_radius=2)
+    park.move(poacher_agent, (0, 4))
+    park.target_fields = rhabm.TargetFields(park, radius=3)
+
+    locations = set()
+    for _ in range(20):
+        park.move(poacher_agent, (0, 4))
+        poacher_agent.move()
+        locations.add(poacher_agent.location)
+    assert locations == {(0, 3), (0, 5)}
+
+
+@pytest.mark.parametrize("storage", ["objects", "pool"])
+def test_simulate_with_field_targeting(storage):
+    parameters = dict(
+        width=15,
+        height=15,
+        number_of_rhinos=40,
+        number_of_poachers=8,
+        number_of_security_agents=4,
+        number_of_selective_poachers=2,
+        number_of_devalued_rhinos=10,
+        clock=80,
+        seed=6,
+        targeting="field",
+    )
+    simulation = rhabm.simulate(storage=storage, **parameters)
+
+    assert simulation.target_fields is None
+    assert simulation.counters["dead_rhinos"] > 0
+    assert repr(simulation) == repr(
+        rhabm.simulate(storage="objects", **parameters)
+    )
+
+
+def test_unknown_targeting():
+    with pytest.raises(ValueError):
+        rhabm.simulate(
+            width=3,
+            height=3,
+            number_of_rhinos=1,
+            number_of_poachers=1,
+            number_of_security_agents=1,
+            targeting="telepathy",
+        )
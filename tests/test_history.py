@@ -0,0 +1,181 @@
+import pytest
+
+import rhabm
+
+
+def run_with_history(keyframe_interval, ticks=25):
+    park = rhabm.Park(width=6, height=5, seed=2)
+    agents = [rhabm.Rhino(park) for _ in range(8)]
+    agents += [rhabm.Poacher(park) for _ in range(3)]
+    agents += [rhabm.SecurityOfficer(park) for _ in range(2)]
+
+    park.history = rhabm.History(park, keyframe_interval=keyframe_interval)
+    reprs = []
+    for _ in range(ticks):
+        park.history.record_tick()
+        reprs.append(park.__repr__())
+        for agent in agents:
+            if agent.caught is False:
+                agent.move()
+    return park, reprs
+
+
+def test_history_reconstructs_every_tick():
+    for keyframe_interval in [1, 4, 100]:
+        park, reprs = run_with_history(keyframe_interval)
+
+        assert len(park.history) == len(reprs)
+        assert list(park.history) == reprs
+        assert [park.history[tick] for tick in range(len(reprs))] == reprs
+        assert park.history[-1] == reprs[-1]
+        assert park.history[3:9] == reprs[3:9]
+
+
+def test_history_keyframes():
+    park, _ = run_with_history(keyframe_interval=10)
+    assert sorted(park.history.keyframes) == [0, 10, 20]
+    assert park.history.grid(10) == bytearray(park.history.keyframes[10])
+
+
+def test_sparse_history_keyframes():
+    parameters = dict(
+        width=30,
+        height=20,
+        number_of_rhinos=12,
+        number_of_poachers=4,
+        number_of_security_agents=2,
+        clock=15,
+        seed=3,
+        keep_history=True,
+    )
+    dense = rhabm.simulate(**parameters)
+    sparse = rhabm.simulate(occupancy="sparse", **parameters)
+
+    keyframe = sparse.history.keyframes[0]
+    assert isinstance(keyframe, dict)
+    assert len(keyframe) == 18
+    assert sparse.history.keyframe(0) == bytearray(dense.history.keyframes[0])
+    assert list(sparse.history) == list(dense.history)
+    assert sparse.history[7] == dense.history[7]
+
+
+def test_history_grid_out_of_range():
+    park, _ = run_with_history(keyframe_interval=10, ticks=3)
+    with pytest.raises(IndexError):
+        park.history.grid(3)
+
+
+def test_events_are_cell_changes():
+    park = rhabm.Park(width=2, height=1)
+    rhino_agent = rhabm.Rhino(park)
+    park.move(rhino_agent, (0, 0))
+    park.history = rhabm.History(park)
+    park.history.record_tick()
+    park.move(rhino_agent, (0, 1))
+
+    assert list(park.history.events[0]) == [
+        0,
+        rhabm.UnoccupiedCode,
+        1,
+        rhabm.RhinoCode,
+    ]
+
+
+def test_apply_events():
+    cells = bytearray(3)
+    rhabm.apply_events(cells, [2, rhabm.RhinoCode, 0, rhabm.SecurityCode])
+    assert cells == bytearray([rhabm.SecurityCode, 0, rhabm.RhinoCode])
+
+
+def test_frame_store_matches_history(tmp_path):
+    path = tmp_path / "frames.bin"
+    parameters = dict(
+        width=7,
+        height=5,
+        number_of_rhinos=10,
+        number_of_poachers=3,
+        number_of_security_agents=2,
+        clock=30,
+        seed=3,
+        keep_history=True,
+    )
+    history = rhabm.simulate(**parameters).history
+    frame_store = rhabm.simulate(**parameters, history_file=path).history
+
+    assert isinstance(frame_store, rhabm.FrameStore)
+    assert len(frame_store) == len(history) == 30
+    assert list(frame_store) == list(history)
+    assert frame_store[-1] == history[-1]
+    assert frame_store[4:9] == history[4:9]
+    assert frame_store.grid(12) == history.grid(12)
+    frame_store.close()
+
+
+def test_frame_store_reads_an_existing_file(tmp_path):
+    path = tmp_path / "frames.bin"
+    park, reprs = run_with_history(keyframe_interval=1, ticks=12)
+    frame_store = rhabm.FrameStore(path, park)
+    for tick in range(12):
+        frame_store.record_tick()
+    frame_store.close()
+
+    frame_store = rhabm.FrameStore(path)
+    assert (frame_store.width, frame_store.height) == (6, 5)
+    assert len(frame_store) == 12
+    with frame_store.frames(2, 5) as frames:
+        assert len(frames) == 3 * 30
+        assert bytes(frames[30:60]) == bytes(park.cells)
+    with frame_store.frame(-1) as frame:
+        assert bytes(frame) == bytes(park.cells)
+    with pytest.raises(IndexError):
+        frame_store.frame(12)
+    frame_store.close()
+
+
+def test_frame_store_heatmap(tmp_path):
+    park, _ = run_with_history(keyframe_interval=1, ticks=0)
+    frame_store = rhabm.FrameStore(tmp_path / "frames.bin", park)
+    grids = []
+    agents = list(park.agents)
+    for _ in range(20):
+        frame_store.record_tick()
+        grids.append(bytes(park.cells))
+        for agent in agents:
+            if agent.caught is False:
+                agent.move()
+
+    heatmap = frame_store.heatmap(rhabm.RhinoCode, start=5, stop=15)
+    assert list(heatmap) == [
+        sum(grid[index] == rhabm.RhinoCode for grid in grids[5:15])
+        for index in range(len(park))
+    ]
+    assert sum(frame_store.heatmap(rhabm.PoacherCode)) == sum(
+        grid.count(rhabm.PoacherCode) for grid in grids
+    )
+    frame_store.close()
+
+
+def test_frame_store_rejects_other_files(tmp_path):
+    path = tmp_path / "frames.bin"
+    path.write_bytes(bytes(24))
+    with pytest.raises(ValueError):
+        rhabm.FrameStore(path)
+
+
+def test_frame_store_needs_a_dense_park(tmp_path):
+    path = tmp_path / "frames.bin"
+    with pytest.raises(ValueError):
+        rhabm.FrameStore(path, rhabm.SparsePark(width=4, height=3))
+    with pytest.raises(ValueError):
+        rhabm.simulate(
+            width=6,
+            height=5,
+            number_of_rhinos=3,
+            number_of_poachers=1,
+            number_of_security_agents=1,
+            clock=5,
+            occupancy="sparse",
+            keep_history=True,
+            history_file=path,
+        )
+    assert not path.exists()
@@ -1,3 +1,8 @@
+import collections
+import random
+
+import pytest
+
 import rhabm
 
 
@@ -47,6 +52,7 @@ def test_simulate_with_history():
     assert simulation.height == height
     assert simulation.width == width
     assert len(simulation.history) == clock
+    assert all(isinstance(grid, str) for grid in simulation.history)
 
 
 def test_simulate_with_non_symmetrical_park():
@@ -68,3 +74,241 @@ def test_simulate_with_non_symmetrical_park():
     assert simulation.height == height
     assert simulation.width == width
     assert simulation.coordinates == [(0, 0), (1, 0)]
+
+
+def test_simulate_with_batched_engine():
+    simulation = rhabm.simulate(
+        width=6,
+        height=6,
+        number_of_rhinos=10,
+        number_of_poachers=3,
+        number_of_security_agents=2,
+        clock=20,
+        seed=3,
+        engine="batched",
+    )
+
+    assert simulation.ticks == 20
+    assert simulation.cells.count(rhabm.RhinoCode) + simulation.cells.count(
+        rhabm.DeadRhinoCode
+    ) <= 10
+
+
+def test_simulate_with_unknown_engine():
+    with pytest.raises(ValueError):
+        rhabm.simulate(
+            width=2,
+            height=2,
+            number_of_rhinos=1,
+            number_of_poachers=0,
+            number_of_security_agents=0,
+            engine="unknown",
+        )
+
+
+def test_simulate_iter():
+    parameters = dict(
+        width=6,
+        height=6,
+        number_of_rhinos=8,
+        number_of_poachers=3,
+        number_of_security_agents=2,
+        clock=15,
+        seed=4,
+    )
+    records = list(rhabm.simulate_iter(**parameters))
+    simulation = rhabm.simulate(**parameters)
+
+    assert [record["tick"] for record in records] == list(range(1, 16))
+    assert records[-1] == simulation.snapshot()
+    assert all(
+        record["living_rhinos"] + record["dead_rhinos"] == 8
+        for record in records
+    )
+
+
+def test_simulate_iter_can_stop_early():
+    records = rhabm.simulate_iter(
+        width=4,
+        height=4,
+        number_of_rhinos=2,
+        number_of_poachers=1,
+        number_of_security_agents=1,
+        clock=1000,
+    )
+    for record in records:
+        if record["tick"] == 3:
+            break
+    assert record["tick"] == 3
+
+
+def test_populate():
+    park = rhabm.Park(width=5, height=5)
+    agents = rhabm.populate(
+        park,
+        number_of_rhinos=4,
+        number_of_poachers=3,
+        number_of_security_agents=2,
+        number_of_selective_poachers=1,
+        value_threshold=0.3,
+        number_of_devalued_rhinos=1,
+        devalued_value=0.1,
+    )
+
+    assert len(agents) == 9
+    assert sorted(agent.value for agent in agents[:4]) == [0.1, 1, 1, 1]
+    assert [agent.minimum_horn_value_threshold for agent in agents[4:7]] == [
+        0,
+        0,
+        0.3,
+    ]
+    assert isinstance(agents[-1], rhabm.SecurityOfficer)
+    assert park.snapshot() == {
+        "tick": 0,
+        "living_rhinos": 4,
+        "dead_rhinos": 0,
+        "horn_value_removed": 0,
+        "active_poachers": 3,
+        "engaged_poachers": 0,
+        "caught_poachers": 0,
+        "exited_poachers": 0,
+        "security_officers": 2,
+    }
+
+
+def test_simulate_stops_when_no_rhinos():
+    simulation = rhabm.simulate(
+        width=3,
+        height=3,
+        number_of_rhinos=1,
+        number_of_poachers=3,
+        number_of_security_agents=0,
+        clock=500,
+        seed=1,
+        stop_when="no_rhinos",
+    )
+
+    assert simulation.stop_reason == "no_rhinos"
+    assert simulation.stopped_at == simulation.ticks
+    assert simulation.ticks < 500
+    assert simulation.snapshot()["living_rhinos"] == 0
+
+
+def test_simulate_stops_when_frozen():
+    simulation = rhabm.simulate(
+        width=3,
+        height=3,
+        number_of_rhinos=0,
+        number_of_poachers=0,
+        number_of_security_agents=0,
+        stop_when=["no_poachers", "frozen"],
+    )
+
+    assert simulation.ticks == 0
+    assert simulation.stopped_at == 0
+    assert simulation.stop_reason == "no_poachers"
+
+
+def test_simulate_runs_every_tick_without_stop_condition():
+    simulation = rhabm.simulate(
+        width=3,
+        height=3,
+        number_of_rhinos=0,
+        number_of_poachers=0,
+        number_of_security_agents=0,
+        clock=7,
+    )
+
+    assert simulation.ticks == 7
+    assert simulation.stopped_at is None
+
+
+def test_frozen_stop_condition():
+    park = rhabm.Park(width=2, height=1)
+    _ = [rhabm.Rhino(park) for _ in range(2)]
+    assert rhabm.StopConditions["frozen"](park)
+
+    park = rhabm.Park(width=3, height=1)
+    _ = [rhabm.Rhino(park) for _ in range(2)]
+    assert not rhabm.StopConditions["frozen"](park)
+
+
+def test_simulate_with_unknown_stop_condition():
+    with pytest.raises(ValueError):
+        rhabm.simulate(
+            width=2,
+            height=2,
+            number_of_rhinos=1,
+            number_of_poachers=0,
+            number_of_security_agents=0,
+            stop_when="never",
+        )
+
+
+def test_simulate_is_reproducible():
+    parameters = dict(
+        width=8,
+        height=8,
+        number_of_rhinos=10,
+        number_of_poachers=3,
+        number_of_security_agents=2,
+        clock=30,
+    )
+    for seed in [0, 1]:
+        first = rhabm.simulate(**parameters, seed=seed)
+        second = rhabm.simulate(**parameters, seed=seed)
+        assert first.__repr__() == second.__repr__()
+        assert [agent.location for agent in first.agents] == [
+            agent.location for agent in second.agents
+        ]
+
+    assert (
+        rhabm.simulate(**parameters, seed=0).__repr__()
+        != rhabm.simulate(**parameters, seed=1).__repr__()
+    )
+
+
+def test_simulate_does_not_use_the_global_random_state():
+    parameters = dict(
+        width=8,
+        height=8,
+        number_of_rhinos=10,
+        number_of_poachers=3,
+        number_of_security_agents=2,
+        clock=10,
+        seed=2,
+    )
+    state = random.getstate()
+    first = rhabm.simulate(**parameters)
+    assert random.getstate() == state
+
+    random.seed(100)
+    second = rhabm.simulate(**parameters)
+    assert first.__repr__() == second.__repr__()
+
+
+@pytest.mark.parametrize("storage", ["objects", "pool"])
+def test_counters_match_the_agents(storage):
+    park = rhabm.Park(width=8, height=8, seed=2)
+    agents = rhabm.populate(
+        park,
+        number_of_rhinos=20,
+        number_of_poachers=6,
+        number_of_security_agents=2,
+        number_of_devalued_rhinos=5,
+        storage=storage,
+    )
+
+    for park in rhabm.run(park, agents, clock=60):
+        counts = collections.Counter(agent.counter for agent in agents)
+        for name in rhabm.CounterNames:
+            if name != "horn_value_removed":
+                assert park.counters[name] == counts[name]
+        assert park.counters["horn_value_removed"] == pytest.approx(
+            sum(
+                agent.value
+                for agent in agents
+                if agent.counter == "dead_rhinos"
+            )
+        )
+    assert park.counters["dead_rhinos"] > 0
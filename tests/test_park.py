@@ -18,6 +18,124 @@ def test_init():
     assert park.coordinates == [(0, 0), (0, 1), (1, 0), (1, 1)]
 
 
+def test_init_cell_store():
+    park = rhabm.Park(width=3, height=2)
+    assert park.cells == bytearray(6)
+    assert list(park.agent_ids) == [rhabm.NoAgent] * 6
+    assert park.agents == []
+
+    park = rhabm.Park(width=3, height=2, allocate=False)
+    assert not hasattr(park, "cells")
+    assert not hasattr(park, "free_cells")
+    assert len(park.coordinates) == 6
+
+
+def test_place_and_vacate():
+    park = rhabm.Park(width=3, height=2)
+    rhino_agent = rhabm.Rhino(park)
+    park.vacate(rhino_agent.location)
+
+    rhino_agent.location = (1, 2)
+    park.place(rhino_agent, rhino_agent.location)
+    assert park.code_at(1, 2) == rhabm.RhinoCode
+    assert park.agent_at(1, 2) is rhino_agent
+    assert park.is_unoccupied(1, 2) is False
+    assert park.cells.count(rhabm.RhinoCode) == 1
+
+    park.move(rhino_agent, (0, 0))
+    assert park.is_unoccupied(1, 2)
+    assert park.agent_at(1, 2) is None
+    assert park.agent_at(0, 0) is rhino_agent
+
+    rhino_agent.caught = True
+    park.refresh(rhino_agent)
+    assert park.code_at(0, 0) == rhabm.DeadRhinoCode
+
+    park.vacate((0, 0))
+    assert park.cells == bytearray(6)
+
+
+def test_remove_only_clears_own_cell():
+    park = rhabm.Park(width=2, height=1)
+    rhino_agent = rhabm.Rhino(park)
+    other_rhino_agent = rhabm.Rhino(park)
+
+    park.vacate(rhino_agent.location)
+    park.place(other_rhino_agent, rhino_agent.location)
+    park.remove(rhino_agent)
+    assert park.agent_at(*rhino_agent.location) is other_rhino_agent
+
+
+def test_occupants_view():
+    park = rhabm.Park(width=3, height=2)
+    rhino_agent = rhabm.Rhino(park)
+    park.occupants[rhino_agent.location[0]][
+        rhino_agent.location[1]
+    ] = rhabm.Unoccupied()
+    assert park.cells == bytearray(6)
+
+    park.occupants[1][0] = rhino_agent
+    assert park.occupants[1][0] is rhino_agent
+    assert park.occupants[-1][0] is rhino_agent
+    assert str(park.occupants[0][0]) == rhabm.UnoccupiedEmoji
+    assert len(park.occupants) == 2
+    assert len(park.occupants[0]) == 3
+    assert str(park.occupants[1]) == "[🦏, 🌲, 🌲]"
+
+    with pytest.raises(IndexError):
+        park.occupants[2]
+    with pytest.raises(IndexError):
+        park.occupants[0][3]
+
+
+def test_registry():
+    park = rhabm.Park(width=3, height=3)
+    rhino_agent = rhabm.Rhino(park)
+    poacher_agent = rhabm.Poacher(park)
+    assert park.registry[rhabm.RhinoCode] == {rhino_agent.location: rhino_agent}
+    assert park.registry[rhabm.PoacherCode] == {
+        poacher_agent.location: poacher_agent
+    }
+
+    park.vacate(rhino_agent.location)
+    park.vacate(poacher_agent.location)
+    rhino_agent.location = (0, 0)
+    park.place(rhino_agent, rhino_agent.location)
+    poacher_agent.location = (1, 1)
+    park.place(poacher_agent, poacher_agent.location)
+    park.move(rhino_agent, (0, 1))
+    assert park.registry[rhabm.RhinoCode] == {(0, 1): rhino_agent}
+
+    rhino_agent.caught = True
+    park.refresh(rhino_agent)
+    assert park.registry[rhabm.RhinoCode] == {}
+    assert park.registry[rhabm.DeadRhinoCode] == {(0, 1): rhino_agent}
+
+    park.place(rhino_agent, (1, 1))
+    assert park.registry[rhabm.PoacherCode] == {}
+
+    park.vacate((1, 1))
+    park.vacate((0, 1))
+    assert park.registry[rhabm.DeadRhinoCode] == {}
+
+
+def test_get_nearby_agents():
+    for number_of_rhinos in [1, 5, 40]:
+        park = rhabm.Park(width=9, height=9)
+        _ = [rhabm.Rhino(park) for _ in range(number_of_rhinos)]
+        for i, j in park.coordinates:
+            for radius in [1, 3]:
+                expected = [
+                    ((k, l), park.agent_at(k, l))
+                    for k, l in park.get_neighbours(i, j, radius)
+                    if park.code_at(k, l) == rhabm.RhinoCode
+                ]
+                assert (
+                    park.get_nearby_agents(rhabm.RhinoCode, i, j, radius)
+                    == expected
+                )
+
+
 def test_get_random_unoccupied_cell():
     park = rhabm.Park(width=2, height=2)
     assert park.get_random_unoccupied_cell() in park.coordinates
@@ -29,6 +147,43 @@ def test_no_unoccupied_cells():
     assert park.get_random_unoccupied_cell() is False
 
 
+def test_free_cells():
+    park = rhabm.Park(width=3, height=2)
+    assert sorted(park.free_cells) == list(range(6))
+
+    rhino_agent = rhabm.Rhino(park)
+    poacher_agent = rhabm.Poacher(park)
+    occupied = [
+        rhino_agent.location[0] * 3 + rhino_agent.location[1],
+        poacher_agent.location[0] * 3 + poacher_agent.location[1],
+    ]
+    assert sorted(park.free_cells) == sorted(set(range(6)) - set(occupied))
+    for index in range(6):
+        if index in occupied:
+            assert park.free_cell_positions[index] == -1
+        else:
+            assert park.free_cells[park.free_cell_positions[index]] == index
+
+    park.vacate(rhino_agent.location)
+    park.vacate(rhino_agent.location)
+    assert sorted(park.free_cells) == sorted(set(range(6)) - set(occupied[1:]))
+
+
+def test_free_cells_after_simulation():
+    park = rhabm.simulate(
+        width=6,
+        height=4,
+        number_of_rhinos=8,
+        number_of_poachers=4,
+        number_of_security_agents=2,
+        clock=30,
+        seed=1,
+    )
+    assert sorted(park.free_cells) == [
+        index for index, code in enumerate(park.cells) if code == 0
+    ]
+
+
 def test_get_neighbours():
     current_location = (1, 1)
     park = rhabm.Park(width=2, height=2)
@@ -65,6 +220,61 @@ def test_get_neighbours():
     )
 
 
+def reference_neighbours(park, i, j, radius):
+    neighbours = []
+    for offset in range(min(park.width - j, radius + 1)):
+        for step in range(min(park.height - 1 - i, radius - offset) + 1):
+            if (step, offset) != (0, 0):
+                neighbours.append((i + step, j + offset))
+    for offset in range(min(park.width - j, radius + 1)):
+        for step in range(1, min(i, radius - offset) + 1):
+            neighbours.append((i - step, j + offset))
+    for offset in range(1, min(j, radius + 1) + 1):
+        for step in range(min(park.height - 1 - i, radius - offset) + 1):
+            neighbours.append((i + step, j - offset))
+    for offset in range(1, min(j, radius + 1) + 1):
+        for step in range(1, min(i, radius - offset) + 1):
+            neighbours.append((i - step, j - offset))
+    return neighbours
+
+
+def test_get_neighbours_matches_reference_order():
+    for width, height in [(1, 1), (1, 4), (3, 2), (7, 9)]:
+        park = rhabm.Park(width=width, height=height)
+        for i, j in park.coordinates:
+            for radius in range(5):
+                assert list(park.get_neighbours(i, j, radius)) == (
+                    reference_neighbours(park, i, j, radius)
+                )
+
+
+def test_neighbour_offsets():
+    assert rhabm.neighbour_offsets(0) == ()
+    assert set(rhabm.neighbour_offsets(1)) == set(
+        [(1, 0), (-1, 0), (0, 1), (0, -1)]
+    )
+    assert len(rhabm.neighbour_offsets(3)) == 24
+
+
+def test_neighbour_cache_is_bounded():
+    park = rhabm.Park(width=5, height=5, neighbour_cache_size=3)
+    for j in range(5):
+        park.get_neighbours(0, j)
+    assert list(park.neighbour_cache) == [(0, 2, 1), (0, 3, 1), (0, 4, 1)]
+
+    park.get_neighbours(0, 2)
+    park.get_neighbours(1, 1)
+    assert list(park.neighbour_cache) == [(0, 4, 1), (0, 2, 1), (1, 1, 1)]
+
+
+def test_neighbour_cache_can_be_disabled():
+    park = rhabm.Park(width=5, height=5, neighbour_cache_size=0)
+    assert set(park.get_neighbours(2, 2)) == set(
+        [(1, 2), (2, 1), (3, 2), (2, 3)]
+    )
+    assert len(park.neighbour_cache) == 0
+
+
 def test_len():
     park = rhabm.Park()
     assert park.__len__() == 25
@@ -73,3 +283,49 @@ def test_len():
 def test_repr():
     park = rhabm.Park()
     isinstance(park.__repr__(), str)
+
+
+def test_repr_renders_cell_codes():
+    park = rhabm.Park(width=2, height=2)
+    rhino_agent = rhabm.Rhino(park)
+    park.move(rhino_agent, (0, 1))
+    assert park.__repr__() == "[🌲, 🦏]\n[🌲, 🌲]\n"
+
+
+def test_render_only_renders_dirty_rows():
+    park = rhabm.Park(width=3, height=3, seed=0)
+    rhino_agent = rhabm.Rhino(park)
+    poacher_agent = rhabm.Poacher(park)
+    park.move(rhino_agent, (0, 0))
+    park.move(poacher_agent, (2, 2))
+    assert park.render() == rhabm.render(park.cells, 3, 3)
+    assert park.render_cache.dirty_rows == set()
+
+    park.move(rhino_agent, (1, 0))
+    assert park.render_cache.dirty_rows == {0, 1}
+    rhino_agent.caught = True
+    park.refresh(rhino_agent)
+    assert park.render() == "[🌲, 🌲, 🌲]\n[💀, 🌲, 🌲]\n[🌲, 🌲, 🔪]\n"
+    assert park.render("ascii") == "...\nX..\n..P\n"
+
+    park.vacate((2, 2))
+    assert park.render_cache.dirty_rows == {2}
+    assert park.render("ascii") == "...\nX..\n...\n"
+    assert park.render() == rhabm.render(park.cells, 3, 3)
+
+
+def test_render_ascii():
+    cells = bytearray([0, 1, 2, 3, 4, 5])
+    assert rhabm.render(cells, 3, 2, mode="ascii") == ".RX\nPCS\n"
+    assert rhabm.render_row(cells, mode="ascii") == ".RXPCS"
+    with pytest.raises(ValueError):
+        rhabm.render(cells, 3, 2, mode="braille")
+
+
+
+def test_random_state():
+    first = rhabm.Park(width=10, height=10, seed=0)
+    second = rhabm.Park(width=10, height=10, seed=0)
+    assert [first.get_random_unoccupied_cell() for _ in range(5)] == [
+        second.get_random_unoccupied_cell() for _ in range(5)
+    ]
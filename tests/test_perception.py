@@ -0,0 +1,84 @@
+import pytest
+
+import rhabm
+
+
+def test_scan_order():
+    order = rhabm.scan_order(2)
+    assert sorted(order) == sorted(rhabm.neighbour_offsets(2))
+    lengths = [step ** 2 + offset ** 2 for step, offset in order]
+    assert lengths == sorted(lengths)
+    ranks = rhabm.neighbour_ranks(2)
+    for position in range(len(order) - 1):
+        if lengths[position] == lengths[position + 1]:
+            assert ranks[order[position]] < ranks[order[position + 1]]
+
+
+@pytest.mark.parametrize(
+    "number_of_rhinos, storage",
+    [(3, "objects"), (60, "objects"), (60, "pool"), (3, "pool")],
+)
+def test_perception_finds_the_targets_of_find_individual(
+    number_of_rhinos, storage
+):
+    park = rhabm.Park(width=14, height=11, seed=number_of_rhinos)
+    agents = rhabm.populate(
+        park,
+        number_of_rhinos=number_of_rhinos,
+        number_of_poachers=20,
+        number_of_security_agents=12,
+        number_of_selective_poachers=8,
+        number_of_devalued_rhinos=number_of_rhinos // 2,
+        storage=storage,
+    )
+
+    perception = rhabm.Perception(park, agents)
+
+    hunters = [agent for agent in agents if agent.kind != rhabm.RhinoCode]
+    assert set(perception.targets) == {agent.agent_id for agent in hunters}
+    assert any(perception.targets.values())
+    for agent in hunters:
+        target = perception.targets[agent.agent_id]
+        assert perception.target(agent) == agent.find_individual()
+        if target is not False:
+            assert park.agent_at(*target[0]).agent_id == target[1]
+
+
+def test_perception_searches_again_for_moved_targets():
+    park = rhabm.Park(width=6, height=1, seed=0)
+    rhino_agent = rhabm.Rhino(park)
+    park.move(rhino_agent, (0, 3))
+    poacher_agent = rhabm.Poacher(park)
+    park.move(poacher_agent, (0, 0))
+    park.perception = rhabm.Perception(park, park.agents)
+    assert poacher_agent.find_individual() == (0, 3)
+
+    park.move(rhino_agent, (0, 2))
+    assert park.perception.target(poacher_agent) is None
+    assert poacher_agent.find_individual() == (0, 2)
+
+    rhino_agent.caught = True
+    park.refresh(rhino_agent)
+    assert poacher_agent.find_individual() is False
+
+
+@pytest.mark.parametrize("occupancy", ["dense", "sparse"])
+def test_simulate_with_perception(occupancy):
+    parameters = dict(
+        width=15,
+        height=12,
+        number_of_rhinos=40,
+        number_of_poachers=8,
+        number_of_security_agents=4,
+        number_of_selective_poachers=3,
+        number_of_devalued_rhinos=10,
+        clock=40,
+        seed=6,
+        targeting="perception",
+        occupancy=occupancy,
+    )
+    simulation = rhabm.simulate(**parameters)
+
+    assert simulation.perception is None
+    assert simulation.counters["dead_rhinos"] > 0
+    assert repr(rhabm.simulate(**parameters)) == repr(simulation)
@@ -0,0 +1,109 @@
+import pytest
+
+import rhabm
+
+
+def test_add_rhino():
+    park = rhabm.Park()
+    pool = rhabm.AgentPool(park)
+    rhino_agent = pool.add_rhino(value=0.8)
+
+    assert isinstance(rhino_agent, rhabm.PooledRhino)
+    assert rhino_agent.park is park
+    assert rhino_agent.value == 0.8
+    assert rhino_agent.is_mobile is True
+    assert rhino_agent.caught is False
+    assert rhino_agent.kind == rhabm.RhinoCode
+    assert rhino_agent.code == rhabm.RhinoCode
+    assert rhino_agent.__repr__() == rhabm.RhinoEmoji
+    assert park.agent_at(*rhino_agent.location) is rhino_agent
+    assert len(pool) == 1
+    assert pool[0] is rhino_agent
+    assert list(pool) == [rhino_agent]
+
+    with pytest.raises(AttributeError):
+        rhino_agent.name = "rhino"
+
+
+def test_attributes_are_stored_in_arrays():
+    park = rhabm.Park()
+    pool = rhabm.AgentPool(park)
+    poacher_agent = pool.add_poacher(
+        vision_radius=2,
+        movement_radius=2,
+        time_to_remove_rhino=5,
+        minimum_horn_value_threshold=0.5,
+        target_value=2,
+    )
+
+    assert poacher_agent.vision_radius == 2
+    assert poacher_agent.movement_radius == 2
+    assert poacher_agent.time_to_remove_rhino == 5
+    assert poacher_agent.minimum_horn_value_threshold == 0.5
+    assert poacher_agent.target_value == 2
+    assert poacher_agent.target_agent is None
+    assert poacher_agent.left_park is False
+
+    poacher_agent.location = (3, 4)
+    poacher_agent.time_to_remove_rhino -= 1
+    poacher_agent.caught = True
+    assert (pool.rows[0], pool.columns[0]) == (3, 4)
+    assert pool.times_to_remove_rhino[0] == 4
+    assert pool.caught == bytearray([1])
+    assert poacher_agent.__repr__() == rhabm.CaughtPoacherEmoji
+
+
+def test_target_agent():
+    park = rhabm.Park()
+    pool = rhabm.AgentPool(park)
+    rhino_agent = pool.add_rhino()
+    poacher_agent = pool.add_poacher()
+
+    poacher_agent.target_agent = rhino_agent
+    assert pool.targets[poacher_agent.index] == rhino_agent.index
+    assert poacher_agent.target_agent is rhino_agent
+
+    poacher_agent.target_agent = None
+    assert pool.targets[poacher_agent.index] == rhabm.NoTarget
+
+
+def test_security_officer_catches_poacher():
+    park = rhabm.Park(width=1, height=2)
+    pool = rhabm.AgentPool(park)
+    security_agent = pool.add_security_officer()
+    poacher_agent = pool.add_poacher()
+
+    assert security_agent.find_individual() == poacher_agent.location
+    security_agent.move()
+    assert security_agent.is_mobile is False
+    security_agent.move()
+    assert security_agent.is_mobile is True
+    assert poacher_agent.caught is True
+    assert park.code_at(*poacher_agent.location) == rhabm.CaughtPoacherCode
+
+
+def test_simulate_with_pool_matches_objects():
+    parameters = dict(
+        width=10,
+        height=8,
+        number_of_rhinos=15,
+        number_of_poachers=5,
+        number_of_security_agents=3,
+        number_of_selective_poachers=2,
+        number_of_devalued_rhinos=4,
+        clock=60,
+        seed=3,
+    )
+    objects = rhabm.simulate(**parameters, storage="objects")
+    pooled = rhabm.simulate(**parameters, storage="pool")
+
+    assert pooled.__repr__() == objects.__repr__()
+    assert rhabm.summarise(pooled) == rhabm.summarise(objects)
+    assert all(
+        isinstance(agent, rhabm.PooledAgent) for agent in pooled.agents
+    )
+
+
+def test_populate_with_unknown_storage():
+    with pytest.raises(ValueError):
+        rhabm.populate(rhabm.Park(), 1, 0, 0, storage="unknown")
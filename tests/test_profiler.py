@@ -0,0 +1,51 @@
+import json
+
+import rhabm
+
+parameters = dict(
+    width=8,
+    height=8,
+    number_of_rhinos=10,
+    number_of_poachers=3,
+    number_of_security_agents=2,
+    clock=12,
+)
+
+
+def test_profiler_report():
+    profiler = rhabm.Profiler()
+    simulation = rhabm.simulate(
+        **parameters, keep_history=True, seed=1, profiler=profiler
+    )
+    report = profiler.report()
+
+    assert report["ticks"] == 12
+    assert len(report["tick_times"]) == 12
+    assert report["total_time"] == sum(report["tick_times"])
+    assert report["sections"]["Rhino"]["calls"] > 0
+    assert report["sections"]["SecurityOfficer"]["calls"] == 24
+    assert report["sections"]["history"]["calls"] == 12
+    assert report["sections"]["get_neighbours"]["calls"] > 0
+    assert report["sections"]["get_nearby_agents"]["calls"] > 0
+    assert json.loads(json.dumps(report)) == report
+
+    assert "get_neighbours" not in vars(simulation)
+
+
+def test_profiler_does_not_change_the_simulation():
+    profiled = rhabm.simulate(
+        **parameters, seed=1, engine="batched", profiler=rhabm.Profiler()
+    )
+    unprofiled = rhabm.simulate(**parameters, seed=1, engine="batched")
+    assert profiled.__repr__() == unprofiled.__repr__()
+
+
+def test_timed():
+    times = iter([1.0, 3.5])
+    profiler = rhabm.Profiler(timer=lambda: next(times))
+    double = profiler.timed("double", lambda x: 2 * x)
+
+    assert double(4) == 8
+    assert profiler.report()["sections"] == {
+        "double": {"calls": 1, "time": 2.5}
+    }
@@ -0,0 +1,78 @@
+import rhabm
+
+params = {
+    "width": 8,
+    "height": 8,
+    "number_of_rhinos": 10,
+    "number_of_poachers": 4,
+    "number_of_security_agents": 2,
+    "number_of_devalued_rhinos": 3,
+    "clock": 40,
+}
+
+
+def test_summarise():
+    park = rhabm.Park(width=2, height=2)
+    rhino_agent = rhabm.Rhino(park, value=0.4)
+    _ = rhabm.Rhino(park)
+    poacher_agent = rhabm.Poacher(park)
+
+    rhino_agent.caught = True
+    park.refresh(rhino_agent)
+    poacher_agent.caught = True
+    park.refresh(poacher_agent)
+    park.ticks = 3
+
+    assert rhabm.summarise(park) == {
+        "dead_rhinos": 1,
+        "caught_poachers": 1,
+        "horn_value_taken": 0.4,
+        "ticks": 3,
+    }
+
+
+def test_run_replicate_is_reproducible():
+    summary = rhabm.run_replicate(params, seed=5)
+    assert summary["seed"] == 5
+    assert summary["ticks"] == 40
+    assert rhabm.run_replicate(params, seed=5) == summary
+
+
+def test_aggregate():
+    summaries = [
+        {
+            "dead_rhinos": 1,
+            "caught_poachers": 0,
+            "horn_value_taken": 1,
+            "ticks": 4,
+        },
+        {
+            "dead_rhinos": 3,
+            "caught_poachers": 2,
+            "horn_value_taken": 1,
+            "ticks": 4,
+        },
+    ]
+    statistics = rhabm.aggregate(summaries)
+
+    assert statistics["dead_rhinos"] == {
+        "mean": 2,
+        "std": 2 ** 0.5,
+        "min": 1,
+        "max": 3,
+    }
+    assert statistics["ticks"]["std"] == 0
+    assert rhabm.aggregate([]) == {}
+
+
+def test_simulate_many_matches_serial_runs():
+    seeds = range(6)
+    serial = rhabm.simulate_many(params, seeds, workers=1)
+    parallel = rhabm.simulate_many(params, seeds, workers=2)
+
+    assert [run["seed"] for run in serial["runs"]] == list(seeds)
+    assert parallel == serial
+    assert serial["runs"] == [
+        rhabm.run_replicate(params, seed) for seed in seeds
+    ]
+    assert set(serial["aggregate"]) == set(rhabm.replicates.SummaryMetrics)
@@ -0,0 +1,110 @@
+import pytest
+
+import rhabm
+
+
+def engaged_park():
+    park = rhabm.Park(width=5, height=1, seed=0)
+    rhino_agent = rhabm.Rhino(park)
+    park.move(rhino_agent, (0, 1))
+    poacher_agent = rhabm.Poacher(park, time_to_remove_rhino=3)
+    park.move(poacher_agent, (0, 0))
+    return park, rhino_agent, poacher_agent
+
+
+def test_shuffled():
+    park = rhabm.Park(seed=0)
+    agents = [rhabm.Rhino(park) for _ in range(5)]
+    order = list(agents)
+    assert rhabm.shuffled(park, agents) is agents
+    assert sorted(agents, key=order.index) == order
+
+
+def test_scheduler_sleeps_poachers_removing_a_horn():
+    park, rhino_agent, poacher_agent = engaged_park()
+    scheduler = rhabm.ActiveScheduler(park, [rhino_agent, poacher_agent])
+
+    assert sorted(scheduler.agents(), key=lambda agent: agent.agent_id) == [
+        rhino_agent,
+        poacher_agent,
+    ]
+    poacher_agent.move()
+    assert poacher_agent.is_mobile is False
+    park.ticks += 1
+
+    assert scheduler.agents() == []
+    assert scheduler.sleeping == {poacher_agent.agent_id: 4}
+    park.ticks = 3
+    assert scheduler.agents() == []
+    scheduler.settle()
+    assert poacher_agent.time_to_remove_rhino == 1
+
+    park.ticks = 4
+    assert scheduler.agents() == [poacher_agent]
+    assert poacher_agent.time_to_remove_rhino == 0
+    poacher_agent.move()
+    assert rhino_agent.caught is True
+    park.ticks = 5
+    assert scheduler.agents() == [poacher_agent]
+    for _ in range(2):
+        poacher_agent.move()
+    assert poacher_agent.left_park is True
+    assert scheduler.agents() == []
+    assert scheduler.listed == set()
+    assert scheduler.order() == [rhino_agent, poacher_agent]
+
+
+def test_scheduler_wakes_agents_freed_by_security():
+    park, rhino_agent, poacher_agent = engaged_park()
+    officer = rhabm.SecurityOfficer(park)
+    park.move(officer, (0, 4))
+    park.scheduler = rhabm.ActiveScheduler(park, park.agents)
+    poacher_agent.move()
+    park.ticks += 1
+    assert park.scheduler.agents() == [officer]
+    park.ticks += 1
+
+    officer.target_agent = poacher_agent
+    officer.engage_target()
+    assert poacher_agent.time_to_remove_rhino == 2
+    assert sorted(
+        park.scheduler.agents(), key=lambda agent: agent.agent_id
+    ) == [rhino_agent, officer]
+    assert park.scheduler.sleeping == {}
+
+
+@pytest.mark.parametrize("engine", ["agents", "batched"])
+def test_simulate_with_active_scheduling(engine):
+    parameters = dict(
+        width=12,
+        height=10,
+        number_of_rhinos=40,
+        number_of_poachers=20,
+        number_of_security_agents=2,
+        target_value=2,
+        clock=80,
+        seed=2,
+        engine=engine,
+        scheduling="active",
+    )
+    simulation = rhabm.simulate(**parameters)
+
+    assert simulation.scheduler is None
+    assert simulation.counters["dead_rhinos"] > 0
+    assert simulation.counters["exited_poachers"] > 0
+    assert sorted(
+        agent.agent_id for agents in simulation.schedule for agent in agents
+    ) == list(range(62))
+    assert repr(rhabm.simulate(**parameters)) == repr(simulation)
+
+
+def test_unknown_scheduling():
+    with pytest.raises(ValueError):
+        rhabm.simulate(
+            width=3,
+            height=3,
+            number_of_rhinos=1,
+            number_of_poachers=1,
+            number_of_security_agents=1,
+            scheduling="lazy",
+        )
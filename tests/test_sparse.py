@@ -0,0 +1,128 @@
+import pytest
+
+import rhabm
+
+
+def test_sparse_cells():
+    cells = rhabm.SparseCells(6, rhabm.UnoccupiedCode)
+    assert cells[3] == rhabm.UnoccupiedCode
+
+    cells[3] = rhabm.RhinoCode
+    cells[4] = rhabm.PoacherCode
+    assert cells[3] == rhabm.RhinoCode
+    assert cells.count(rhabm.RhinoCode) == 1
+    assert cells.count(rhabm.UnoccupiedCode) == 4
+    assert bytes(cells) == bytes([0, 0, 0, 1, 3, 0])
+
+    cells[3] = rhabm.UnoccupiedCode
+    assert 3 not in cells
+    assert len(cells) == 1
+
+
+def test_coordinates():
+    coordinates = rhabm.Coordinates(width=3, height=2)
+    assert list(coordinates) == [
+        (0, 0),
+        (0, 1),
+        (0, 2),
+        (1, 0),
+        (1, 1),
+        (1, 2),
+    ]
+    assert len(coordinates) == 6
+    assert coordinates[4] == (1, 1)
+    assert coordinates[-1] == (1, 2)
+    assert (1, 2) in coordinates
+    assert (2, 0) not in coordinates
+    with pytest.raises(IndexError):
+        coordinates[6]
+
+
+def test_sparse_park_store():
+    park = rhabm.SparsePark(width=3, height=2, seed=0)
+    rhino_agent = rhabm.Rhino(park)
+    poacher_agent = rhabm.Poacher(park)
+
+    assert len(park.cells) == 2
+    assert len(park.free_cells) == 4
+    occupied = [rhino_agent.location, poacher_agent.location]
+    assert sorted(park.free_cells) == [
+        index for index in range(6) if divmod(index, 3) not in occupied
+    ]
+    assert park.agent_at(*rhino_agent.location) is rhino_agent
+    assert park.code_at(*poacher_agent.location) == rhabm.PoacherCode
+
+    park.move(rhino_agent, park.get_random_unoccupied_cell())
+    assert len(park.cells) == 2
+    assert park.agent_at(*rhino_agent.location) is rhino_agent
+
+    park.remove(poacher_agent)
+    assert len(park.cells) == 1
+    assert len(park.agent_ids) == 1
+    assert park.cells.count(rhabm.RhinoCode) == 1
+
+
+def test_sparse_park_fills_up():
+    park = rhabm.SparsePark(width=3, height=3, seed=1)
+    rhinos = [rhabm.Rhino(park) for _ in range(9)]
+    assert len({rhino.location for rhino in rhinos}) == 9
+    assert park.get_random_unoccupied_cell() is False
+
+
+def test_sparse_park_repr_matches_dense_park():
+    dense_park = rhabm.Park(width=4, height=3)
+    sparse_park = rhabm.SparsePark(width=4, height=3)
+    for park in (dense_park, sparse_park):
+        rhino_agent = rhabm.Rhino(park)
+        park.move(rhino_agent, (2, 1))
+        park.move(rhabm.Poacher(park), (0, 3))
+
+    assert repr(sparse_park) == repr(dense_park)
+    assert repr(sparse_park.occupants[2]) == repr(dense_park.occupants[2])
+
+
+@pytest.mark.parametrize("engine", ["agents", "batched"])
+def test_simulate_sparse(engine):
+    simulation = rhabm.simulate(
+        width=12,
+        height=9,
+        number_of_rhinos=20,
+        number_of_poachers=5,
+        number_of_security_agents=3,
+        clock=40,
+        seed=3,
+        engine=engine,
+        keep_history=True,
+        occupancy="sparse",
+    )
+
+    assert isinstance(simulation, rhabm.SparsePark)
+    assert len(simulation.cells) == sum(
+        len(agents) for agents in simulation.registry.values()
+    )
+    assert simulation.history[-1].count("\n") == 9
+    assert simulation.counters["living_rhinos"] + simulation.counters[
+        "dead_rhinos"
+    ] == 20
+
+
+def test_simulate_huge_sparse_park():
+    simulation = rhabm.simulate(
+        width=20000,
+        height=20000,
+        number_of_rhinos=2000,
+        number_of_poachers=200,
+        number_of_security_agents=100,
+        clock=3,
+        seed=0,
+        occupancy="sparse",
+    )
+
+    assert len(simulation) == 20000 * 20000
+    assert len(simulation.cells) == 2300
+    assert len(simulation.free_cells) == 20000 * 20000 - 2300
+
+
+def test_unknown_occupancy():
+    with pytest.raises(ValueError):
+        rhabm.create_park(3, 3, occupancy="tiled")
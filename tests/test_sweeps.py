@@ -0,0 +1,203 @@
+import json
+import os
+
+import pytest
+
+import rhabm
+
+params = {
+    "width": 6,
+    "height": 6,
+    "number_of_rhinos": 6,
+    "number_of_poachers": 2,
+    "number_of_security_agents": 1,
+    "clock": 10,
+}
+
+
+def test_parameter_grid():
+    grid = rhabm.parameter_grid({"b": [1, 2], "a": [0.5]})
+    assert grid == [{"a": 0.5, "b": 1}, {"a": 0.5, "b": 2}]
+    assert rhabm.parameter_grid({}) == [{}]
+
+
+def test_result_cache(tmp_path):
+    cache = rhabm.ResultCache(str(tmp_path / "cache"))
+    assert cache.get(params, 1) is None
+
+    cache.put(params, 1, {"dead_rhinos": 2})
+    assert cache.get(params, 1) == {"dead_rhinos": 2}
+    assert cache.get(params, 2) is None
+    assert cache.get(dict(params, clock=11), 1) is None
+
+    other_version = rhabm.ResultCache(str(tmp_path / "cache"), version="0")
+    assert other_version.get(params, 1) is None
+    assert cache.key(params, 1) == cache.key(dict(reversed(params.items())), 1)
+
+
+def test_sweep(tmp_path):
+    results = rhabm.sweep(
+        params,
+        {"number_of_devalued_rhinos": [0, 3], "devalued_value": [0.1]},
+        replicates=2,
+        workers=1,
+        cache_directory=str(tmp_path),
+    )
+
+    assert [result["params"] for result in results] == [
+        {"devalued_value": 0.1, "number_of_devalued_rhinos": 0},
+        {"devalued_value": 0.1, "number_of_devalued_rhinos": 3},
+    ]
+    assert [len(result["runs"]) for result in results] == [2, 2]
+    assert results[1]["runs"][1] == rhabm.run_replicate(
+        dict(params, devalued_value=0.1, number_of_devalued_rhinos=3), 1
+    )
+    assert results[0]["aggregate"] == rhabm.aggregate(results[0]["runs"])
+    assert len(os.listdir(str(tmp_path))) == 4
+
+
+def test_sweep_only_runs_missing_combinations(tmp_path, monkeypatch):
+    ranges = {"number_of_devalued_rhinos": [0, 3]}
+    first = rhabm.sweep(
+        params, ranges, replicates=2, workers=1, cache_directory=str(tmp_path)
+    )
+
+    runs = []
+    run_replicate = rhabm.replicates.run_replicate
+
+    def counting_run_replicate(run_params, seed):
+        runs.append((run_params["number_of_devalued_rhinos"], seed))
+        return run_replicate(run_params, seed)
+
+    monkeypatch.setattr(
+        rhabm.replicates, "run_replicate", counting_run_replicate
+    )
+    second = rhabm.sweep(
+        params,
+        {"number_of_devalued_rhinos": [0, 3, 5]},
+        replicates=3,
+        workers=1,
+        cache_directory=str(tmp_path),
+    )
+
+    assert sorted(runs) == [(0, 2), (3, 2), (5, 0), (5, 1), (5, 2)]
+    assert second[0]["runs"][:2] == first[0]["runs"]
+    assert second[1]["runs"][:2] == first[1]["runs"]
+
+
+def test_interrupted_sweep_keeps_finished_runs(tmp_path, monkeypatch):
+    ranges = {"number_of_devalued_rhinos": [0, 3]}
+    run_replicate = rhabm.replicates.run_replicate
+
+    def failing_run_replicate(run_params, seed):
+        if run_params["number_of_devalued_rhinos"] == 3:
+            raise KeyboardInterrupt
+        return run_replicate(run_params, seed)
+
+    monkeypatch.setattr(
+        rhabm.replicates, "run_replicate", failing_run_replicate
+    )
+    with pytest.raises(KeyboardInterrupt):
+        rhabm.sweep(
+            params,
+            ranges,
+            replicates=2,
+            workers=1,
+            cache_directory=str(tmp_path),
+        )
+
+    cache = rhabm.ResultCache(str(tmp_path))
+    run_params = dict(params, number_of_devalued_rhinos=0)
+    for seed in range(2):
+        summary = run_replicate(run_params, seed)
+        assert cache.get(run_params, seed) == summary
+    assert len(os.listdir(str(tmp_path))) == 2
+
+
+def test_sweep_without_cache():
+    results = rhabm.sweep(
+        params,
+        {"clock": [2]},
+        seeds=[7],
+        workers=1,
+        cache_directory=None,
+    )
+    assert results[0]["runs"][0]["seed"] == 7
+    assert results[0]["runs"][0]["ticks"] == 2
+
+
+def test_result_file_skips_written_runs(tmp_path):
+    path = str(tmp_path / "runs.csv")
+    columns = ["params", "number_of_devalued_rhinos", "seed"] + list(
+        rhabm.SummaryMetrics
+    )
+    ranges = {"number_of_devalued_rhinos": [0, 3]}
+    with rhabm.ResultFile(path, columns, columns[:3]) as result_file:
+        assert rhabm.stream_sweep(params, ranges, result_file, [0, 1], 1) == 4
+    with open(path) as result_file:
+        lines = result_file.readlines()
+    assert len(lines) == 5
+    assert lines[0] == ",".join(columns) + "\n"
+
+    with open(path, "w") as result_file:
+        result_file.writelines(lines[:2])
+        result_file.write(lines[2][:5])
+    with rhabm.ResultFile(path, columns, columns[:3]) as result_file:
+        assert result_file.done == {(rhabm.parameters_hash(params), "0", "0")}
+        assert rhabm.stream_sweep(params, ranges, result_file, [0, 1], 1) == 3
+    with open(path) as result_file:
+        assert result_file.readlines() == lines
+
+
+def test_result_file_json_lines(tmp_path):
+    path = str(tmp_path / "runs.jsonl")
+    columns = ["params", "seed"] + list(rhabm.SummaryMetrics)
+    with rhabm.ResultFile(path, columns, columns[:2]) as result_file:
+        rhabm.stream_sweep(params, {}, result_file, [3, 4], 1)
+    params_hash = rhabm.parameters_hash(params)
+    with rhabm.ResultFile(path, columns, columns[:2]) as result_file:
+        assert result_file.done == {(params_hash, "3"), (params_hash, "4")}
+        assert rhabm.stream_sweep(params, {}, result_file, [3, 4, 5], 1) == 1
+
+    with open(path) as result_file:
+        rows = [json.loads(line) for line in result_file]
+    assert rows == [
+        dict(rhabm.run_replicate(params, seed), params=params_hash)
+        for seed in [3, 4, 5]
+    ]
+
+    other_params = dict(params, clock=5)
+    with rhabm.ResultFile(path, columns, columns[:2]) as result_file:
+        assert rhabm.stream_sweep(other_params, {}, result_file, [3], 1) == 1
+
+
+def test_result_file_checks_its_columns(tmp_path):
+    path = tmp_path / "runs.csv"
+    path.write_text("seed,dead_rhinos\n0,1\n")
+    with pytest.raises(ValueError):
+        rhabm.ResultFile(str(path), ["seed", "ticks"], ["seed"])
+    with pytest.raises(ValueError):
+        rhabm.ResultFile(str(tmp_path / "runs.txt"), ["seed"], ["seed"])
+
+
+def test_result_file_leaves_other_files_alone(tmp_path):
+    columns = ["seed"] + list(rhabm.SummaryMetrics)
+    path = tmp_path / "scores.csv"
+    path.write_text("name,score\nalice,3")
+    with pytest.raises(ValueError):
+        rhabm.ResultFile(str(path), columns, ["seed"])
+    assert path.read_text() == "name,score\nalice,3"
+
+    path = tmp_path / "config.jsonl"
+    path.write_text('{\n  "params": {"width": 3}\n}')
+    with pytest.raises(ValueError):
+        rhabm.ResultFile(str(path), columns, ["seed"])
+    assert path.read_text() == '{\n  "params": {"width": 3}\n}'
+
+    path.write_text('{"seed": 1}')
+    with pytest.raises(ValueError):
+        rhabm.ResultFile(str(path), columns, ["seed"])
+    assert path.read_text() == '{"seed": 1}'
+
+    with pytest.raises(ValueError):
+        rhabm.ResultFile(str(tmp_path / "config.json"), columns, ["seed"])
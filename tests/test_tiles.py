@@ -0,0 +1,137 @@
+import array
+
+import pytest
+
+import rhabm
+
+shared_memory = pytest.importorskip("multiprocessing.shared_memory")
+
+
+def test_tile_bounds():
+    bounds = [rhabm.tile_bounds(tile, 3, 10) for tile in range(3)]
+    assert bounds == [(0, 4), (4, 7), (7, 10)]
+    for i in range(10):
+        start, stop = bounds[i * 3 // 10]
+        assert start <= i < stop
+
+
+def test_own_rows():
+    assert rhabm.own_rows(0, 4, 10) == (0, 3)
+    assert rhabm.own_rows(4, 7, 10) == (5, 6)
+    assert rhabm.own_rows(7, 10, 10) == (8, 10)
+    assert rhabm.own_rows(3, 4, 10) == (4, 4)
+    assert rhabm.own_rows(0, 10, 10) == (0, 10)
+
+
+def test_move_tile():
+    park = rhabm.Park(width=3, height=5)
+    grid = shared_memory.SharedMemory(create=True, size=len(park))
+    try:
+        grid.buf[: len(park)] = bytes(
+            [0, 0, 0] + [1, 1, 0] + [0, 1, 1] + [1, 0, 0] + [0, 1, 0]
+        )
+        applied, moves, handoffs = rhabm.move_tile(
+            grid.name, 3, 5, 0, 4, [4, 7, 8, 9], seed=0
+        )
+        cells = bytes(grid.buf[: len(park)])
+    finally:
+        grid.close()
+        grid.unlink()
+
+    applied = array.array("l", applied)
+    pairs = list(zip(applied[::2], applied[1::2]))
+    for origin, destination in pairs:
+        assert origin < 9 and destination < 9
+        assert cells[origin] == rhabm.UnoccupiedCode
+        assert cells[destination] == rhabm.RhinoCode
+    assert 3 not in [origin for origin, _ in pairs + moves]
+    for origin, destination in moves:
+        assert origin >= 9 and destination < 9
+    for destination, origins in handoffs:
+        assert destination >= 9
+    assert cells.count(rhabm.RhinoCode) == 6
+    assert len(pairs) + len(moves) + len(handoffs) > 0
+
+
+def test_simulate_tiled():
+    parameters = dict(
+        width=20,
+        height=16,
+        number_of_rhinos=80,
+        number_of_poachers=6,
+        number_of_security_agents=3,
+        clock=30,
+        seed=2,
+        engine="tiled",
+        tiles=3,
+        keep_history=True,
+    )
+    simulation = rhabm.simulate(**parameters)
+
+    assert isinstance(simulation.cells, bytearray)
+    assert simulation.cells.count(rhabm.RhinoCode) + simulation.cells.count(
+        rhabm.DeadRhinoCode
+    ) == len(simulation.registry[rhabm.RhinoCode]) + len(
+        simulation.registry[rhabm.DeadRhinoCode]
+    )
+    assert (
+        simulation.counters["living_rhinos"]
+        + simulation.counters["dead_rhinos"]
+        == 80
+    )
+    for location, agent in simulation.registry[rhabm.RhinoCode].items():
+        assert agent.location == location
+        assert simulation.agent_at(*location) is agent
+    free_cells = sorted(simulation.free_cells)
+    assert free_cells == [
+        index
+        for index, code in enumerate(simulation.cells)
+        if code == rhabm.UnoccupiedCode
+    ]
+    for position, index in enumerate(simulation.free_cells):
+        assert simulation.free_cell_positions[index] == position
+    assert len(simulation.history) == 30
+    cells = simulation.history.grid(29)
+    rhabm.apply_events(cells, simulation.history.events[29])
+    assert cells == simulation.cells
+    assert repr(rhabm.simulate(**parameters)) == repr(simulation)
+
+
+def test_tiled_engine_needs_a_dense_park():
+    with pytest.raises(ValueError):
+        rhabm.simulate(
+            width=5,
+            height=5,
+            number_of_rhinos=2,
+            number_of_poachers=1,
+            number_of_security_agents=1,
+            engine="tiled",
+            occupancy="sparse",
+        )
+
+
+def test_tiled_grid_is_closed_when_run_fails(tmp_path):
+    park = rhabm.Park(width=6, height=6, seed=0)
+    agents = rhabm.populate(
+        park,
+        number_of_rhinos=5,
+        number_of_poachers=1,
+        number_of_security_agents=1,
+    )
+    with pytest.raises(ValueError):
+        next(rhabm.run(park, agents, 5, engine="tiled", targeting="bogus"))
+    assert isinstance(park.cells, bytearray)
+
+    with pytest.raises(OSError):
+        next(
+            rhabm.run(
+                park,
+                agents,
+                5,
+                engine="tiled",
+                tiles=2,
+                keep_history=True,
+                history_file=str(tmp_path / "missing" / "frames.bin"),
+            )
+        )
+    assert isinstance(park.cells, bytearray)